@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark - Construção do Agent de resposta por request
+
+Mede, para cada modelo roteado (chat, planning, vision), o custo de preparar
+o Agent Strands antes da geração:
+- ANTES: `Agent(model=<model_id>, system_prompt=<persona + contexto>)`, que
+  cria um BedrockModel (sessão + cliente boto3) a cada request
+- DEPOIS: `get_strands_agent()`, com BedrockModel em cache por model_id e
+  persona estática separada do contexto do request
+
+Não faz chamadas de rede (apenas construção de objetos).
+
+Uso:
+    cd agent
+    uv run python benchmarks/bench_agent_factory.py
+    uv run python benchmarks/bench_agent_factory.py --iterations 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("AWS_REGION", "us-east-1")
+
+from strands import Agent  # noqa: E402
+
+from src.main import PERSONA_PROMPT, get_strands_agent  # noqa: E402
+from src.router.agent_router import AgentRouter  # noqa: E402
+
+CONTEXT = "# Session Summary\nViagem para Roma em maio, 3 dias, hotel perto do Coliseu.\n"
+
+
+def _timed(fn, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list) -> float:
+    samples = sorted(samples)
+    mean = statistics.fmean(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"    {label:<24} mean={mean:7.3f}ms  p50={samples[len(samples) // 2]:7.3f}ms  p99={p99:7.3f}ms")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    router = AgentRouter(region_name=os.environ["AWS_REGION"])
+
+    print(f"\n🧪 Agent construction per request ({args.iterations} iterations)\n")
+    for name in ("chat", "planning", "vision"):
+        model_id = router.models[name]["id"]
+
+        def per_request(model_id=model_id):
+            Agent(
+                model=model_id,
+                system_prompt=f"{PERSONA_PROMPT}\n📝 Contexto da Conversa:\n{CONTEXT}\n",
+            )
+
+        def cached(model_id=model_id):
+            get_strands_agent(model_id, context=CONTEXT)
+
+        # Aquecimento (imports tardios, primeiro cliente do cache)
+        per_request()
+        cached()
+
+        print(f"  {name} ({model_id})")
+        before = _report("per-request BedrockModel", _timed(per_request, args.iterations))
+        after = _report("cached BedrockModel", _timed(cached, args.iterations))
+        print(f"    → {before - after:.3f}ms saved per request ({before / after:.1f}x)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark - Construção do Agent classificador por chamada vs pool
+
+Mede o overhead de preparar o classificador antes da chamada ao Nova Micro:
+- ANTES: um novo `Agent` Strands por mensagem (comportamento antigo)
+- DEPOIS: agente reutilizado via ClassifierPool.lease()
+
+Também mede o ciclo completo (preparação + invocação) com um modelo falso,
+sem rede, para mostrar o ganho relativo por request.
+
+Uso:
+    cd agent
+    uv run python benchmarks/bench_classifier_pool.py
+    uv run python benchmarks/bench_classifier_pool.py --iterations 2000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from strands import Agent  # noqa: E402
+
+from fakes import StubModel  # noqa: E402
+from src.router.agent_router import CLASSIFIER_SYSTEM_PROMPT  # noqa: E402
+from src.router.classifier_pool import ClassifierPool  # noqa: E402
+
+
+def _timed(fn, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def _report(label: str, samples: list) -> float:
+    samples = sorted(samples)
+    mean = statistics.fmean(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"  {label:<32} mean={mean:9.1f}µs  p50={samples[len(samples) // 2]:9.1f}µs  p99={p99:9.1f}µs")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    model = StubModel(response_text="COMPLEX")
+
+    def build_agent():
+        return Agent(
+            system_prompt=CLASSIFIER_SYSTEM_PROMPT,
+            model=model,
+            callback_handler=None,
+        )
+
+    pool = ClassifierPool(factory=build_agent, max_size=1)
+
+    def per_call_construction():
+        build_agent()
+
+    def pooled_construction():
+        with pool.lease():
+            pass
+
+    def per_call_full():
+        build_agent()("Planeje 3 dias em Roma")
+
+    def pooled_full():
+        with pool.lease() as agent:
+            agent("Planeje 3 dias em Roma")
+
+    # Aquecimento (imports tardios do Strands, primeiro agente do pool)
+    per_call_full()
+    pooled_full()
+
+    print(f"\n🧪 Classifier construction overhead ({args.iterations} iterations)\n")
+    before = _report("per-call Agent()", _timed(per_call_construction, args.iterations))
+    after = _report("ClassifierPool.lease()", _timed(pooled_construction, args.iterations))
+    print(f"  → {before / after:.0f}x less setup per classification\n")
+
+    print("🧪 Full classification with stub model (no network)\n")
+    before = _report("per-call Agent() + invoke", _timed(per_call_full, args.iterations))
+    after = _report("pooled Agent + invoke", _timed(pooled_full, args.iterations))
+    print(f"  → {before - after:.1f}µs saved per classification\n")
+
+
+if __name__ == "__main__":
+    main()
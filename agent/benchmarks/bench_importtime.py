@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Regressão de cold start - Tempo de import de src.main
+
+Roda `python -X importtime -c "import src.main"` em processos novos e compara
+com o baseline versionado em benchmarks/data/importtime_baseline.json:
+- FALHA (exit 1) se a mediana do import passar do baseline + tolerância
+- FALHA se algum módulo pesado proibido (Strands, stack do Memory) voltar a
+  ser importado no caminho de cold start - checagem determinística,
+  independente da máquina
+
+Também lista os módulos com maior tempo cumulativo, para diagnóstico.
+
+Uso:
+    cd agent
+    uv run python benchmarks/bench_importtime.py
+    uv run python benchmarks/bench_importtime.py --runs 10 --tolerance 0.3
+    uv run python benchmarks/bench_importtime.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).parent.parent
+BASELINE = Path(__file__).parent / "data" / "importtime_baseline.json"
+TARGET = "src.main"
+
+# Não podem ser importados por `import src.main` (devem ser carregados sob demanda)
+FORBIDDEN_MODULES = ["strands", "bedrock_agentcore.memory"]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run_once() -> tuple:
+    """Importa TARGET num processo novo; retorna (cumulativo µs, módulos)."""
+    env = {**os.environ, "STARTUP_MODE": os.environ.get("STARTUP_MODE", "warm")}
+    env.pop("BEDROCK_AGENTCORE_MEMORY_ID", None)
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        cwd=AGENT_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in out.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    return modules[TARGET], modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, help="Sobrescreve a tolerância do baseline")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    samples, modules = [], {}
+    for _ in range(args.runs):
+        cumulative, modules = run_once()
+        samples.append(cumulative)
+    median_ms = statistics.median(samples) / 1000
+
+    print(f"\n🧪 import {TARGET} ({args.runs} fresh processes)\n")
+    print(f"  median={median_ms:.1f}ms  min={min(samples) / 1000:.1f}ms  max={max(samples) / 1000:.1f}ms")
+    print(f"\n  top {args.top} cumulative:")
+    for name, cumulative in sorted(modules.items(), key=lambda kv: -kv[1])[1 : args.top + 1]:
+        print(f"    {cumulative / 1000:8.1f}ms  {name}")
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+        baseline.update({"target": TARGET, "median_ms": round(median_ms, 1)})
+        baseline.setdefault("tolerance", 0.25)
+        BASELINE.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\n💾 Baseline updated: {BASELINE}")
+        return
+
+    failures = [
+        f"{name} imported at startup"
+        for name in FORBIDDEN_MODULES
+        if name in modules
+    ]
+    if BASELINE.exists():
+        baseline = json.loads(BASELINE.read_text())
+        tolerance = args.tolerance if args.tolerance is not None else baseline["tolerance"]
+        limit = baseline["median_ms"] * (1 + tolerance)
+        print(f"\n  baseline={baseline['median_ms']:.1f}ms  limit={limit:.1f}ms (+{tolerance:.0%})")
+        if median_ms > limit:
+            failures.append(f"median {median_ms:.1f}ms > limit {limit:.1f}ms")
+
+    if failures:
+        print("\n❌ Startup regression:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ No startup regression")
+
+
+if __name__ == "__main__":
+    main()
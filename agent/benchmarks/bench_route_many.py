@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Classificação em lote (route_many) vs route() por mensagem
+
+Classifica as mensagens de benchmarks/data/decisions_sample.jsonl (repetidas
+e com variações, como num backfill do log de decisões) de duas formas:
+- ANTES: `route()` uma mensagem por vez (uma chamada ao Nova Micro cada)
+- DEPOIS: `route_many()` com deduplicação, etapas locais em lote, prompts
+  empacotados e concorrência limitada
+
+O Nova Micro é simulado por um StubModel com latência configurável que
+responde tanto prompts simples quanto empacotados (sem rede). Tokens são
+estimados a partir do tamanho dos prompts (~4 caracteres por token).
+
+Uso:
+    cd agent
+    uv run python benchmarks/bench_route_many.py
+    uv run python benchmarks/bench_route_many.py --copies 20 --latency-ms 300
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.pop("ROUTER_LOCAL_CLASSIFIER_MODEL", None)
+os.environ.pop("ROUTER_DECISION_LOG", None)
+
+from fakes import StubModel, last_user_text  # noqa: E402
+from src.router.agent_router import AgentRouter  # noqa: E402
+
+DATA = Path(__file__).parent / "data" / "decisions_sample.jsonl"
+PACKED_LINE = re.compile(r'^(\d+)\. "', re.MULTILINE)
+
+
+def load_messages(copies: int) -> list:
+    """Mensagens do log com duplicatas e variações de caixa/pontuação."""
+    with open(DATA, encoding="utf-8") as f:
+        base = [json.loads(line)["message"] for line in f if line.strip()]
+    messages = []
+    for i in range(copies):
+        for message in base:
+            # Metade das cópias é única (força chamadas ao classificador)
+            messages.append(message if i % 2 == 0 else f"{message} (pedido {i})")
+    random.Random(42).shuffle(messages)
+    return messages
+
+
+def classifier_response(messages, system_prompt) -> str:
+    """Resposta do Nova Micro simulado (simples ou empacotada)."""
+    prompt = last_user_text(messages)
+    numbers = PACKED_LINE.findall(prompt)
+    if numbers:
+        return "\n".join(f"{n}: INFORMATIVE" for n in numbers)
+    return "INFORMATIVE"
+
+
+def build_router(latency_ms: float) -> AgentRouter:
+    router = AgentRouter(region_name=os.environ["AWS_REGION"])
+    router.model_config = StubModel(
+        response_fn=classifier_response,
+        latency_fn=lambda: random.uniform(0.8, 1.2) * latency_ms / 1000,
+        input_tokens=None,
+        output_tokens=None,
+    )
+    return router
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--copies", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    messages = load_messages(args.copies)
+    print(f"\n🧪 Classifying {len(messages)} logged messages "
+          f"(stub Nova Micro ~{args.latency_ms:.0f}ms)\n")
+
+    # ANTES: route() por mensagem (com o cache padrão do Router)
+    router = build_router(args.latency_ms)
+    tokens_before = [0, 0]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        before = []
+        for message in messages:
+            config = router.route(message)
+            before.append(config["complexity"])
+            usage = config["classification_usage"] or {}
+            tokens_before[0] += usage.get("input_tokens", 0)
+            tokens_before[1] += usage.get("output_tokens", 0)
+    elapsed_before = time.perf_counter() - start
+    cost_before = (
+        tokens_before[0] * router.models["router"]["cost_input"]
+        + tokens_before[1] * router.models["router"]["cost_output"]
+    ) / 1_000_000
+
+    # DEPOIS: route_many
+    router = build_router(args.latency_ms)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        batch = router.route_many(
+            messages, max_concurrency=args.concurrency, batch_size=args.batch_size
+        )
+    elapsed_after = time.perf_counter() - start
+    stats = batch.stats
+
+    after = [config["complexity"] for config in batch.results]
+    print(f"  route() x{len(messages):<6} {elapsed_before * 1000:9.0f}ms  "
+          f"tokens in/out={tokens_before[0]}/{tokens_before[1]}  ${cost_before:.6f}")
+    print(f"  route_many()      {elapsed_after * 1000:9.0f}ms  "
+          f"tokens in/out={stats['input_tokens']}/{stats['output_tokens']}  "
+          f"${stats['cost_usd']:.6f}")
+    print(f"\n  unique={stats['unique']}  duplicates={stats['duplicates']}  "
+          f"sources={stats['sources']}")
+    print(f"  llm_calls={stats['llm_calls']}  packed_calls={stats['packed_calls']}  "
+          f"packed_failures={stats['packed_failures']}  "
+          f"call p50={stats['call_latency_ms']['p50']}ms "
+          f"p95={stats['call_latency_ms']['p95']}ms")
+    print(f"\n  → {elapsed_before / elapsed_after:.1f}x faster, "
+          f"{cost_before / max(stats['cost_usd'], 1e-12):.1f}x cheaper")
+    print(f"  ✅ same labels for {sum(a == b for a, b in zip(before, after))}/{len(messages)} messages")
+
+
+if __name__ == "__main__":
+    main()
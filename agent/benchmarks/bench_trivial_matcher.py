@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Detecção de mensagens triviais (loop de regex vs TrivialMatcher)
+
+Replica o corpus de mensagens reais em benchmarks/data/messages.txt até o
+tamanho pedido e compara:
+- ANTES: lower/split + loop de `re.match` sobre 4 padrões crus por mensagem
+- DEPOIS: TrivialMatcher (frozenset + checagem de emojis, montado uma vez)
+
+Também lista as mensagens em que os dois discordam (ex: "👍 planeje 3 dias em
+Roma", que o padrão antigo de emoji classificava como trivial).
+
+Uso:
+    cd agent
+    uv run python benchmarks/bench_trivial_matcher.py
+    uv run python benchmarks/bench_trivial_matcher.py --size 1000000 --corpus outro.txt
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.router.trivial_matcher import TrivialMatcher  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "messages.txt"
+
+# Padrões e lógica do is_trivial_pattern original
+LEGACY_PATTERNS = [
+    r"^(oi|olá|hey|hi|hello)[\s!?]*$",
+    r"^(obrigad[oa]|thanks|valeu)[\s!?]*$",
+    r"^(ok|certo|tudo bem|sim|não|yes|no)[\s!?]*$",
+    r"^👍|👋|😊|❤️$",
+]
+
+
+def legacy_is_trivial(message: str) -> bool:
+    message_lower = message.lower().strip()
+    if len(message_lower.split()) <= 3:
+        for pattern in LEGACY_PATTERNS:
+            if re.match(pattern, message_lower, re.IGNORECASE):
+                return True
+    return False
+
+
+def _run(label: str, fn, corpus: list) -> float:
+    start = time.perf_counter()
+    trivial = sum(1 for message in corpus if fn(message))
+    elapsed = time.perf_counter() - start
+    per_message_ns = elapsed / len(corpus) * 1e9
+    print(f"  {label:<16} {elapsed * 1000:9.1f}ms total  {per_message_ns:7.0f}ns/msg  trivial={trivial}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    messages = [
+        line for line in args.corpus.read_text(encoding="utf-8").splitlines() if line
+    ]
+    corpus = (messages * (args.size // len(messages) + 1))[: args.size]
+    matcher = TrivialMatcher()
+
+    print(f"\n🧪 Trivial detection over {len(corpus)} messages ({len(messages)} unique)\n")
+    before = _run("legacy loop", legacy_is_trivial, corpus)
+    after = _run("TrivialMatcher", matcher.matches, corpus)
+    print(f"  → {before / after:.1f}x faster\n")
+
+    disagreements = [m for m in messages if legacy_is_trivial(m) != matcher.matches(m)]
+    if disagreements:
+        print("🔎 Classification changes (legacy → new):")
+        for message in disagreements:
+            print(f"  {legacy_is_trivial(message)!s:>5} → {matcher.matches(message)!s:<5}  {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Avaliação offline - Classificador local vs classificações do Nova Micro
+
+Lê decisões registradas por `AgentRouter.route()` (ROUTER_DECISION_LOG, JSONL
+com "message", "complexity", "source" e "routing_time_ms"), usa apenas as que
+foram decididas pelo LLM como verdade e reporta para o conjunto de teste:
+- cobertura: % de mensagens que o classificador local decidiria sozinho
+- acurácia nas mensagens cobertas (concordância com o LLM)
+- matriz de confusão (LLM → local) das mensagens cobertas
+- latência economizada: routing_time_ms das cobertas - custo da predição local
+
+Sem --model, treina com a parte de treino do próprio log (split determinístico
+pela mensagem normalizada).
+Com --save, grava o modelo treinado para uso via ROUTER_LOCAL_CLASSIFIER_MODEL.
+
+Uso:
+    cd agent
+    uv run python benchmarks/eval_local_classifier.py
+    uv run python benchmarks/eval_local_classifier.py --log decisions.jsonl --threshold 0.95
+    uv run python benchmarks/eval_local_classifier.py --log decisions.jsonl --save local_model.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.router.classification_cache import normalize_message  # noqa: E402
+from src.router.local_classifier import LABELS, LocalClassifier  # noqa: E402
+
+DEFAULT_LOG = Path(__file__).parent / "data" / "decisions_sample.jsonl"
+
+
+def load_records(path: Path) -> list:
+    """Carrega decisões tomadas pelo LLM (únicas com label confiável)."""
+    records = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if record.get("source", "llm") == "llm" and record.get("complexity") in LABELS:
+            records.append(record)
+    return records
+
+
+def split(records: list, holdout: float) -> tuple:
+    """Split determinístico por hash da mensagem normalizada (estável entre execuções).
+
+    Variações triviais ("Oi!" / "oi") caem no mesmo lado, para que o teste não
+    meça apenas a memorização de mensagens já vistas no treino.
+    """
+    train, test = [], []
+    for record in records:
+        key = normalize_message(record["message"])
+        bucket = zlib.crc32(key.encode("utf-8")) % 100
+        (test if bucket < holdout * 100 else train).append(record)
+    return train, test
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--log", type=Path, default=DEFAULT_LOG)
+    parser.add_argument("--model", type=Path, help="Modelo já treinado (JSON)")
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--holdout", type=float, default=0.3)
+    parser.add_argument("--save", type=Path, help="Salva o modelo treinado")
+    args = parser.parse_args()
+
+    records = load_records(args.log)
+    if args.model:
+        classifier = LocalClassifier.load(str(args.model), threshold=args.threshold)
+        test = records
+    else:
+        train, test = split(records, args.holdout)
+        classifier = LocalClassifier.train(
+            ((r["message"], r["complexity"]) for r in train), threshold=args.threshold
+        )
+        print(f"\n📚 Trained on {len(train)} decisions, evaluating on {len(test)}")
+    if args.save:
+        classifier.save(str(args.save))
+        print(f"💾 Model saved to {args.save}")
+
+    covered = correct = 0
+    saved_ms = predict_ms = 0.0
+    confusion = Counter()
+    for record in test:
+        start = time.perf_counter()
+        decision = classifier.classify(record["message"])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        predict_ms += elapsed_ms
+        if decision is None:
+            continue
+        covered += 1
+        saved_ms += record.get("routing_time_ms", 0) - elapsed_ms
+        confusion[(record["complexity"], decision[0])] += 1
+        if decision[0] == record["complexity"]:
+            correct += 1
+
+    total = len(test) or 1
+    print(f"\n🧪 Local classifier @ threshold {args.threshold}\n")
+    print(f"  coverage           {covered}/{len(test)} ({covered / total:.1%})")
+    print(f"  accuracy (covered) {correct / covered:.1%}" if covered else "  accuracy (covered) n/a")
+    print(f"  predict time       {predict_ms / total:.3f}ms/msg")
+    print(f"  latency saved      {saved_ms:.0f}ms total, {saved_ms / total:.0f}ms/msg avg")
+
+    if covered:
+        print("\n  confusion (llm → local):")
+        for (expected, predicted), count in sorted(confusion.items()):
+            marker = "" if expected == predicted else "  ⚠️"
+            print(f"    {expected:<12} → {predicted:<12} {count}{marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Fakes determinísticos para benchmarks locais (sem rede).
+
+- StubModel implementa a interface `strands.models.Model` devolvendo um texto
+  fixo (ou calculado a partir das mensagens) no mesmo formato de eventos do
+  Bedrock ConverseStream, para que o Agent Strands execute o ciclo completo
+  sem chamar a AWS. structured_output() valida o mesmo texto (JSON) no
+  modelo Pydantic pedido.
+- FakeMemoryClient imita os métodos do MemoryClient usados pelo
+  AgentCoreMemory, guardando eventos por (actor_id, session_id).
+- latency_distribution cria as funções de latência (segundos) dos fakes a
+  partir de uma especificação textual com semente fixa.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from strands.models import Model
+
+
+def last_user_text(messages: List[Dict[str, Any]]) -> str:
+    """Texto da última mensagem do usuário (para respostas em eco)."""
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return "".join(
+                block.get("text", "") for block in message.get("content", [])
+            )
+    return ""
+
+
+def latency_distribution(spec: str, seed: int = 0) -> Optional[Callable[[], float]]:
+    """
+    Função de latência determinística (mesma semente = mesma sequência).
+
+    Especificações (valores em ms):
+        "0" ou "none"             sem latência
+        "const:50"                sempre 50ms
+        "uniform:20:80"           uniforme entre 20 e 80ms
+        "normal:50:10"            normal (média, desvio), truncada em 0
+        "lognormal:300:0.5"       lognormal (mediana, sigma): cauda longa,
+                                  como chamadas ao Bedrock
+
+    Returns:
+        Função sem argumentos que devolve segundos (None sem latência)
+    """
+    kind, *params = spec.strip().lower().split(":")
+    if kind in ("0", "none", ""):
+        return None
+    values = [float(param) for param in params]
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    samplers = {
+        "const": lambda: values[0],
+        "uniform": lambda: rng.uniform(values[0], values[1]),
+        "normal": lambda: max(0.0, rng.gauss(values[0], values[1])),
+        "lognormal": lambda: rng.lognormvariate(math.log(values[0]), values[1]),
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unknown latency distribution: {spec!r}")
+    sampler = samplers[kind]
+
+    def latency() -> float:
+        with lock:
+            return sampler() / 1000
+
+    return latency
+
+
+class StubModel(Model):
+    """Modelo Strands falso com resposta e latência configuráveis."""
+
+    def __init__(
+        self,
+        response_text: str = "INFORMATIVE",
+        latency_fn: Optional[Callable[[], float]] = None,
+        model_id: str = "stub-model",
+        input_tokens: Optional[int] = 100,
+        output_tokens: Optional[int] = 10,
+        response_fn: Optional[Callable[[List[Dict[str, Any]], Optional[str]], str]] = None,
+    ):
+        """
+        Args:
+            response_text: Texto devolvido em toda invocação
+            latency_fn: Função que retorna a latência simulada em segundos
+            model_id: ID reportado em get_config()
+            input_tokens: Tokens de entrada reportados no evento de uso
+                (None = estimado, ~4 caracteres por token, do system prompt
+                e das mensagens)
+            output_tokens: Tokens de saída reportados (None = estimado da
+                resposta)
+            response_fn: Se fornecida, calcula a resposta a partir das
+                mensagens e do system prompt recebidos (substitui response_text)
+        """
+        self.response_text = response_text
+        self.latency_fn = latency_fn
+        self.config = {"model_id": model_id}
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.response_fn = response_fn
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> Any:
+        return self.config
+
+    def _response(self, messages, system_prompt) -> str:
+        if self.response_fn:
+            return self.response_fn(messages, system_prompt)
+        return self.response_text
+
+    async def structured_output(
+        self, output_model, prompt, system_prompt=None, **kwargs
+    ) -> AsyncIterable[Any]:
+        """Valida o texto da resposta (JSON) no output_model do pedido.
+
+        response_text/response_fn devem devolver o JSON do modelo; texto que
+        não valida levanta ValueError, como o BedrockModel quando o modelo não
+        devolve a ferramenta esperada. Não cobre o structured output via
+        ferramenta do loop do Agent (tool_specs em stream() são ignorados).
+        """
+        if self.latency_fn:
+            await asyncio.sleep(self.latency_fn())
+
+        text = self._response(prompt, system_prompt)
+        try:
+            output = output_model.model_validate_json(text)
+        except ValidationError as e:
+            raise ValueError(f"StubModel response is not a valid {output_model.__name__}: {e}")
+        yield {"output": output}
+
+    async def stream(
+        self, messages, tool_specs=None, system_prompt=None, **kwargs
+    ) -> AsyncIterable[Any]:
+        if self.latency_fn:
+            await asyncio.sleep(self.latency_fn())
+
+        text = self._response(messages, system_prompt)
+        input_tokens = self.input_tokens
+        if input_tokens is None:
+            chars = len(system_prompt or "") + sum(
+                len(block.get("text", ""))
+                for message in messages
+                for block in message.get("content", [])
+            )
+            input_tokens = chars // 4 + 1
+        output_tokens = self.output_tokens
+        if output_tokens is None:
+            output_tokens = len(text) // 4 + 1
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {}}}
+        yield {"contentBlockDelta": {"delta": {"text": text}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {
+            "metadata": {
+                "usage": {
+                    "inputTokens": input_tokens,
+                    "outputTokens": output_tokens,
+                    "totalTokens": input_tokens + output_tokens,
+                },
+                "metrics": {"latencyMs": 0},
+            }
+        }
+
+
+class FakeMemoryClient:
+    """MemoryClient falso: eventos em memória por (actor_id, session_id)."""
+
+    def __init__(self, latency_fn: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            latency_fn: Latência simulada (segundos) de cada chamada remota
+        """
+        self.latency_fn = latency_fn
+        self._lock = threading.Lock()
+        self.events: Dict[Tuple[str, str], List[List[Tuple[str, str]]]] = defaultdict(list)
+
+    def _wait(self) -> None:
+        if self.latency_fn:
+            time.sleep(self.latency_fn())
+
+    def create_event(self, memory_id, actor_id, session_id, messages, **kwargs):
+        self._wait()
+        with self._lock:
+            self.events[(actor_id, session_id)].append(list(messages))
+        return {"eventId": f"event-{actor_id}-{session_id}"}
+
+    def get_last_k_turns(self, memory_id, actor_id, session_id, k=5, **kwargs):
+        self._wait()
+        with self._lock:
+            events = list(self.events.get((actor_id, session_id), []))
+        # Mesmo formato do get_last_k_turns: uma lista de mensagens por turno
+        return [
+            [{"content": {"text": text}, "role": role} for text, role in messages]
+            for messages in events[-k:]
+        ]
+
+    def get_memory_strategies(self, memory_id):
+        return []
+
+    def retrieve_memories(self, **kwargs):
+        self._wait()
+        return []
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Teste de carga - Requests concorrentes no entrypoint (invoke_async)
+
+Simula N sessões (usuários) conversando em paralelo com o mesmo processo,
+com Bedrock e AgentCore Memory falsos (sem rede):
+- Geração: StubModel que ecoa o prompt e as tags de sessão vistas no
+  contexto do system prompt
+- Router: AgentRouter com classificador StubModel (pool de
+  agentes sem estado)
+- Memory: AgentCoreMemory com FakeMemoryClient (eventos por sessão)
+
+Cada sessão envia seus turnos em sequência; as sessões rodam em paralelo.
+Ao final verifica que não houve mistura entre sessões:
+- cada resposta ecoa o próprio prompt e só contém contexto da própria sessão
+- os eventos gravados no Memory de cada sessão são só dela
+- cada classificação vê só a mensagem do próprio request (sem histórico
+  herdado de outro request pelo pool)
+
+Uso:
+    cd agent
+    uv run python benchmarks/load_test.py
+    uv run python benchmarks/load_test.py --sessions 200 --turns 5 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("STARTUP_MODE", "lazy")
+# Cada mensagem é única; cache/classificador local desviariam do classificador
+os.environ["ROUTER_CACHE_ENABLED"] = "false"
+os.environ.pop("ROUTER_LOCAL_CLASSIFIER_MODEL", None)
+
+from benchmarks.fakes import (  # noqa: E402
+    FakeMemoryClient,
+    StubModel,
+    last_user_text,
+)
+from src import main  # noqa: E402
+from src.memory.agentcore_memory import AgentCoreMemory  # noqa: E402
+from src.router.agent_router import AgentRouter  # noqa: E402
+
+MEMORY_ID = "mem-load-test"
+TAG_PATTERN = re.compile(r"<s\d+>")
+
+
+def _tag(index: int) -> str:
+    return f"<s{index:04d}>"
+
+
+def _echo(messages, system_prompt) -> str:
+    # Tags de sessão presentes no contexto (system prompt) revelam mistura
+    seen = sorted(set(TAG_PATTERN.findall(system_prompt or "")))
+    return f"eco: {last_user_text(messages)} | contexto: {','.join(seen)}"
+
+
+# Mensagens recebidas pelo classificador em cada chamada
+_classifier_calls: list = []
+
+
+def _classify(messages, system_prompt) -> str:
+    _classifier_calls.append(list(messages))
+    return "INFORMATIVE"
+
+
+def _latency(ms: float):
+    if ms <= 0:
+        return None
+    return lambda: random.uniform(0.5, 1.5) * ms / 1000
+
+
+def build_components(latency_ms: float):
+    """Cria Router, Memory e modelo falsos e os instala em src.main."""
+    memory_client = FakeMemoryClient(latency_fn=_latency(latency_ms / 2))
+
+    router = AgentRouter(region_name=main.REGION)
+    router.model_config = StubModel(
+        response_fn=_classify, latency_fn=_latency(latency_ms / 2)
+    )
+
+    agent_memory = AgentCoreMemory(memory_id=MEMORY_ID, region_name=main.REGION)
+    agent_memory._client = memory_client
+
+    generation_model = StubModel(response_fn=_echo, latency_fn=_latency(latency_ms))
+
+    main.router = router
+    main.memory = agent_memory
+    main._memory_checked = True
+    return memory_client, generation_model
+
+
+async def run_session(index: int, turns: int, latencies: list, errors: list):
+    """Uma sessão: turnos em sequência, verificando cada resposta."""
+    tag = _tag(index)
+    actor_id = f"user{index:04d}"
+    session_id = f"session{index:04d}"
+    for turn in range(turns):
+        prompt = f"{tag} pergunta {turn} sobre o roteiro da minha viagem para Roma"
+        start = time.perf_counter()
+        result = await main.invoke_async(
+            {"prompt": prompt, "session_id": session_id, "actor_id": actor_id}
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        response = result["response"]
+        context_tags = set(TAG_PATTERN.findall(response.split("| contexto:")[-1]))
+        if not response.startswith(f"eco: {prompt}"):
+            errors.append(f"{tag} turn {turn}: resposta de outro prompt: {response!r}")
+        if context_tags - {tag}:
+            errors.append(f"{tag} turn {turn}: contexto de outra sessão: {context_tags}")
+        if turn and tag not in context_tags:
+            errors.append(f"{tag} turn {turn}: contexto da própria sessão ausente")
+        metadata = result["metadata"]
+        if (metadata["session_id"], metadata["actor_id"]) != (session_id, actor_id):
+            errors.append(f"{tag} turn {turn}: metadata de outra sessão")
+
+
+def check_isolation(sessions: int, turns: int, memory_client, errors: list):
+    """Verifica os eventos do Memory por sessão e os prompts do classificador."""
+    for index in range(sessions):
+        tag = _tag(index)
+        actor_id, session_id = f"user{index:04d}", f"session{index:04d}"
+
+        events = memory_client.events.get((actor_id, session_id), [])
+        if len(events) != turns:
+            errors.append(f"{tag}: {len(events)} eventos no Memory (esperado {turns})")
+        texts = " ".join(text for event in events for text, _ in event)
+        if set(TAG_PATTERN.findall(texts)) - {tag}:
+            errors.append(f"{tag}: eventos do Memory com mensagens de outra sessão")
+
+    for messages in _classifier_calls:
+        prompts = [message for message in messages if message.get("role") == "user"]
+        if len(prompts) != 1:
+            errors.append(f"classificador recebeu {len(prompts)} mensagens de usuário")
+
+
+async def run(args) -> int:
+    memory_client, generation_model = build_components(args.latency_ms)
+    latencies: list = []
+    errors: list = []
+
+    # Logs por request do entrypoint suprimidos (poluiriam o relatório)
+    with mock.patch.object(
+        main, "get_bedrock_model", return_value=generation_model
+    ), contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(run_session(i, args.turns, latencies, errors) for i in range(args.sessions))
+        )
+        elapsed = time.perf_counter() - start
+        main.memory.flush(timeout=30)
+
+    check_isolation(args.sessions, args.turns, memory_client, errors)
+
+    samples = sorted(latencies)
+    requests = len(samples)
+    print(f"\n🧪 Load test: {args.sessions} sessions x {args.turns} turns "
+          f"(stub latency ~{args.latency_ms:.0f}ms)\n")
+    print(f"  requests     {requests}")
+    print(f"  throughput   {requests / elapsed:8.1f} req/s  ({elapsed:.2f}s)")
+    print(f"  latency      mean={statistics.fmean(samples):7.1f}ms  "
+          f"p50={samples[requests // 2]:7.1f}ms  "
+          f"p99={samples[max(0, int(requests * 0.99) - 1)]:7.1f}ms")
+    print(f"  classifier   {main.router.classifier_pool.created} pooled agents, "
+          f"{len(_classifier_calls)} calls")
+    print(f"  writes       {main.memory.write_stats()}")
+
+    if errors:
+        print(f"\n❌ {len(errors)} isolation errors:")
+        for error in errors[:20]:
+            print(f"  - {error}")
+        return 1
+    print("\n✅ No cross-talk between sessions")
+    return 0
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Replay - Benchmark reproduzível do entrypoint a partir de um corpus JSONL
+
+Reexecuta um corpus de payloads (uma linha JSON por request, no formato do
+`invoke`) contra o entrypoint com Bedrock, Strands e MemoryClient trocados
+por fakes determinísticos locais (benchmarks/fakes.py):
+- Classificador: StubModel que rotula pela mensagem (planeje/roteiro →
+  COMPLEX, reserva/cancelamento/pagamento → CRITICAL, demais → INFORMATIVE)
+- Geração: um StubModel por model_id (tokens estimados pelo texto)
+- Memory: AgentCoreMemory com FakeMemoryClient (eventos por sessão) ou,
+  com --memory-backend local, com o LocalMemoryClient em SQLite (o mesmo
+  de AGENTCORE_MEMORY_BACKEND=local, com falhas via --memory-fault-rate)
+Cada fake tem uma distribuição de latência configurável e semente fixa.
+
+Os turnos de cada (actor_id, session_id) rodam em sequência, na ordem do
+corpus; sessões rodam em paralelo (--concurrency). O relatório traz:
+- throughput e latência ponta a ponta (p50/p95/p99)
+- latência por estágio (histogramas de src/metrics: classificação, Memory,
+  geração, escrita), no total e por modelo
+- alocações (tracemalloc): pico, memória retida e blocos por request
+- custo (CostLedger), acertos do cache de respostas e controle de admissão
+  (limite final, pico da fila e descartes por modelo)
+
+Com --save-baseline o resultado vira o baseline versionado em
+benchmarks/data/replay_baseline.json; nas execuções seguintes cada métrica
+é comparada com ele (FALHA, exit 1, se piorar além da tolerância).
+
+O corpus padrão (benchmarks/data/replay_corpus.jsonl) foi amostrado de
+benchmarks/data/messages.txt: 60 sessões de 2-6 turnos, algumas com imagem,
+viagem ou streaming.
+
+Uso:
+    cd agent
+    uv run python benchmarks/replay.py
+    uv run python benchmarks/replay.py --concurrency 32 --repeat 3
+    uv run python benchmarks/replay.py --generation-latency lognormal:800:0.6
+    uv run python benchmarks/replay.py --memory-backend local --memory-fault-rate 0.05
+    uv run python benchmarks/replay.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import inspect
+import io
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("STARTUP_MODE", "lazy")
+os.environ.pop("ROUTER_LOCAL_CLASSIFIER_MODEL", None)
+
+from benchmarks.fakes import (  # noqa: E402
+    FakeMemoryClient,
+    StubModel,
+    last_user_text,
+    latency_distribution,
+)
+from src import main  # noqa: E402
+from src.memory.agentcore_memory import AgentCoreMemory  # noqa: E402
+from src.memory.local_client import LocalMemoryClient  # noqa: E402
+from src.metrics.cost_ledger import CostLedger  # noqa: E402
+from src.metrics.histogram import Histogram  # noqa: E402
+from src.metrics.registry import STAGES, get_registry, group_histograms  # noqa: E402
+from src.router.agent_router import AgentRouter  # noqa: E402
+from src.serving.admission import AdmissionController  # noqa: E402
+from src.serving.response_cache import ResponseCache  # noqa: E402
+
+DATA_DIR = Path(__file__).parent / "data"
+DEFAULT_CORPUS = DATA_DIR / "replay_corpus.jsonl"
+BASELINE = DATA_DIR / "replay_baseline.json"
+MEMORY_ID = "mem-replay"
+
+_COMPLEX = re.compile(r"planej|roteiro|itiner|monte|organiz", re.IGNORECASE)
+_CRITICAL = re.compile(r"reserv|cancel|pagamento|emerg|perdi", re.IGNORECASE)
+
+
+def _classify(messages, system_prompt) -> str:
+    message = last_user_text(messages)
+    if _CRITICAL.search(message):
+        return "CRITICAL"
+    if _COMPLEX.search(message):
+        return "COMPLEX"
+    return "INFORMATIVE"
+
+
+def _answer(messages, system_prompt) -> str:
+    return f"Resposta sobre: {last_user_text(messages)}"
+
+
+def load_corpus(path: Path, repeat: int = 1) -> list:
+    """Payloads do corpus; cada repetição usa sessões novas (sufixo #N)."""
+    payloads = [
+        json.loads(line)
+        for line in path.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    if repeat == 1:
+        return payloads
+    return [
+        {**payload, "session_id": f"{payload.get('session_id', 'default')}#{run}"}
+        for run in range(repeat)
+        for payload in payloads
+    ]
+
+
+def build_components(args):
+    """Cria Router, Memory e modelos falsos e os instala em src.main."""
+    memory_latency = latency_distribution(args.memory_latency, seed=args.seed + 1)
+    if args.memory_backend == "local":
+        memory_client = LocalMemoryClient(
+            latency_fn=memory_latency, fault_rate=args.memory_fault_rate, seed=args.seed + 1
+        )
+    else:
+        memory_client = FakeMemoryClient(latency_fn=memory_latency)
+
+    router = AgentRouter(region_name=main.REGION)
+    router.model_config = StubModel(
+        response_fn=_classify,
+        latency_fn=latency_distribution(args.classifier_latency, seed=args.seed + 2),
+        input_tokens=None,
+        output_tokens=None,
+    )
+
+    agent_memory = AgentCoreMemory(memory_id=MEMORY_ID, region_name=main.REGION)
+    agent_memory._client = memory_client
+
+    models = {}
+
+    def generation_model(model_id: str) -> StubModel:
+        if model_id not in models:
+            models[model_id] = StubModel(
+                response_fn=_answer,
+                latency_fn=latency_distribution(
+                    args.generation_latency, seed=args.seed + 3 + len(models)
+                ),
+                model_id=model_id,
+                input_tokens=None,
+                output_tokens=None,
+            )
+        return models[model_id]
+
+    response_cache = ResponseCache.from_env()
+    if response_cache is not None:
+        agent_memory.add_write_listener(response_cache.invalidate_session)
+
+    main.router = router
+    main.memory = agent_memory
+    main._memory_checked = True
+    return generation_model, response_cache
+
+
+async def replay(payloads: list, concurrency: int) -> tuple:
+    """Executa o corpus. Returns: (histograma ponta a ponta, segundos, erros)."""
+    sessions: "OrderedDict[tuple, list]" = OrderedDict()
+    for payload in payloads:
+        key = (payload.get("actor_id", "user"), payload.get("session_id", "default"))
+        sessions.setdefault(key, []).append(payload)
+
+    latency = Histogram()
+    errors: list = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_session(turns: list) -> None:
+        async with semaphore:
+            for payload in turns:
+                start = time.perf_counter()
+                try:
+                    result = await main.invoke_async(dict(payload))
+                    if inspect.isasyncgen(result):
+                        events = [event async for event in result]
+                        response = "".join(e.get("data", "") for e in events)
+                    else:
+                        response = result["response"]
+                except Exception as e:
+                    errors.append(f"{payload.get('session_id')}: {e!r}")
+                    continue
+                latency.record((time.perf_counter() - start) * 1000)
+                if response == main.ERROR_RESPONSE:
+                    errors.append(f"{payload.get('session_id')}: agent error")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(turns) for turns in sessions.values()))
+    return latency, time.perf_counter() - start, errors
+
+
+def _short_path(filename: str) -> str:
+    """Caminho relativo ao agent/ ou ao site-packages/stdlib."""
+    agent_dir = str(Path(__file__).parent.parent)
+    if filename.startswith(agent_dir):
+        return os.path.relpath(filename, agent_dir)
+    for marker in ("site-packages/", "/lib/python"):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    return filename
+
+
+def stage_summaries(histograms) -> tuple:
+    """Resumo por estágio (todos os modelos) e por estágio × modelo."""
+    total, by_model = {}, {}
+    for stage, views in group_histograms(histograms, "model").items():
+        merged = Histogram()
+        for histogram in views.values():
+            merged.merge(histogram)
+        total[stage] = merged.summary()
+        by_model[stage] = {model: h.summary() for model, h in sorted(views.items())}
+    ordered = [s for s in STAGES if s in total] + sorted(set(total) - set(STAGES))
+    return {s: total[s] for s in ordered}, {s: by_model[s] for s in ordered}
+
+
+async def run(args) -> dict:
+    payloads = load_corpus(args.corpus, args.repeat)
+    generation_model, response_cache = build_components(args)
+    registry = get_registry()
+    registry.reset()
+    ledger = CostLedger()
+    admission = AdmissionController.from_env()
+
+    gc.collect()
+    gc_before = [stats["collections"] for stats in gc.get_stats()]
+    if args.allocations:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+
+    # Logs por request do entrypoint suprimidos (poluiriam o relatório)
+    with mock.patch.object(
+        main, "get_bedrock_model", side_effect=generation_model
+    ), mock.patch.object(main, "cost_ledger", ledger), mock.patch.object(
+        main, "response_cache", response_cache
+    ), mock.patch.object(
+        main, "admission", admission
+    ), contextlib.redirect_stdout(io.StringIO()):
+        latency, elapsed, errors = await replay(payloads, args.concurrency)
+        main.memory.flush(timeout=30)
+
+    allocations = None
+    if args.allocations:
+        gc.collect()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        diff = after.compare_to(before, "filename")
+        retained = sum(stat.size_diff for stat in diff)
+        blocks = sum(stat.count_diff for stat in diff)
+        allocations = {
+            "peak_kb": round(peak / 1024, 1),
+            "retained_kb": round(retained / 1024, 1),
+            "retained_bytes_per_request": round(retained / max(1, latency.count)),
+            "retained_blocks": blocks,
+            "top_sites": [
+                {
+                    "file": _short_path(stat.traceback[0].filename),
+                    "size_kb": round(stat.size_diff / 1024, 1),
+                    "blocks": stat.count_diff,
+                }
+                for stat in diff[: args.top]
+            ],
+        }
+    gc_after = [stats["collections"] for stats in gc.get_stats()]
+
+    stages, stages_by_model = stage_summaries(registry.collect())
+    costs = ledger.snapshot()["total"]
+    return {
+        "corpus": os.path.basename(args.corpus),
+        "settings": {
+            "repeat": args.repeat,
+            "concurrency": args.concurrency,
+            "classifier_latency": args.classifier_latency,
+            "generation_latency": args.generation_latency,
+            "memory_latency": args.memory_latency,
+            "memory_backend": args.memory_backend,
+            "memory_fault_rate": args.memory_fault_rate,
+            "seed": args.seed,
+        },
+        "requests": latency.count,
+        "errors": len(errors),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(latency.count / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": latency.summary(),
+        "stages_ms": stages,
+        "stages_by_model_ms": stages_by_model,
+        "allocations": allocations,
+        "gc_collections": [a - b for a, b in zip(gc_after, gc_before)],
+        "cost_usd": costs["cost_usd"],
+        "response_cache": response_cache.stats() if response_cache else None,
+        "admission": admission.stats() if admission else None,
+        "_errors": errors[:20],
+    }
+
+
+def print_report(result: dict) -> None:
+    settings = result["settings"]
+    print(
+        f"\n🧪 Replay {result['corpus']} x{settings['repeat']}: {result['requests']} requests, "
+        f"concurrency={settings['concurrency']}"
+    )
+    print(
+        f"   latency: classifier={settings['classifier_latency']} "
+        f"generation={settings['generation_latency']} memory={settings['memory_latency']}\n"
+    )
+    latency = result["latency_ms"]
+    print(f"  throughput   {result['throughput_rps']:8.1f} req/s  ({result['elapsed_s']:.2f}s)")
+    print(
+        f"  end-to-end   p50={latency['p50']:8.1f}ms  p95={latency['p95']:8.1f}ms  "
+        f"p99={latency['p99']:8.1f}ms"
+    )
+    print("\n  stages (all models)")
+    for stage, summary in result["stages_ms"].items():
+        print(
+            f"    {stage:<16} n={summary['count']:<5} p50={summary['p50']:8.1f}ms  "
+            f"p95={summary['p95']:8.1f}ms  p99={summary['p99']:8.1f}ms"
+        )
+    print("\n  generation by model")
+    for model, summary in result["stages_by_model_ms"].get("generation", {}).items():
+        print(f"    {model:<44} n={summary['count']:<5} p95={summary['p95']:8.1f}ms")
+
+    allocations = result["allocations"]
+    if allocations:
+        print(
+            f"\n  allocations  peak={allocations['peak_kb']:.0f}KB  "
+            f"retained={allocations['retained_kb']:.0f}KB "
+            f"({allocations['retained_bytes_per_request']}B/request)"
+        )
+        for site in allocations["top_sites"]:
+            print(f"    {site['size_kb']:9.1f}KB {site['blocks']:7} blocks  {site['file']}")
+    print(f"  gc           collections per generation {result['gc_collections']}")
+    print(f"  cost         ${result['cost_usd']:.6f}")
+    if result["response_cache"]:
+        print(f"  cache        hit_rate={result['response_cache']['hit_rate']:.1%}")
+    for model_id, stats in (result["admission"] or {}).items():
+        print(
+            f"  admission    {model_id}: limit={stats['limit']} "
+            f"peak_queue={stats['peak_queue']} shed={sum(stats['shed'].values())}"
+        )
+    if result["errors"]:
+        print(f"\n❌ {result['errors']} failed requests:")
+        for error in result["_errors"]:
+            print(f"  - {error}")
+
+
+# Métricas comparadas com o baseline: (caminho, maior é melhor?)
+def comparable_metrics(result: dict) -> dict:
+    metrics = {("throughput_rps",): (result["throughput_rps"], True)}
+    for pct in ("p50", "p95", "p99"):
+        metrics[("latency_ms", pct)] = (result["latency_ms"][pct], False)
+    for stage, summary in result["stages_ms"].items():
+        metrics[("stages_ms", stage, "p95")] = (summary["p95"], False)
+    if result["allocations"]:
+        metrics[("allocations", "peak_kb")] = (result["allocations"]["peak_kb"], False)
+        metrics[("allocations", "retained_bytes_per_request")] = (
+            result["allocations"]["retained_bytes_per_request"],
+            False,
+        )
+    return metrics
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """Compara com o baseline; devolve as regressões acima da tolerância."""
+    if baseline.get("settings") != result["settings"]:
+        print("\n⚠️ Baseline recorded with different settings; comparison is indicative")
+
+    current = comparable_metrics(result)
+    previous = comparable_metrics(baseline)
+    failures = []
+    print(f"\n  vs baseline (tolerance {tolerance:.0%})")
+    for path, (value, higher_is_better) in current.items():
+        if path not in previous:
+            continue
+        old = previous[path][0]
+        delta = (value - old) / old if old else 0.0
+        worse = -delta if higher_is_better else delta
+        # Ignora variações de poucos ms/KB (ruído de agendamento)
+        regressed = worse > tolerance and abs(value - old) > 1.0
+        mark = "❌" if regressed else "  "
+        print(f"   {mark} {'.'.join(path):<44} {old:10.1f} → {value:10.1f}  ({delta:+.0%})")
+        if regressed:
+            failures.append(f"{'.'.join(path)}: {old} → {value} ({delta:+.0%})")
+    return failures
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=16, help="Sessões em paralelo")
+    parser.add_argument("--classifier-latency", default="lognormal:150:0.3")
+    parser.add_argument("--generation-latency", default="lognormal:400:0.4")
+    parser.add_argument("--memory-latency", default="lognormal:40:0.5")
+    parser.add_argument("--memory-backend", choices=("fake", "local"), default="fake")
+    parser.add_argument(
+        "--memory-fault-rate", type=float, default=0.0, help="Só com --memory-backend local"
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-allocations", dest="allocations", action="store_false")
+    parser.add_argument("--top", type=int, default=5, help="Locais de alocação listados")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, help="Sobrescreve a tolerância do baseline")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="Grava o resultado completo em JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_report(result)
+    result.pop("_errors")
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n")
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        previous = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        result["tolerance"] = previous.get("tolerance", 0.25)
+        args.baseline.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n")
+        print(f"\n💾 Baseline updated: {args.baseline}")
+        return
+
+    failures = [f"{result['errors']} failed requests"] if result["errors"] else []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        tolerance = args.tolerance if args.tolerance is not None else baseline["tolerance"]
+        failures += compare(result, baseline, tolerance)
+
+    if failures:
+        print("\n❌ Performance regression:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ No performance regression")
+
+
+if __name__ == "__main__":
+    main_cli()
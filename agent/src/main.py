@@ -14,53 +14,200 @@ BEST PRACTICES SEGUIDAS:
 - Lazy initialization para Memory (graceful degradation se não configurado)
 - Strands Agent com prompt context do Memory
 - Router Agent para cost optimization
+
+COLD START (STARTUP_MODE):
+- "warm" (padrão): imports pesados (Strands, Memory) e clientes são criados
+  em background assim que o servidor sobe; /ping responde sem esperar
+- "lazy": tudo é criado no primeiro request que precisar
+- "eager": tudo é criado no import (comportamento anterior)
+
+GERAÇÃO ESPECULATIVA (SPECULATIVE_GENERATION=true, opt-in):
+- a geração no Nova Lite começa assim que o contexto chega, sem esperar o
+  Nova Micro; é mantida se a rota final for o mesmo modelo com o mesmo
+  contexto, senão é cancelada (ver serving/speculation.py)
+
+CACHE DE RESPOSTAS (RESPONSE_CACHE_ENABLED, padrão: ligado):
+- respostas TRIVIAL/INFORMATIVE são reutilizadas na mesma sessão até ela
+  receber um turno novo; cada escrita da sessão invalida as entradas e
+  respostas servidas do cache não são gravadas no Memory
+  (ver serving/response_cache.py)
+
+CONTROLE DE ADMISSÃO (ADMISSION_ENABLED, padrão: ligado):
+- cada model_id tem um limite de gerações simultâneas que se adapta ao
+  throttling do Bedrock (AIMD); o excedente espera numa fila limitada e é
+  descartado com BUSY_RESPONSE se o prazo não for alcançável (ver
+  serving/admission.py)
+
+MÉTRICAS (METRICS_ENABLED, padrão: ligado):
+- spans monotônicos de classificação, Memory (summary/turns), geração e
+  escrita no Memory alimentam histogramas por modelo e por complexidade,
+  exportados como linhas EMF (ver metrics/export.py)
+- custo em dólares de cada request (classificador + agente) vai para os
+  metadados e para o CostLedger por ator e por modelo (ver cost_report)
 """
 
+import asyncio
+import contextlib
+import importlib
+import inspect
 import os
-from typing import Dict, Any, Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime, timezone
 
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
-from strands import Agent
 
-# Importar Router Agent e Memory
+# Módulos leves (sem Strands/boto3); Router e Memory são importados sob demanda
 try:
-    from router.agent_router import AgentRouter
-    from memory.agentcore_memory import AgentCoreMemory
+    from router.usage import extract_usage, system_prompt_blocks, usage_cost
+    from memory.context_budget import build_prompt_context, estimate_tokens
+    from serving import speculation as spec
+    from serving.admission import AdmissionController, AdmissionRejected
+    from serving.response_cache import ResponseCache
+    from metrics.cost_ledger import CostLedger
+    from metrics.export import MetricsExporter
+    from metrics.registry import get_registry
 except ImportError:
-    from src.router.agent_router import AgentRouter
+    from src.router.usage import extract_usage, system_prompt_blocks, usage_cost
+    from src.memory.context_budget import build_prompt_context, estimate_tokens
+    from src.serving import speculation as spec
+    from src.serving.admission import AdmissionController, AdmissionRejected
+    from src.serving.response_cache import ResponseCache
+    from src.metrics.cost_ledger import CostLedger
+    from src.metrics.export import MetricsExporter
+    from src.metrics.registry import get_registry
+
+if TYPE_CHECKING:
+    from strands import Agent
+    from strands.models import BedrockModel
     from src.memory.agentcore_memory import AgentCoreMemory
-
-# Inicializar BedrockAgentCoreApp seguindo best practices
-app = BedrockAgentCoreApp()
+    from src.router.agent_router import AgentRouter
 
 # Configurar IDs de recursos AgentCore
-MEMORY_ID = os.getenv("BEDROCK_AGENTCORE_MEMORY_ID")
+# Backend local (AGENTCORE_MEMORY_BACKEND=local, SQLite em processo) dispensa
+# criar o recurso: qualquer memory_id é registrado no primeiro uso
+MEMORY_ID = os.getenv("BEDROCK_AGENTCORE_MEMORY_ID") or (
+    "local-memory"
+    if os.getenv("AGENTCORE_MEMORY_BACKEND", "agentcore").lower() == "local"
+    else None
+)
 REGION = os.getenv("AWS_REGION", "us-east-1")
+STARTUP_MODE = os.getenv("STARTUP_MODE", "warm").lower()
 
-# Inicializar componentes
-router = AgentRouter(region_name=REGION)
-memory: Optional[AgentCoreMemory] = None
+# Símbolos do Strands resolvidos no primeiro uso (ver _lazy)
+_LAZY_IMPORTS = {
+    "Agent": ("strands", "Agent"),
+    "BedrockModel": ("strands.models", "BedrockModel"),
+}
 
-# Lazy init do Memory (só quando configurado)
-if MEMORY_ID:
-    memory = AgentCoreMemory(memory_id=MEMORY_ID, region_name=REGION)
-    print(f"✅ AgentCore Memory configured: {MEMORY_ID[:20]}...")
-else:
-    print("⚠️ Memory not configured. Set BEDROCK_AGENTCORE_MEMORY_ID to enable.")
 
+def _lazy(name: str):
+    """Importa (uma vez) um símbolo pesado e o fixa no módulo.
 
-def get_strands_agent(model_id: str, context: str = "") -> Agent:
-    """Create a Strands Agent with the appropriate model and context.
+    Procura primeiro nos globais do módulo, para que `patch("src.main.Agent")`
+    continue funcionando nos testes.
+    """
+    value = globals().get(name)
+    if value is None:
+        module_name, attr = _LAZY_IMPORTS[name]
+        value = getattr(importlib.import_module(module_name), attr)
+        globals()[name] = value
+    return value
 
-    Args:
-        model_id: Bedrock model ID (e.g., us.amazon.nova-lite-v1:0)
-        context: Previous conversation context from Memory
 
-    Returns:
-        Configured Strands Agent
-    """
-    system_prompt = f"""Você é o n-agent, um assistente pessoal de viagens inteligente e amigável.
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _import_component(module_name: str, attr: str):
+    """Importa Router/Memory funcionando tanto de src/ quanto da raiz do agent."""
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        module = importlib.import_module(f"src.{module_name}")
+    return getattr(module, attr)
+
+
+# Componentes criados sob demanda (get_router / get_memory)
+router: Optional["AgentRouter"] = None
+memory: Optional["AgentCoreMemory"] = None
+_memory_checked = False
+_components_lock = threading.Lock()
+
+
+def get_router() -> "AgentRouter":
+    """Retorna o AgentRouter do processo, criando-o no primeiro uso."""
+    global router
+    if router is None:
+        with _components_lock:
+            if router is None:
+                router_class = _import_component("router.agent_router", "AgentRouter")
+                router = router_class(region_name=REGION)
+    return router
+
+
+def get_memory() -> Optional["AgentCoreMemory"]:
+    """Retorna o AgentCoreMemory do processo (None se não configurado)."""
+    global memory, _memory_checked
+    if memory is None and not _memory_checked:
+        with _components_lock:
+            if memory is None and not _memory_checked:
+                # Lazy init do Memory (só quando configurado)
+                if MEMORY_ID:
+                    memory_class = _import_component(
+                        "memory.agentcore_memory", "AgentCoreMemory"
+                    )
+                    memory = memory_class(memory_id=MEMORY_ID, region_name=REGION)
+                    # Escritas na sessão invalidam as respostas em cache dela
+                    if response_cache is not None:
+                        memory.add_write_listener(response_cache.invalidate_session)
+                    print(f"✅ AgentCore Memory configured: {MEMORY_ID[:20]}...")
+                else:
+                    print(
+                        "⚠️ Memory not configured. "
+                        "Set BEDROCK_AGENTCORE_MEMORY_ID to enable."
+                    )
+                _memory_checked = True
+    return memory
+
+
+def warm_up() -> None:
+    """Importa Strands e cria Router, Memory e o modelo de chat."""
+    start = time.perf_counter()
+    try:
+        model_id = get_router().models["chat"]["id"]
+        agent_memory = get_memory()
+        if agent_memory is not None:
+            # Acessar .client cria a sessão boto3 e o MemoryClient compartilhados
+            _ = agent_memory.client
+        get_bedrock_model(model_id)
+        print(f"🔥 Warm-up done in {int((time.perf_counter() - start) * 1000)}ms")
+    except Exception as e:
+        # Falha aqui não derruba o servidor: o primeiro request tenta de novo
+        print(f"⚠️ Warm-up failed: {e}")
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(_app):
+    # Servidor já aceita conexões (e /ping) enquanto o warm-up roda em background
+    if STARTUP_MODE == "warm":
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    # Exportação periódica dos histogramas (EMF no stdout ou arquivo)
+    exporter = MetricsExporter.from_env(metrics)
+    if exporter is not None:
+        exporter.start()
+    yield
+
+
+# Inicializar BedrockAgentCoreApp seguindo best practices
+app = BedrockAgentCoreApp(lifespan=_lifespan)
+
+
+# Persona estática: idêntica em todos os requests (candidata a prompt caching)
+PERSONA_PROMPT = """Você é o n-agent, um assistente pessoal de viagens inteligente e amigável.
 
 🎯 Seu objetivo é ajudar os usuários a planejar, organizar e aproveitar suas viagens.
 
@@ -76,31 +223,292 @@ def get_strands_agent(model_id: str, context: str = "") -> Agent:
 - Use emojis com moderação para tornar a conversa agradável
 - Seja conciso, mas completo nas respostas
 - Pergunte quando precisar de mais informações
-
-{f"📝 Contexto da Conversa:{chr(10)}{context}" if context else ""}
 """
 
-    return Agent(
-        model=model_id,
-        system_prompt=system_prompt,
+# Clientes BedrockModel por model_id (cliente boto3 + config reutilizados)
+_models: Dict[str, "BedrockModel"] = {}
+_models_lock = threading.Lock()
+
+
+def get_bedrock_model(model_id: str) -> "BedrockModel":
+    """Retorna o BedrockModel do model_id, criando-o uma única vez.
+
+    O Agent Strands guarda o histórico da conversa e não pode ser
+    compartilhado entre requests concorrentes; o modelo (cliente boto3) pode.
+    """
+    model = _models.get(model_id)
+    if model is None:
+        with _models_lock:
+            model = _models.get(model_id)
+            if model is None:
+                model = _lazy("BedrockModel")(model_id=model_id, region_name=REGION)
+                _models[model_id] = model
+    return model
+
+
+def build_system_prompt(context: str = "", enable_cache: bool = False):
+    """Persona estática seguida do contexto do request (se houver).
+
+    Com enable_cache, a persona vira um bloco separado seguido de checkpoint
+    de prompt caching e o contexto do request fica depois do checkpoint.
+    """
+    suffix = f"\n📝 Contexto da Conversa:\n{context}\n" if context else ""
+    return system_prompt_blocks(PERSONA_PROMPT, suffix, enable_cache=enable_cache)
+
+
+def get_strands_agent(
+    model_id: str, context: str = "", enable_cache: bool = False
+) -> "Agent":
+    """Create a Strands Agent with the appropriate model and context.
+
+    Apenas o Agent (estado da conversa) é criado por request; o modelo vem do
+    cache por model_id e a persona é uma constante do módulo.
+
+    Args:
+        model_id: Bedrock model ID (e.g., us.amazon.nova-lite-v1:0)
+        context: Previous conversation context from Memory
+        enable_cache: Adiciona checkpoint de prompt caching após a persona
+            (usar apenas em modelos com suporte, ver `enable_cache` do Router)
+
+    Returns:
+        Configured Strands Agent
+    """
+    return _lazy("Agent")(
+        model=get_bedrock_model(model_id),
+        system_prompt=build_system_prompt(context, enable_cache=enable_cache),
     )
 
 
+ERROR_RESPONSE = (
+    "Desculpe, tive um problema ao processar sua mensagem. Pode tentar novamente?"
+)
+
+# Resposta quando o controle de admissão descarta o request (modelo saturado)
+BUSY_RESPONSE = (
+    "Estou recebendo muitas mensagens agora 😅 Pode tentar novamente em alguns segundos?"
+)
+
+
+async def _timed(timings: Dict[str, int], stage: str, func, *args, **kwargs):
+    """Executa função bloqueante em thread registrando a duração (ms) do estágio."""
+    start = time.perf_counter()
+    try:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    finally:
+        timings[stage] = int((time.perf_counter() - start) * 1000)
+
+
+async def _no_context() -> None:
+    return None
+
+
+# Contadores do modo especulativo (SPECULATIVE_GENERATION)
+speculation_ledger = spec.SpeculationLedger()
+
+# Histogramas de latência do hot path (compartilhados com Router)
+metrics = get_registry()
+
+# Custo por ator e por modelo (janela móvel)
+cost_ledger = CostLedger.from_env()
+
+
+def cost_report(path: Optional[str] = None) -> Dict[str, Any]:
+    """Custo acumulado na janela, comparado a gerar tudo no Nova Pro.
+
+    Args:
+        path: Se informado, grava o relatório em JSON nesse arquivo
+
+    Returns:
+        Snapshot do CostLedger com o bloco `baseline` (economia do roteamento)
+    """
+    planning = get_router().models["planning"]
+    baseline = (
+        planning["id"],
+        planning["cost_input"],
+        planning["cost_output"],
+        planning.get("cost_cache_read", planning["cost_input"]),
+    )
+    if path:
+        cost_ledger.dump(path, baseline=baseline)
+    return cost_ledger.snapshot(baseline=baseline)
+
+
+# Respostas TRIVIAL/INFORMATIVE por sessão (None se RESPONSE_CACHE_ENABLED=false)
+response_cache = ResponseCache.from_env()
+
+# Limites de concorrência por modelo (None se ADMISSION_ENABLED=false)
+admission = AdmissionController.from_env()
+
+
+@contextlib.asynccontextmanager
+async def _admitted(
+    routing_config: Dict[str, Any],
+    payload: Dict[str, Any],
+    request_start: float,
+    timings: Dict[str, int],
+    outcome: Dict[str, Any],
+):
+    """Vaga de geração no modelo da rota (sem efeito se a admissão está desligada).
+
+    O prazo na fila vem de `deadline_ms` do payload (descontado o tempo já
+    gasto no request); `outcome` recebe o resultado para os metadados.
+
+    Raises:
+        AdmissionRejected: request descartado sem chamar o modelo
+    """
+    if admission is None:
+        yield None
+        return
+    timeout = None
+    if payload.get("deadline_ms"):
+        timeout = payload["deadline_ms"] / 1000 - (time.perf_counter() - request_start)
+    try:
+        async with admission.slot(
+            routing_config["model_id"], timeout, routing_config["complexity"]
+        ) as ticket:
+            timings["admission_wait"] = int(ticket.waited_ms)
+            outcome.update(
+                outcome="queued" if ticket.queued else "admitted",
+                wait_ms=round(ticket.waited_ms, 1),
+                limit=ticket.limit,
+            )
+            yield ticket
+    except AdmissionRejected as e:
+        timings["admission_wait"] = int(e.waited_ms)
+        outcome.update(outcome="shed", reason=e.reason, wait_ms=round(e.waited_ms, 1))
+        print(f"🚦 Admission shed {e.model_id}: {e.reason}")
+        raise
+
+
+def _should_speculate(payload: Dict[str, Any], user_message: str, has_image: bool) -> bool:
+    """Especula só quando a classificação depende do Nova Micro (e sem streaming)."""
+    return (
+        spec.speculation_enabled()
+        and not has_image
+        and not payload.get("stream", False)
+        and not get_router().is_trivial_pattern(user_message)
+    )
+
+
+def _start_speculation(
+    user_message: str, context_future
+) -> Optional["spec.SpeculativeGeneration"]:
+    """Inicia a geração no modelo de chat com o contexto já recuperado.
+
+    A especulação também ocupa uma vaga de admissão do modelo de chat, mas
+    nunca espera na fila: sem vaga imediata, não especula (None).
+    """
+    chat_model = get_router().models["chat"]
+    ticket = None
+    if admission is not None:
+        ticket = admission.try_acquire(chat_model["id"])
+        if ticket is None:
+            print(f"🎲 Speculation skipped: {chat_model['id']} at its admission limit")
+            return None
+
+    try:
+        fetched_context = None
+        if not context_future.cancelled() and context_future.exception() is None:
+            fetched_context = context_future.result()
+
+        prompt_context = build_prompt_context(
+            fetched_context.summary if fetched_context else None,
+            fetched_context.turns if fetched_context else [],
+            max_tokens=chat_model.get("context_budget_tokens"),
+        )
+        agent = get_strands_agent(
+            model_id=chat_model["id"],
+            context=prompt_context.text,
+            enable_cache=bool(chat_model.get("supports_prompt_cache", False)),
+        )
+        print(f"🎲 Speculative generation started on {chat_model['id']}")
+        speculation = spec.SpeculativeGeneration(
+            chat_model["id"],
+            agent.invoke_async(user_message),
+            context=prompt_context,
+            input_tokens=estimate_tokens(PERSONA_PROMPT + prompt_context.text + user_message),
+            cost_input_per_1m=chat_model["cost_input"],
+        )
+    except Exception:
+        if ticket is not None:
+            admission.release(ticket)
+        raise
+
+    # Vaga devolvida ao aceitar, cancelar ou falhar (throttling reduz o limite)
+    if ticket is not None:
+        admission.release_when_done(ticket, speculation.task)
+    return speculation
+
+
+async def _resolve_speculation(
+    speculation: "spec.SpeculativeGeneration",
+    routing_config: Dict[str, Any],
+    prompt_context,
+    routed_at: float,
+):
+    """Mantém ou cancela a especulação conforme a rota final.
+
+    Returns:
+        (resposta ou None, outcome, ms economizados)
+    """
+    keep = (
+        routing_config["model_id"] == speculation.model_id
+        and prompt_context.text == speculation.context.text
+    )
+    if not keep:
+        await speculation.cancel()
+        speculation_ledger.record(
+            spec.CANCELLED,
+            wasted_input_tokens=speculation.input_tokens,
+            cost_input_per_1m=speculation.cost_input_per_1m,
+        )
+        print(f"🎲 Speculation cancelled → {routing_config['model_id']}")
+        return None, spec.CANCELLED, 0
+
+    try:
+        response = await speculation.accept()
+    except Exception as e:
+        print(f"⚠️ Speculative generation failed: {e}")
+        speculation_ledger.record(
+            spec.FAILED,
+            wasted_input_tokens=speculation.input_tokens,
+            cost_input_per_1m=speculation.cost_input_per_1m,
+        )
+        return None, spec.FAILED, 0
+
+    saved = spec.saved_ms(speculation, routed_at)
+    speculation_ledger.record(spec.ACCEPTED, saved_ms=saved)
+    print(f"🎲 Speculation accepted ({saved}ms ahead)")
+    return response, spec.ACCEPTED, saved
+
+
 @app.entrypoint
-def invoke(payload: Dict[str, Any], context=None) -> Dict[str, Any]:
+async def invoke_async(payload: Dict[str, Any], context=None):
     """
     Entrypoint do AgentCore Runtime - Fase 1 com Memory Integration.
 
+    Classificação (Router) e recuperação de contexto (Memory) são independentes
+    e rodam em paralelo; `use_memory` e o orçamento de tokens do contexto
+    (`context_budget_tokens` do modelo escolhido) são aplicados depois que
+    ambas terminam.
+
     Args:
         payload: Dict contendo:
             - prompt: Mensagem do usuário (requerido)
             - trip_id: ID da viagem (opcional)
             - has_image: Se há imagem anexada (opcional)
+            - stream: Se True, devolve os chunks conforme são gerados (opcional)
+            - deadline_ms: Prazo do request; limita a espera na fila de
+              admissão do modelo (opcional)
         context: Contexto do AgentCore Runtime (session_id, headers, etc.)
 
     Returns:
-        dict: Resposta seguindo formato AgentCore
+        dict: Resposta seguindo formato AgentCore, ou async generator de
+        eventos (ver `_stream_generation`) quando `stream` é True
     """
+    request_start = time.perf_counter()
+    timings: Dict[str, int] = {}
+
     # Extrair dados do payload
     user_message = payload.get("prompt", "")
     trip_id = payload.get("trip_id")
@@ -123,75 +531,361 @@ def invoke(payload: Dict[str, Any], context=None) -> Dict[str, Any]:
 
     print(f"🔵 [Session: {session_id}] Processando: '{user_message[:50]}...'")
 
-    # 1. ROUTER AGENT: Classificar query e selecionar modelo
-    routing_config = router.route(
+    memory = get_memory()
+    memory_enabled = memory is not None and memory.is_configured()
+
+    # 1+2. ROUTER + MEMORY em paralelo: classificar query e recuperar contexto
+    routing_task = _timed(
+        timings,
+        "routing",
+        get_router().route,
         user_message=user_message,
         has_image=has_image,
         trip_context={"trip_id": trip_id} if trip_id else None,
     )
-
-    print(f"🔀 Router: {routing_config['complexity']} → {routing_config['model_id']}")
-
-    # 2. MEMORY: Recuperar contexto da conversa (se configurado)
-    memory_context = ""
-    if memory and memory.is_configured() and routing_config.get("use_memory", False):
-        memory_context = memory.format_context_for_prompt(
+    context_task = (
+        _timed(
+            timings,
+            "memory_context",
+            memory.fetch_context,
             actor_id=actor_id,
             session_id=session_id,
             current_query=user_message,
             include_summary=True,
         )
-        if memory_context:
-            print(f"📝 Memory context loaded ({len(memory_context)} chars)")
+        if memory_enabled
+        else _no_context()
+    )
+    routing_future = asyncio.ensure_future(routing_task)
+    context_future = asyncio.ensure_future(context_task)
+
+    # Modo especulativo: se o contexto chegar antes da classificação, a geração
+    # no modelo de chat começa já (ver serving/speculation.py)
+    speculation = None
+    speculation_outcome = None
+    if _should_speculate(payload, user_message, has_image):
+        await asyncio.wait({context_future})
+        if routing_future.done():
+            speculation_outcome = spec.SKIPPED
+            speculation_ledger.record(spec.SKIPPED)
+        else:
+            speculation = _start_speculation(user_message, context_future)
+            if speculation is None:
+                speculation_outcome = spec.SKIPPED
+                speculation_ledger.record(spec.SKIPPED)
+
+    routing_config, fetched_context = await asyncio.gather(
+        routing_future, context_future, return_exceptions=True
+    )
+    routed_at = time.perf_counter()
+    if isinstance(routing_config, BaseException):
+        if speculation:
+            await speculation.cancel()
+        raise routing_config
+    if isinstance(fetched_context, BaseException):
+        print(f"⚠️ Failed to load Memory context: {fetched_context}")
+        fetched_context = None
+
+    print(f"🔀 Router: {routing_config['complexity']} → {routing_config['model_id']}")
+    dimensions = {
+        "model": routing_config["model_id"],
+        "complexity": routing_config["complexity"],
+    }
+    if fetched_context is not None:
+        for part, elapsed_ms in fetched_context.timings_ms.items():
+            metrics.record(f"memory_{part}", elapsed_ms, **dimensions)
+
+    # Contexto buscado em paralelo é descartado quando o Router dispensa memória
+    if not routing_config.get("use_memory", False):
+        fetched_context = None
+
+    # Montar contexto dentro do orçamento do modelo (turnos antigos saem primeiro)
+    prompt_context = build_prompt_context(
+        fetched_context.summary if fetched_context else None,
+        fetched_context.turns if fetched_context else [],
+        max_tokens=routing_config.get("context_budget_tokens"),
+    )
+    memory_context = prompt_context.text
+    if memory_context:
+        print(
+            f"📝 Memory context loaded (~{prompt_context.tokens} tokens, "
+            f"{prompt_context.messages_dropped} messages trimmed)"
+        )
 
-    # 3. STRANDS AGENT: Executar agente com modelo selecionado
-    agent = get_strands_agent(
-        model_id=routing_config["model_id"],
-        context=memory_context,
+    # Cache de respostas: mesma pergunta na mesma sessão, sem turno novo desde então
+    cached = None
+    cacheable = response_cache is not None and response_cache.is_cacheable(
+        routing_config["complexity"]
     )
+    if cacheable:
+        lookup_start = time.perf_counter()
+        cached = response_cache.get(
+            routing_config["complexity"], user_message, actor_id, session_id
+        )
+        timings["response_cache"] = int((time.perf_counter() - lookup_start) * 1000)
+        if cached is not None:
+            print(f"⚡ Response cache hit (~{cached.generation_ms}ms saved)")
+            if speculation is not None:
+                await speculation.cancel()
+                speculation_ledger.record(
+                    spec.CANCELLED,
+                    wasted_input_tokens=speculation.input_tokens,
+                    cost_input_per_1m=speculation.cost_input_per_1m,
+                )
+                speculation_outcome = spec.CANCELLED
+                speculation = None
+
+    # 3. STRANDS AGENT: Executar agente com modelo selecionado (ou manter a
+    # geração especulativa, se ela usou o mesmo modelo e o mesmo contexto)
+    generation_start = time.perf_counter()
+    response = None
+    speculation_saved_ms = 0
+    if speculation is not None:
+        response, speculation_outcome, speculation_saved_ms = await _resolve_speculation(
+            speculation, routing_config, prompt_context, routed_at
+        )
+
+    # Resultado do controle de admissão (preenchido só se houver geração)
+    admission_outcome: Dict[str, Any] = {}
+
+    agent = None
+    if response is None and cached is None:
+        agent = get_strands_agent(
+            model_id=routing_config["model_id"],
+            context=memory_context,
+            enable_cache=bool(routing_config.get("enable_cache", False)),
+        )
+
+    def finish(
+        response_text: str, generation_usage: Dict[str, int], failed: bool = False
+    ) -> Dict[str, Any]:
+        # failed: resposta de erro/ocupado (sem geração) - não vira turno da sessão
+        # 4. MEMORY: Salvar interação em background (resposta não espera o create_event)
+        if "generation" in timings and admission_outcome.get("outcome") != "shed":
+            metrics.record("generation", timings["generation"], **dimensions)
+
+        # Custo do request com os preços da rota (tabela AgentRouter.models)
+        generation_cost = usage_cost(
+            generation_usage,
+            routing_config.get("cost_input_per_1m", 0.0),
+            routing_config.get("cost_output_per_1m", 0.0),
+            routing_config.get("cost_cache_read_per_1m"),
+        )
+        classification_cost = routing_config.get("classification_cost_usd", 0.0)
+        cost_ledger.record(
+            actor_id,
+            routing_config["model_id"],
+            generation_usage,
+            generation_cost,
+            classification_usage=routing_config.get("classification_usage"),
+            classification_cost_usd=classification_cost,
+        )
+
+        memory_write = "disabled"
+        if memory_enabled and (cached is not None or failed):
+            # Resposta repetida não é um turno novo (gravá-la invalidaria a
+            # própria entrada do cache); erro/ocupado voltaria como contexto
+            memory_write = "skipped"
+        elif memory_enabled:
+            with metrics.span("memory_write", **dimensions) as write_span:
+                try:
+                    queued = memory.add_interaction(
+                        actor_id=actor_id,
+                        session_id=session_id,
+                        user_message=user_message,
+                        agent_response=response_text,
+                        background=True,
+                    )
+                    memory_write = "queued" if queued is not False else "dropped"
+                    print(f"💾 Interaction {memory_write} for Memory")
+                except Exception as e:
+                    memory_write = "failed"
+                    print(f"⚠️ Failed to save to Memory: {e}")
+            timings["memory_write"] = int(write_span.elapsed_ms)
+
+        # Guardar depois da escrita: ela invalida as entradas antigas da sessão
+        if cacheable and cached is None and not failed:
+            response_cache.put(
+                routing_config["complexity"],
+                user_message,
+                actor_id,
+                session_id,
+                response_text,
+                timings.get("generation", 0),
+            )
 
+        timings["total"] = int((time.perf_counter() - request_start) * 1000)
+
+        # 5. Retornar resposta
+        return {
+            "response": response_text,
+            "metadata": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "session_id": session_id,
+                "actor_id": actor_id,
+                "trip_id": trip_id,
+                "routing": {
+                    "complexity": routing_config["complexity"],
+                    "model_id": routing_config["model_id"],
+                    "routing_time_ms": routing_config["routing_time_ms"],
+                    "use_tools": routing_config["use_tools"],
+                    "use_memory": routing_config["use_memory"],
+                    "enable_cache": routing_config.get("enable_cache", False),
+                },
+                # Tokens por chamada, incluindo leituras/escritas do prompt cache
+                "usage": {
+                    "generation": generation_usage,
+                    "classification": routing_config.get("classification_usage"),
+                },
+                "cost_usd": {
+                    "classification": round(classification_cost, 8),
+                    "generation": round(generation_cost, 8),
+                    "total": round(classification_cost + generation_cost, 8),
+                },
+                "memory_enabled": memory_enabled,
+                "memory_context_used": bool(memory_context),
+                "context_tokens": prompt_context.tokens,
+                "context_truncated": prompt_context.truncated,
+                "memory_write": memory_write,
+                "speculation": spec.outcome_metadata(
+                    speculation_outcome, speculation_saved_ms, speculation_ledger
+                ),
+                "response_cache": (
+                    {
+                        "hit": cached is not None,
+                        "cacheable": cacheable,
+                        "saved_ms": cached.generation_ms if cached else 0,
+                        "totals": response_cache.stats(),
+                    }
+                    if response_cache is not None
+                    else None
+                ),
+                "admission": admission_outcome or None,
+                "timings_ms": timings,
+                "phase": "1-foundation",
+            },
+        }
+
+    if cached is not None:
+        if payload.get("stream", False):
+            return _stream_cached(cached.response, timings, request_start, finish)
+        return finish(cached.response, extract_usage(None))
+
+    # Modo streaming: o Runtime repassa o async generator como SSE
+    if payload.get("stream", False):
+        return _stream_generation(
+            agent,
+            user_message,
+            timings,
+            request_start,
+            finish,
+            _admitted(routing_config, payload, request_start, timings, admission_outcome),
+        )
+
+    generation_usage = extract_usage(None)
+    failed = False
     try:
-        response = agent(user_message)
+        if response is None:
+            async with _admitted(
+                routing_config, payload, request_start, timings, admission_outcome
+            ):
+                # Espera na fila de admissão não conta como geração
+                generation_start = time.perf_counter()
+                response = await agent.invoke_async(user_message)
         response_text = str(response)
+        generation_usage = extract_usage(response)
+    except AdmissionRejected:
+        response_text = BUSY_RESPONSE
+        failed = True
     except Exception as e:
         print(f"❌ Agent error: {e}")
-        response_text = (
-            "Desculpe, tive um problema ao processar sua mensagem. "
-            "Pode tentar novamente?"
-        )
+        response_text = ERROR_RESPONSE
+        failed = True
+    timings["generation"] = int((time.perf_counter() - generation_start) * 1000)
 
-    # 4. MEMORY: Salvar interação (se configurado)
-    if memory and memory.is_configured():
-        try:
-            memory.add_interaction(
-                actor_id=actor_id,
-                session_id=session_id,
-                user_message=user_message,
-                agent_response=response_text,
-            )
-            print("💾 Interaction saved to Memory")
-        except Exception as e:
-            print(f"⚠️ Failed to save to Memory: {e}")
-
-    # 5. Retornar resposta
-    return {
-        "response": response_text,
-        "metadata": {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "session_id": session_id,
-            "actor_id": actor_id,
-            "trip_id": trip_id,
-            "routing": {
-                "complexity": routing_config["complexity"],
-                "model_id": routing_config["model_id"],
-                "routing_time_ms": routing_config["routing_time_ms"],
-                "use_tools": routing_config["use_tools"],
-                "use_memory": routing_config["use_memory"],
-            },
-            "memory_enabled": memory is not None and memory.is_configured(),
-            "phase": "1-foundation",
-        },
-    }
+    return finish(response_text, generation_usage, failed)
+
+
+async def _stream_generation(
+    agent: "Agent",
+    user_message: str,
+    timings: Dict[str, int],
+    request_start: float,
+    finish,
+    admitted=None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Gera os chunks de texto conforme o modelo produz e, no fim, os metadados.
+
+    Args:
+        admitted: Vaga de admissão (ver _admitted) mantida durante o stream
+
+    Eventos:
+        {"type": "chunk", "data": "<texto>"}  - um por delta do modelo
+        {"type": "done", "metadata": {...}}   - após salvar no Memory
+    """
+    generation_start = time.perf_counter()
+    generation_usage = extract_usage(None)
+    chunks: List[str] = []
+    failed = False
+    try:
+        async with admitted or contextlib.nullcontext():
+            generation_start = time.perf_counter()
+            async for event in agent.stream_async(user_message):
+                if "data" in event:
+                    if not chunks:
+                        timings["first_token"] = int(
+                            (time.perf_counter() - request_start) * 1000
+                        )
+                    chunks.append(event["data"])
+                    yield {"type": "chunk", "data": event["data"]}
+                elif "result" in event:
+                    generation_usage = extract_usage(event["result"])
+    except AdmissionRejected:
+        failed = True
+        chunks.append(BUSY_RESPONSE)
+        yield {"type": "chunk", "data": BUSY_RESPONSE}
+    except Exception as e:
+        print(f"❌ Agent error: {e}")
+        failed = True
+        chunks.append(ERROR_RESPONSE)
+        yield {"type": "chunk", "data": ERROR_RESPONSE}
+    timings["generation"] = int((time.perf_counter() - generation_start) * 1000)
+
+    result = finish("".join(chunks), generation_usage, failed)
+    yield {"type": "done", "metadata": result["metadata"]}
+
+
+async def _stream_cached(
+    response_text: str,
+    timings: Dict[str, int],
+    request_start: float,
+    finish,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Resposta do cache em um único chunk, com os mesmos eventos do streaming."""
+    timings["first_token"] = int((time.perf_counter() - request_start) * 1000)
+    yield {"type": "chunk", "data": response_text}
+    result = finish(response_text, extract_usage(None))
+    yield {"type": "done", "metadata": result["metadata"]}
+
+
+async def _invoke_and_collect(payload: Dict[str, Any], context=None):
+    result = await invoke_async(payload, context)
+    if inspect.isasyncgen(result):
+        return [event async for event in result]
+    return result
+
+
+def invoke(payload: Dict[str, Any], context=None):
+    """Versão síncrona de invoke_async (testes e scripts locais).
+
+    Com `stream`, devolve a lista de eventos gerados.
+    """
+    return asyncio.run(_invoke_and_collect(payload, context))
+
+
+# Modo eager: tudo pronto antes do servidor aceitar conexões
+if STARTUP_MODE == "eager":
+    warm_up()
 
 
 # Para testes locais com agentcore dev
@@ -1,5 +1,48 @@
-"""Memory module initialization."""
+"""Memory module initialization.
 
-from .agentcore_memory import AgentCoreMemory
+Exports are resolved on first access so that importing a light submodule
+(e.g. `src.memory.context_budget`) does not pull in the AgentCore Memory
+client stack on the cold-start path.
+"""
 
-__all__ = ["AgentCoreMemory"]
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "AgentCoreMemory": ".agentcore_memory",
+    "MemoryContext": ".agentcore_memory",
+    "LocalMemoryClient": ".local_client",
+    "PromptContext": ".context_budget",
+    "build_prompt_context": ".context_budget",
+    "estimate_tokens": ".context_budget",
+    "SessionContextCache": ".context_cache",
+    "SummaryAvailability": ".summary_probe",
+}
+
+if TYPE_CHECKING:
+    from .agentcore_memory import AgentCoreMemory, MemoryContext
+    from .local_client import LocalMemoryClient
+    from .context_budget import PromptContext, build_prompt_context, estimate_tokens
+    from .context_cache import SessionContextCache
+    from .summary_probe import SummaryAvailability
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "AgentCoreMemory",
+    "LocalMemoryClient",
+    "MemoryContext",
+    "PromptContext",
+    "SessionContextCache",
+    "SummaryAvailability",
+    "build_prompt_context",
+    "estimate_tokens",
+]
@@ -10,11 +10,246 @@ References:
   - https://docs.aws.amazon.com/bedrock-agentcore/latest/devguide/agentcore-sdk-memory.html
 """
 
+import atexit
 import os
-from typing import List, Dict, Optional
-
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Dict, Optional
+
+from botocore.exceptions import ClientError
 from bedrock_agentcore.memory import MemoryClient
 
+from .client_registry import get_memory_client
+from .context_budget import build_prompt_context
+from .context_cache import SessionContextCache
+from .summary_probe import SummaryAvailability, has_summary_strategy
+
+# Error codes worth retrying; other 4xx errors will fail again
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "ThrottledException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+}
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Check whether a failed Memory call is worth retrying."""
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return code in RETRYABLE_ERROR_CODES or status >= 500
+    # Connection/timeout errors raised before a response was received
+    return True
+
+
+_context_executor: Optional[ThreadPoolExecutor] = None
+_context_executor_lock = threading.Lock()
+
+
+def get_context_executor() -> ThreadPoolExecutor:
+    """Shared executor for concurrent context fetches (MEMORY_CONTEXT_WORKERS)."""
+    global _context_executor
+    if _context_executor is None:
+        with _context_executor_lock:
+            if _context_executor is None:
+                _context_executor = ThreadPoolExecutor(
+                    max_workers=int(os.environ.get("MEMORY_CONTEXT_WORKERS", "16")),
+                    thread_name_prefix="memory-context",
+                )
+    return _context_executor
+
+
+def create_context_cache() -> Optional[SessionContextCache]:
+    """Build the session turn cache from MEMORY_CONTEXT_CACHE_* variables.
+
+    Returns None when MEMORY_CONTEXT_CACHE is "false".
+    """
+    if os.environ.get("MEMORY_CONTEXT_CACHE", "true").lower() in ("0", "false", "no"):
+        return None
+    return SessionContextCache(
+        max_turns=int(os.environ.get("MEMORY_CONTEXT_CACHE_TURNS", "10")),
+        idle_ttl=float(os.environ.get("MEMORY_CONTEXT_CACHE_IDLE_SECONDS", "900")),
+        stale_after=float(os.environ.get("MEMORY_CONTEXT_CACHE_STALE_SECONDS", "300")),
+        max_bytes=int(os.environ.get("MEMORY_CONTEXT_CACHE_MAX_MB", "16")) * 1024 * 1024,
+    )
+
+
+def messages_to_turns(messages: List[tuple]) -> List[List[Dict]]:
+    """Group (content, role) tuples into turns in get_last_k_turns format.
+
+    A new turn starts at every USER message.
+    """
+    turns: List[List[Dict]] = []
+    for content, role in messages:
+        if role == "USER" or not turns:
+            turns.append([])
+        turns[-1].append({"content": {"text": content}, "role": role})
+    return turns
+
+
+@dataclass
+class MemoryContext:
+    """Parts of the conversation context retrieved from Memory.
+
+    Attributes:
+        summary: Session summary, if available
+        turns: Flattened messages from the last K turns
+        missing: Parts that timed out or failed ("summary", "turns")
+        timings_ms: Monotonic latency of each remote call ("summary", "turns");
+            a call that timed out reports the time waited for it
+    """
+
+    summary: Optional[str] = None
+    turns: List[Dict] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def _timed_call(func: Callable, *args: Any, **kwargs: Any) -> tuple:
+    """Run func and return (result, elapsed ms) measured with perf_counter."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+class BackgroundWriter:
+    """Bounded write queue persisted by a daemon worker thread.
+
+    Writes are retried with exponential backoff (plus jitter) on retryable
+    errors. When the queue is full the write is dropped instead of blocking
+    the request. Pending writes are flushed at interpreter shutdown.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        write_fn: Callable[..., Any],
+        max_queue_size: int = 1000,
+        max_retries: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 5.0,
+    ):
+        """Initialize the writer (the worker thread starts on first submit).
+
+        Args:
+            write_fn: Function called with each submitted event's kwargs
+            max_queue_size: Maximum number of pending writes
+            max_retries: Retries after the first failed attempt
+            backoff_base: Initial backoff in seconds (doubles per retry)
+            backoff_max: Maximum backoff in seconds
+        """
+        self.write_fn = write_fn
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats = {
+            "submitted": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "retries": 0,
+        }
+
+    def submit(self, **event: Any) -> bool:
+        """Queue a write. Returns False if it was dropped."""
+        self._ensure_started()
+        try:
+            if self._closed:
+                raise queue.Full
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._count("dropped")
+            print("⚠️ Memory write queue full, dropping event")
+            return False
+        self._count("submitted")
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued writes finish. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush pending writes and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is None:
+            return
+        if not self.flush(timeout):
+            print(f"⚠️ Memory write queue not drained: {self._queue.qsize()} pending")
+        try:
+            # Wedged worker with a full queue: give up instead of blocking shutdown
+            self._queue.put(self._STOP, timeout=1.0)
+        except queue.Full:
+            print("⚠️ Memory writer stuck, abandoning pending writes")
+            return
+        self._thread.join(timeout=1.0)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for submitted, written, dropped and failed writes."""
+        with self._lock:
+            return {**self._stats, "pending": self._queue.qsize()}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="memory-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            try:
+                if event is self._STOP:
+                    return
+                self._write_with_retry(event)
+            finally:
+                self._queue.task_done()
+
+    def _write_with_retry(self, event: Dict[str, Any]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.write_fn(**event)
+                self._count("written")
+                return
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable_error(e):
+                    self._count("failed")
+                    print(f"⚠️ Failed to save to Memory after {attempt + 1} attempts: {e}")
+                    return
+                self._count("retries")
+                backoff = min(self.backoff_max, self.backoff_base * 2**attempt)
+                time.sleep(backoff * random.uniform(0.5, 1.0))
+
 
 class AgentCoreMemory:
     """Wrapper for AgentCore Memory with session management.
@@ -32,21 +267,124 @@ class AgentCoreMemory:
         self.memory_id = memory_id or os.environ.get("BEDROCK_AGENTCORE_MEMORY_ID")
         self.region_name = region_name
         self._client: Optional[MemoryClient] = None
+        self._writer: Optional[BackgroundWriter] = None
+        self._writer_lock = threading.Lock()
+        self.context_timeout = float(
+            os.environ.get("MEMORY_CONTEXT_TIMEOUT_SECONDS", "2.0")
+        )
+        self.context_cache = create_context_cache()
+        # Called with (actor_id, session_id) after every write to a session
+        self._write_listeners: List[Callable[[str, str], Any]] = []
+        self.summary_availability = SummaryAvailability(
+            probe_fn=self._probe_summary_strategy,
+            strategy_backoff=float(
+                os.environ.get("MEMORY_SUMMARY_PROBE_BACKOFF_SECONDS", "600")
+            ),
+            session_backoff=float(
+                os.environ.get("MEMORY_SUMMARY_SESSION_BACKOFF_SECONDS", "30")
+            ),
+            max_sessions=int(
+                os.environ.get("MEMORY_SUMMARY_MAX_SESSIONS", "10000")
+            ),
+        )
 
     @property
     def client(self) -> MemoryClient:
-        """Lazy initialization of MemoryClient."""
+        """Lazy initialization of MemoryClient (shared per region)."""
         if self._client is None:
-            self._client = MemoryClient(region_name=self.region_name)
+            self._client = get_memory_client(self.region_name)
         return self._client
 
+    @property
+    def writer(self) -> BackgroundWriter:
+        """Lazy initialization of the background write queue.
+
+        Sized by MEMORY_WRITE_QUEUE_SIZE and MEMORY_WRITE_MAX_RETRIES.
+        """
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = BackgroundWriter(
+                        write_fn=self.client.create_event,
+                        max_queue_size=int(
+                            os.environ.get("MEMORY_WRITE_QUEUE_SIZE", "1000")
+                        ),
+                        max_retries=int(os.environ.get("MEMORY_WRITE_MAX_RETRIES", "3")),
+                    )
+        return self._writer
+
     def is_configured(self) -> bool:
         """Check if Memory is properly configured."""
         return self.memory_id is not None
 
+    def summary_stats(self) -> Dict[str, int]:
+        """Summary lookup counters (skipped calls, probes, negative sessions)."""
+        return self.summary_availability.stats()
+
+    def _probe_summary_strategy(self, memory_id: str) -> bool:
+        """Check whether the memory resource has a summary strategy."""
+        return has_summary_strategy(self.client.get_memory_strategies(memory_id))
+
+    def write_stats(self) -> Dict[str, int]:
+        """Background write counters (submitted, written, dropped, failed...)."""
+        if self._writer is None:
+            return {}
+        return self._writer.stats()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued background writes. Returns False on timeout."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def add_write_listener(self, listener: Callable[[str, str], Any]) -> None:
+        """Register a callback run with (actor_id, session_id) after each write.
+
+        Used to drop state derived from the session (e.g. cached responses)
+        as soon as the conversation changes.
+        """
+        self._write_listeners.append(listener)
+
+    def _create_event(
+        self, actor_id: str, session_id: str, messages: List[tuple], background: bool
+    ) -> bool:
+        """Persist an event inline or through the background write queue."""
+        event = {
+            "memory_id": self.memory_id,
+            "actor_id": actor_id,
+            "session_id": session_id,
+            "messages": messages,
+        }
+        if background:
+            written = self.writer.submit(**event)
+        else:
+            self.client.create_event(**event)
+            written = True
+
+        # Write-through: keep the session's cached turns in sync with the write
+        if self.context_cache is not None:
+            if written:
+                self.context_cache.append(
+                    actor_id, session_id, messages_to_turns(messages)
+                )
+            else:
+                self.context_cache.invalidate(actor_id, session_id)
+
+        for listener in self._write_listeners:
+            try:
+                listener(actor_id, session_id)
+            except Exception as e:
+                print(f"⚠️ Memory write listener failed: {e}")
+        return written
+
     def add_interaction(
-        self, actor_id: str, session_id: str, user_message: str, agent_response: str
-    ) -> None:
+        self,
+        actor_id: str,
+        session_id: str,
+        user_message: str,
+        agent_response: str,
+        background: bool = False,
+    ) -> bool:
         """Save user-agent interaction to memory using create_event API.
 
         Uses the official documented API with tuple-based messages format.
@@ -56,25 +394,33 @@ class AgentCoreMemory:
             session_id: Session identifier
             user_message: User's message
             agent_response: Agent's response
+            background: Queue the write instead of waiting for create_event
+
+        Returns:
+            False if the write was skipped or dropped by a full queue
         """
         if not self.memory_id:
             print("⚠️ Memory not configured, skipping save")
-            return
+            return False
 
         # Use create_event API (official documented method)
-        self.client.create_event(
-            memory_id=self.memory_id,
-            actor_id=actor_id,
-            session_id=session_id,
-            messages=[
+        return self._create_event(
+            actor_id,
+            session_id,
+            [
                 (user_message, "USER"),
                 (agent_response, "ASSISTANT"),
             ],
+            background,
         )
 
     def add_conversation(
-        self, actor_id: str, session_id: str, messages: List[tuple]
-    ) -> None:
+        self,
+        actor_id: str,
+        session_id: str,
+        messages: List[tuple],
+        background: bool = False,
+    ) -> bool:
         """Save multiple messages at once using create_event API.
 
         Uses the official documented API with tuple-based messages format.
@@ -83,18 +429,17 @@ class AgentCoreMemory:
             actor_id: User identifier
             session_id: Session identifier
             messages: List of (content, role) tuples where role is USER, ASSISTANT, or TOOL
+            background: Queue the write instead of waiting for create_event
+
+        Returns:
+            False if the write was skipped or dropped by a full queue
         """
         if not self.memory_id:
             print("⚠️ Memory not configured, skipping save")
-            return
+            return False
 
         # Use create_event for batch saving (official documented method)
-        self.client.create_event(
-            memory_id=self.memory_id,
-            actor_id=actor_id,
-            session_id=session_id,
-            messages=messages,
-        )
+        return self._create_event(actor_id, session_id, messages, background)
 
     def retrieve_context(
         self, actor_id: str, session_id: str, query: str, top_k: int = 5
@@ -115,13 +460,21 @@ class AgentCoreMemory:
         if not self.memory_id:
             return []
 
-        # Use get_last_k_turns for conversation history
-        turns = self.client.get_last_k_turns(
-            memory_id=self.memory_id,
-            actor_id=actor_id,
-            session_id=session_id,
-            k=top_k,
-        )
+        # Serve from the session cache; refresh remotely on miss or staleness
+        turns = None
+        if self.context_cache is not None:
+            turns = self.context_cache.get(actor_id, session_id, top_k)
+
+        if turns is None:
+            # Use get_last_k_turns for conversation history
+            turns = self.client.get_last_k_turns(
+                memory_id=self.memory_id,
+                actor_id=actor_id,
+                session_id=session_id,
+                k=top_k,
+            )
+            if self.context_cache is not None:
+                self.context_cache.load(actor_id, session_id, turns, top_k)
 
         # Flatten turns into list of messages
         # Each turn is a list of [user_input, agent_response]
@@ -161,6 +514,13 @@ class AgentCoreMemory:
         if not self.memory_id:
             return None
 
+        # Skip the remote call while a negative result is cached
+        if not self.summary_availability.should_fetch(
+            self.memory_id, actor_id, session_id
+        ):
+            return None
+
+        summary = None
         try:
             # Try to retrieve summary using retrieve_memories
             # This may fail if summary strategy is not configured
@@ -176,15 +536,93 @@ class AgentCoreMemory:
             memories = response if isinstance(response, list) else []
             if memories:
                 first = memories[0]
-                return (
+                content = (
                     first.get("content")
                     if isinstance(first, dict)
                     else getattr(first, "content", None)
                 )
+                # Records carry {"text": ...}; the prompt needs the text itself
+                if isinstance(content, dict):
+                    content = content.get("text")
+                summary = content
         except Exception:
             # Summary strategy may not be configured
             pass
-        return None
+
+        self.summary_availability.record(
+            self.memory_id, actor_id, session_id, found=bool(summary)
+        )
+        return summary
+
+    def fetch_context(
+        self,
+        actor_id: str,
+        session_id: str,
+        current_query: str,
+        include_summary: bool = True,
+        timeout: Optional[float] = None,
+    ) -> MemoryContext:
+        """Fetch session summary and last turns concurrently.
+
+        Both remote calls are issued on a shared executor. If the timeout
+        expires, whatever already returned is used and the rest is reported
+        in MemoryContext.missing (a late result is discarded).
+
+        Args:
+            actor_id: User identifier
+            session_id: Session identifier
+            current_query: Current user query
+            include_summary: Whether to fetch the session summary
+            timeout: Seconds to wait for both calls (default: context_timeout)
+
+        Returns:
+            MemoryContext with the parts that were retrieved
+        """
+        context = MemoryContext()
+        if not self.memory_id:
+            return context
+
+        executor = get_context_executor()
+        start = time.perf_counter()
+        futures = {
+            "turns": executor.submit(
+                _timed_call,
+                self.retrieve_context,
+                actor_id,
+                session_id,
+                current_query,
+                top_k=5,
+            )
+        }
+        if include_summary:
+            futures["summary"] = executor.submit(
+                _timed_call, self.get_session_summary, actor_id, session_id
+            )
+
+        done, _ = wait(
+            futures.values(),
+            timeout=self.context_timeout if timeout is None else timeout,
+        )
+        waited_ms = (time.perf_counter() - start) * 1000
+
+        for name, future in futures.items():
+            if future not in done:
+                print(f"⚠️ Memory {name} timed out, continuing without it")
+                context.missing.append(name)
+                context.timings_ms[name] = waited_ms
+                continue
+            try:
+                result, context.timings_ms[name] = future.result()
+            except Exception as e:
+                print(f"⚠️ Memory {name} failed: {e}")
+                context.missing.append(name)
+                continue
+            if name == "summary":
+                context.summary = result
+            else:
+                context.turns = result
+
+        return context
 
     def format_context_for_prompt(
         self,
@@ -192,6 +630,8 @@ class AgentCoreMemory:
         session_id: str,
         current_query: str,
         include_summary: bool = True,
+        timeout: Optional[float] = None,
+        max_tokens: Optional[int] = None,
     ) -> str:
         """Format memory context for agent prompt.
 
@@ -200,6 +640,9 @@ class AgentCoreMemory:
             session_id: Session identifier
             current_query: Current user query
             include_summary: Whether to include session summary
+            timeout: Seconds to wait for the remote calls (default: context_timeout)
+            max_tokens: Token budget for the context; older turns are trimmed
+                first and the summary is kept (default: unlimited)
 
         Returns:
             Formatted context string for prompt
@@ -207,29 +650,10 @@ class AgentCoreMemory:
         if not self.memory_id:
             return ""
 
-        context_parts = []
-
-        # Get session summary
-        if include_summary:
-            summary = self.get_session_summary(actor_id, session_id)
-            if summary:
-                context_parts.append(f"# Session Summary\n{summary}\n")
-
-        # Get relevant memories
-        memories = self.retrieve_context(actor_id, session_id, current_query, top_k=5)
-        if memories:
-            context_parts.append("# Relevant Previous Context")
-            for i, mem in enumerate(memories, 1):
-                score = mem.get("score", 0.0)
-                # Extract text from content (can be dict with 'text' key or string)
-                content = mem.get("content", "")
-                if isinstance(content, dict):
-                    content = content.get("text", str(content))
-                context_parts.append(
-                    f"{i}. [{mem['role']}] {content} (relevance: {score:.2f})"
-                )
-
-        return "\n".join(context_parts) if context_parts else ""
+        context = self.fetch_context(
+            actor_id, session_id, current_query, include_summary, timeout
+        )
+        return build_prompt_context(context.summary, context.turns, max_tokens).text
 
 
 def create_memory_if_not_exists(
@@ -247,14 +671,15 @@ def create_memory_if_not_exists(
     Returns:
         Memory ID (existing or newly created)
     """
-    client = MemoryClient(region_name=region_name)
+    client = get_memory_client(region_name)
 
     # Check if memory already exists
     try:
         memories = client.list_memories()
-        existing = [
-            m for m in memories.get("memories", []) if m.get("name") == memory_name
-        ]
+        # MemoryClient returns a list; older releases returned {"memories": [...]}
+        if isinstance(memories, dict):
+            memories = memories.get("memories", [])
+        existing = [m for m in memories if m.get("name") == memory_name]
         if existing:
             memory_id = existing[0].get("id")
             print(f"✅ Using existing memory: {memory_id}")
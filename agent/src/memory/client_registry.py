@@ -0,0 +1,139 @@
+"""Process-wide registry of AgentCore Memory clients, keyed by region.
+
+AgentRouter, AgentCoreMemory and create_memory_if_not_exists used to build
+their own MemoryClient, each with its own boto3 session (credential
+resolution) and HTTP connection pools. The registry keeps one boto3 session
+and one MemoryClient per region so the whole process shares a single warm
+pool.
+
+The session carries a default client config applied to every client it
+creates:
+
+- MEMORY_MAX_POOL_CONNECTIONS: connections per client pool (default 32;
+  botocore's default of 10 is below the context executor's worker count)
+- TCP keepalive, so idle pooled connections survive between requests
+
+MemoryClients are assembled around the shared session's boto3 clients (with
+the SDK's user agent) instead of going through MemoryClient.__init__.
+
+AGENTCORE_MEMORY_BACKEND=local swaps the MemoryClient for a SQLite-backed
+LocalMemoryClient (see local_client) shared by all regions, so benchmarks and
+integration tests run with no network.
+"""
+
+import os
+import threading
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Dict, Optional
+
+import boto3
+import botocore.session
+from botocore.config import Config
+from bedrock_agentcore.memory import MemoryClient
+
+DEFAULT_MAX_POOL_CONNECTIONS = 32
+
+_lock = threading.Lock()
+_sessions: Dict[str, boto3.Session] = {}
+_memory_clients: Dict[str, MemoryClient] = {}
+_local_client: Optional[Any] = None
+
+
+def memory_backend() -> str:
+    """Selected Memory backend: "agentcore" (default) or "local"."""
+    return os.environ.get("AGENTCORE_MEMORY_BACKEND", "agentcore").lower()
+
+
+def client_config() -> Config:
+    """Client config shared by all Memory clients (pool size from env)."""
+    return Config(
+        max_pool_connections=int(
+            os.environ.get(
+                "MEMORY_MAX_POOL_CONNECTIONS", str(DEFAULT_MAX_POOL_CONNECTIONS)
+            )
+        ),
+        tcp_keepalive=True,
+    )
+
+
+def get_boto_session(region_name: str) -> boto3.Session:
+    """Return the shared boto3 session for a region."""
+    session = _sessions.get(region_name)
+    if session is None:
+        with _lock:
+            session = _sessions.get(region_name)
+            if session is None:
+                core = botocore.session.get_session()
+                core.set_default_client_config(client_config())
+                session = boto3.Session(botocore_session=core, region_name=region_name)
+                _sessions[region_name] = session
+    return session
+
+
+def _sdk_user_agent() -> str:
+    """User-agent suffix the SDK's own MemoryClient sends (telemetry)."""
+    try:
+        from bedrock_agentcore._utils.user_agent import build_user_agent_suffix
+    except ImportError:
+        try:
+            return f"bedrock-agentcore/{version('bedrock-agentcore')}"
+        except PackageNotFoundError:
+            return "bedrock-agentcore"
+    return build_user_agent_suffix()
+
+
+def _new_memory_client(session: boto3.Session, region_name: str) -> MemoryClient:
+    """Build a MemoryClient whose boto3 clients come from the shared session."""
+    # bedrock-agentcore 1.1.2 (locked in uv.lock) has no boto3_session
+    # argument, and MemoryClient() would build two throwaway boto3 clients on
+    # a fresh session. Skip __init__ and set the attributes it sets, keeping
+    # the SDK's user agent on top of the shared pool config.
+    client = MemoryClient.__new__(MemoryClient)
+    client.region_name = region_name
+    client.integration_source = None
+    config = client_config().merge(Config(user_agent_extra=_sdk_user_agent()))
+    client.gmcp_client = session.client(
+        "bedrock-agentcore-control", region_name=region_name, config=config
+    )
+    client.gmdp_client = session.client(
+        "bedrock-agentcore", region_name=region_name, config=config
+    )
+    return client
+
+
+def get_memory_client(region_name: str) -> MemoryClient:
+    """Return the shared MemoryClient for a region, creating it once."""
+    if memory_backend() == "local":
+        return get_local_memory_client()
+    client = _memory_clients.get(region_name)
+    if client is None:
+        session = get_boto_session(region_name)
+        with _lock:
+            client = _memory_clients.get(region_name)
+            if client is None:
+                client = _new_memory_client(session, region_name)
+                _memory_clients[region_name] = client
+    return client
+
+
+def get_local_memory_client():
+    """Return the process-wide LocalMemoryClient (built from LOCAL_MEMORY_*)."""
+    global _local_client
+    if _local_client is None:
+        from .local_client import LocalMemoryClient
+
+        with _lock:
+            if _local_client is None:
+                _local_client = LocalMemoryClient.from_env()
+    return _local_client
+
+
+def clear_clients() -> None:
+    """Drop all cached sessions and clients (tests, credential rotation)."""
+    global _local_client
+    with _lock:
+        _sessions.clear()
+        _memory_clients.clear()
+        if _local_client is not None:
+            _local_client.close()
+            _local_client = None
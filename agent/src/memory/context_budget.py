@@ -0,0 +1,137 @@
+"""Token-budgeted assembly of the Memory context block.
+
+The context block (session summary + last turns) goes into the system
+prompt of every request. Without a limit, long assistant replies inflate
+input tokens on the larger models. build_prompt_context keeps the block
+within a per-model budget:
+
+- the session summary is always kept (truncated only if it alone exceeds
+  the budget)
+- turns are added newest first; the first one that does not fit is
+  truncated and everything older is dropped
+
+Tokens are estimated on-box (~4 characters per token), which is cheap and
+close enough for Nova and Claude on mixed Portuguese/English text.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+CHARS_PER_TOKEN = 4
+
+# A truncated message shorter than this is not worth keeping
+MIN_TRUNCATED_TOKENS = 16
+
+TRUNCATION_MARKER = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text (~4 chars per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class PromptContext:
+    """Context block ready for the system prompt.
+
+    Attributes:
+        text: Formatted context ("" if there is nothing to include)
+        tokens: Estimated tokens of text
+        messages_used: Messages included (fully or truncated)
+        messages_dropped: Older messages left out by the budget
+        truncated: Whether any part was cut to fit the budget
+    """
+
+    text: str = ""
+    tokens: int = 0
+    messages_used: int = 0
+    messages_dropped: int = 0
+    truncated: bool = False
+
+
+def _message_text(message: Dict) -> str:
+    # Content can be dict with 'text' key or string
+    content = message.get("content", "")
+    if isinstance(content, dict):
+        content = content.get("text", str(content))
+    return str(content)
+
+
+def _format_message(index: int, message: Dict, content: str) -> str:
+    score = message.get("score", 0.0)
+    return f"{index}. [{message['role']}] {content} (relevance: {score:.2f})"
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER)
+    if max_chars <= 0:
+        return ""
+    return text[:max_chars].rstrip() + TRUNCATION_MARKER
+
+
+def build_prompt_context(
+    summary: Optional[str],
+    messages: List[Dict],
+    max_tokens: Optional[int] = None,
+) -> PromptContext:
+    """Format summary and messages, trimming older messages to fit a budget.
+
+    Args:
+        summary: Session summary, if available
+        messages: Flattened messages from the last turns, oldest first
+        max_tokens: Token budget for the whole block (None = unlimited)
+
+    Returns:
+        PromptContext with the text and how much of the history fit
+    """
+    result = PromptContext()
+    if max_tokens is not None and max_tokens <= 0:
+        result.messages_dropped = len(messages)
+        result.truncated = bool(summary or messages)
+        return result
+
+    parts = []
+    remaining = max_tokens if max_tokens is not None else float("inf")
+
+    # Session summary
+    if summary:
+        block = f"# Session Summary\n{summary}\n"
+        if estimate_tokens(block) > remaining:
+            overhead = estimate_tokens("# Session Summary\n\n")
+            block = f"# Session Summary\n{_truncate(summary, int(remaining) - overhead)}\n"
+            result.truncated = True
+        parts.append(block)
+        remaining -= estimate_tokens(block) + 1  # + newline separator
+
+    # Relevant memories, newest first until the budget runs out
+    header = "# Relevant Previous Context"
+    selected: List[tuple] = []
+    if messages and remaining > estimate_tokens(header) + MIN_TRUNCATED_TOKENS:
+        remaining -= estimate_tokens(header) + 1
+        # Widest index bounds the cost of every line
+        width_index = len(messages)
+        for message in reversed(messages):
+            content = _message_text(message)
+            cost = estimate_tokens(_format_message(width_index, message, content)) + 1
+            if cost <= remaining:
+                selected.append((message, content))
+                remaining -= cost
+                continue
+            overhead = cost - estimate_tokens(content)
+            if remaining - overhead >= MIN_TRUNCATED_TOKENS:
+                selected.append((message, _truncate(content, int(remaining) - overhead)))
+                result.truncated = True
+            break
+
+    if selected:
+        parts.append(header)
+        for i, (message, content) in enumerate(reversed(selected), 1):
+            parts.append(_format_message(i, message, content))
+
+    result.messages_used = len(selected)
+    result.messages_dropped = len(messages) - len(selected)
+    if result.messages_dropped:
+        result.truncated = True
+    result.text = "\n".join(parts) if parts else ""
+    result.tokens = estimate_tokens(result.text)
+    return result
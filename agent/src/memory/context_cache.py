@@ -0,0 +1,175 @@
+"""Session-scoped write-through cache of recent conversation turns.
+
+Each turn of a conversation used to re-download the last K turns with
+get_last_k_turns, even though this same process wrote the latest turn a few
+seconds earlier. The cache keeps a ring buffer of recent turns per
+(actor_id, session_id):
+
+- add_interaction/add_conversation append to it (write-through)
+- retrieve_context serves reads from it while the entry is fresh
+- a remote refresh only happens on a miss or when the entry is stale
+
+Entries are evicted after an idle period and, least recently used first,
+when the total cached text exceeds the memory cap.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+Turn = List[Dict]
+
+
+def turn_size(turn: Turn) -> int:
+    """Approximate memory footprint of a turn (bytes of message text)."""
+    size = 0
+    for message in turn:
+        content = message.get("content", "")
+        if isinstance(content, dict):
+            content = content.get("text", "")
+        size += len(str(content)) + 64  # text + per-message overhead
+    return size
+
+
+@dataclass
+class _SessionEntry:
+    turns: Deque[Turn]
+    complete: bool
+    refreshed_at: float
+    last_access: float
+    size: int = 0
+    sizes: Deque[int] = field(default_factory=deque)
+
+
+class SessionContextCache:
+    """Thread-safe ring buffer of recent turns per (actor_id, session_id)."""
+
+    def __init__(
+        self,
+        max_turns: int = 10,
+        idle_ttl: float = 900.0,
+        stale_after: float = 300.0,
+        max_bytes: int = 16 * 1024 * 1024,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_turns: Turns kept per session
+            idle_ttl: Seconds without access before a session is evicted
+            stale_after: Seconds after a remote load before a refresh is forced
+            max_bytes: Cap on the total cached text across sessions
+        """
+        self.max_turns = max_turns
+        self.idle_ttl = idle_ttl
+        self.stale_after = stale_after
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[Tuple[str, str], _SessionEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    def get(self, actor_id: str, session_id: str, k: int) -> Optional[List[Turn]]:
+        """Return the last k turns, or None on a miss or stale entry."""
+        key = (actor_id, session_id)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is None or (len(entry.turns) < k and not entry.complete):
+                self._stats["misses"] += 1
+                return None
+            if now - entry.refreshed_at >= self.stale_after:
+                self._stats["stale"] += 1
+                return None
+
+            entry.last_access = now
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return list(entry.turns)[-k:] if k > 0 else []
+
+    def load(self, actor_id: str, session_id: str, turns: List[Turn], k: int) -> None:
+        """Replace a session's turns with a fresh remote result for k turns."""
+        key = (actor_id, session_id)
+        now = time.monotonic()
+        maxlen = max(self.max_turns, k)
+        with self._lock:
+            self._remove(key)
+            entry = _SessionEntry(
+                turns=deque(maxlen=maxlen),
+                # Fewer turns than requested means the whole session is known
+                complete=len(turns) < k,
+                refreshed_at=now,
+                last_access=now,
+            )
+            self._entries[key] = entry
+            for turn in turns[-maxlen:]:
+                self._append(entry, turn)
+            self._evict_to_cap()
+
+    def append(self, actor_id: str, session_id: str, turns: List[Turn]) -> None:
+        """Write-through new turns to a session already cached.
+
+        Sessions never loaded from the remote are left alone: caching only
+        the newest turn would hide the older ones from later reads.
+        """
+        key = (actor_id, session_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            for turn in turns:
+                self._append(entry, turn)
+            entry.last_access = time.monotonic()
+            self._entries.move_to_end(key)
+            self._evict_to_cap()
+
+    def invalidate(self, actor_id: str, session_id: str) -> None:
+        """Drop a session from the cache."""
+        with self._lock:
+            self._remove((actor_id, session_id))
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters plus current size."""
+        with self._lock:
+            return {
+                **self._stats,
+                "sessions": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+    def _append(self, entry: _SessionEntry, turn: Turn) -> None:
+        if len(entry.turns) == entry.turns.maxlen:
+            # Oldest turn falls out of the ring buffer
+            entry.turns.popleft()
+            removed = entry.sizes.popleft()
+            entry.size -= removed
+            self._total_bytes -= removed
+            entry.complete = False
+        size = turn_size(turn)
+        entry.turns.append(turn)
+        entry.sizes.append(size)
+        entry.size += size
+        self._total_bytes += size
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+
+    def _evict_idle(self, now: float) -> None:
+        # Entries are ordered by last access, so expired ones are at the front
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry.last_access < self.idle_ttl:
+                break
+            self._remove(key)
+            self._stats["evictions"] += 1
+
+    def _evict_to_cap(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._stats["evictions"] += 1
@@ -0,0 +1,348 @@
+"""Local, in-process stand-in for the AgentCore MemoryClient.
+
+Selected with AGENTCORE_MEMORY_BACKEND=local (see client_registry). It keeps
+events, memory resources and long-term records in SQLite, so memory-heavy
+paths (context fetch, background writes, summaries) can be load-tested and
+integration-tested with no network.
+
+Implements the MemoryClient methods this codebase calls:
+
+- create_event / get_last_k_turns: short-term events per actor and session
+- retrieve_memories: records by exact namespace; a memory with a
+  summaryMemoryStrategy keeps an extractive session summary under
+  /summaries/{actorId}/{sessionId}, refreshed on every event
+- list_memories / create_memory_and_wait / get_memory_strategies
+
+Every call sleeps for an injectable latency and fails with a retryable
+ThrottlingException at an injectable rate, like a throttled service would.
+
+Environment:
+
+- LOCAL_MEMORY_DB: SQLite file (default ":memory:", lost on exit)
+- LOCAL_MEMORY_LATENCY_MS: median latency per call (default 0)
+- LOCAL_MEMORY_LATENCY_SIGMA: lognormal spread of the latency (default 0.5)
+- LOCAL_MEMORY_FAULT_RATE: fraction of calls that fail (default 0)
+- LOCAL_MEMORY_SEED: seed for latency and faults (default: random)
+"""
+
+import json
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+# Strategies given to memory ids that were never created (auto-registered),
+# same as create_memory_if_not_exists
+DEFAULT_STRATEGIES = [
+    {
+        "summaryMemoryStrategy": {
+            "name": "TripSessionSummarizer",
+            "namespaces": ["/summaries/{actorId}/{sessionId}"],
+        }
+    },
+    {
+        "userPreferenceMemoryStrategy": {
+            "name": "TravelPreferences",
+            "namespaces": ["/users/{actorId}/preferences"],
+        }
+    },
+]
+
+# Characters of user messages kept in the extractive summary
+SUMMARY_MAX_CHARS = 600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id TEXT PRIMARY KEY,
+    name TEXT UNIQUE,
+    description TEXT,
+    strategies TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT NOT NULL,
+    memory_id TEXT NOT NULL,
+    actor_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    event_timestamp REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session
+    ON events (memory_id, actor_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS records (
+    memory_id TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (memory_id, namespace, record_id)
+);
+"""
+
+
+def lognormal_latency(
+    median_ms: float, sigma: float = 0.5, seed: Optional[int] = None
+) -> Optional[Callable[[], float]]:
+    """Latency function (seconds) with a long tail, or None for no latency."""
+    if median_ms <= 0:
+        return None
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def latency() -> float:
+        with lock:
+            return rng.lognormvariate(math.log(median_ms), sigma) / 1000
+
+    return latency
+
+
+class LocalMemoryClient:
+    """SQLite-backed MemoryClient with injectable latency and faults."""
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        latency_fn: Optional[Callable[[], float]] = None,
+        fault_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the local store.
+
+        Args:
+            db_path: SQLite file, or ":memory:" for a per-client database
+            latency_fn: Returns the simulated latency (seconds) of each call
+            fault_rate: Fraction of calls raising a ThrottlingException
+            seed: Seed for fault injection
+        """
+        self.db_path = db_path
+        self.latency_fn = latency_fn
+        self.fault_rate = fault_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self.stats = {"calls": 0, "faults": 0}
+
+    @classmethod
+    def from_env(cls) -> "LocalMemoryClient":
+        """Build the client from the LOCAL_MEMORY_* variables."""
+        seed = os.environ.get("LOCAL_MEMORY_SEED")
+        seed = int(seed) if seed else None
+        return cls(
+            db_path=os.environ.get("LOCAL_MEMORY_DB", ":memory:"),
+            latency_fn=lognormal_latency(
+                float(os.environ.get("LOCAL_MEMORY_LATENCY_MS", "0")),
+                float(os.environ.get("LOCAL_MEMORY_LATENCY_SIGMA", "0.5")),
+                seed,
+            ),
+            fault_rate=float(os.environ.get("LOCAL_MEMORY_FAULT_RATE", "0")),
+            seed=seed,
+        )
+
+    def _call(self, operation: str) -> None:
+        """Simulate the remote round trip: latency, then maybe a throttle."""
+        if self.latency_fn:
+            time.sleep(self.latency_fn())
+        with self._lock:
+            self.stats["calls"] += 1
+            fault = self.fault_rate > 0 and self._rng.random() < self.fault_rate
+            if fault:
+                self.stats["faults"] += 1
+        if fault:
+            raise ClientError(
+                {
+                    "Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"},
+                    "ResponseMetadata": {"HTTPStatusCode": 429},
+                },
+                operation,
+            )
+
+    # Control plane
+
+    def create_memory_and_wait(
+        self,
+        name: str,
+        strategies: Optional[List[Dict[str, Any]]] = None,
+        description: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Create a memory resource (ACTIVE immediately)."""
+        self._call("CreateMemory")
+        memory_id = f"{name}-{uuid.uuid4().hex[:10]}"
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO memories (id, name, description, strategies, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (memory_id, name, description, json.dumps(strategies or []), time.time()),
+            )
+        return self._memory(memory_id)
+
+    def list_memories(self, max_results: int = 100) -> List[Dict[str, Any]]:
+        """List memory resources (same summary fields as the service)."""
+        self._call("ListMemories")
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM memories ORDER BY created_at LIMIT ?", (max_results,)
+            ).fetchall()
+        return [self._memory(row["id"]) for row in rows]
+
+    def get_memory_strategies(self, memory_id: str) -> List[Dict[str, Any]]:
+        """Strategies of a memory (unknown ids are auto-registered)."""
+        self._call("GetMemory")
+        return self._strategies(memory_id)
+
+    # Data plane
+
+    def create_event(
+        self,
+        memory_id: str,
+        actor_id: str,
+        session_id: str,
+        messages: List[Tuple[str, str]],
+        event_timestamp: Optional[datetime] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Store an event of (text, role) messages."""
+        if not messages:
+            raise ValueError("At least one message is required")
+        self._call("CreateEvent")
+        payload = [
+            {"conversational": {"content": {"text": text}, "role": role.upper()}}
+            for text, role in messages
+        ]
+        timestamp = (event_timestamp or datetime.now(timezone.utc)).timestamp()
+        event_id = uuid.uuid4().hex
+        strategies = self._strategies(memory_id)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO events (event_id, memory_id, actor_id, session_id,"
+                " event_timestamp, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                (event_id, memory_id, actor_id, session_id, timestamp, json.dumps(payload)),
+            )
+            if any("summaryMemoryStrategy" in strategy for strategy in strategies):
+                self._refresh_summary(memory_id, actor_id, session_id)
+        return {
+            "eventId": event_id,
+            "memoryId": memory_id,
+            "actorId": actor_id,
+            "sessionId": session_id,
+            "eventTimestamp": timestamp,
+            "payload": payload,
+        }
+
+    def get_last_k_turns(
+        self, memory_id: str, actor_id: str, session_id: str, k: int = 5, **kwargs: Any
+    ) -> List[List[Dict[str, Any]]]:
+        """Last k turns (oldest first); a USER message starts a new turn."""
+        self._call("ListEvents")
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT payload FROM events WHERE memory_id = ? AND actor_id = ?"
+                " AND session_id = ? ORDER BY seq",
+                (memory_id, actor_id, session_id),
+            ).fetchall()
+
+        turns: List[List[Dict[str, Any]]] = []
+        for row in rows:
+            for item in json.loads(row["payload"]):
+                message = item["conversational"]
+                if message["role"] == "USER" or not turns:
+                    turns.append([])
+                turns[-1].append(message)
+        return turns[-k:] if k else []
+
+    def retrieve_memories(
+        self,
+        memory_id: str,
+        namespace: Optional[str] = None,
+        query: Optional[str] = None,
+        actor_id: Optional[str] = None,
+        top_k: int = 3,
+        **kwargs: Any,
+    ) -> List[Dict[str, Any]]:
+        """Long-term records stored under an exact namespace."""
+        self._call("RetrieveMemoryRecords")
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT record_id, namespace, text, updated_at FROM records"
+                " WHERE memory_id = ? AND namespace = ? ORDER BY updated_at DESC LIMIT ?",
+                (memory_id, namespace, top_k),
+            ).fetchall()
+        return [
+            {
+                "memoryRecordId": row["record_id"],
+                "namespaces": [row["namespace"]],
+                "content": {"text": row["text"]},
+                "score": 1.0,
+            }
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._db.close()
+
+    # Helpers (callers hold no lock unless stated)
+
+    def _memory(self, memory_id: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM memories WHERE id = ?", (memory_id,)
+            ).fetchone()
+        return {
+            "id": row["id"],
+            "memoryId": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "status": "ACTIVE",
+            "strategies": json.loads(row["strategies"]),
+        }
+
+    def _strategies(self, memory_id: str) -> List[Dict[str, Any]]:
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT strategies FROM memories WHERE id = ?", (memory_id,)
+            ).fetchone()
+            if row is None:
+                self._db.execute(
+                    "INSERT INTO memories (id, name, description, strategies, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (memory_id, memory_id, "auto-registered", json.dumps(DEFAULT_STRATEGIES),
+                     time.time()),
+                )
+                return DEFAULT_STRATEGIES
+        return json.loads(row["strategies"])
+
+    def _refresh_summary(self, memory_id: str, actor_id: str, session_id: str) -> None:
+        """Extractive summary of the session's user messages (caller holds the lock)."""
+        rows = self._db.execute(
+            "SELECT payload FROM events WHERE memory_id = ? AND actor_id = ?"
+            " AND session_id = ? ORDER BY seq",
+            (memory_id, actor_id, session_id),
+        ).fetchall()
+        user_messages = [
+            item["conversational"]["content"]["text"]
+            for row in rows
+            for item in json.loads(row["payload"])
+            if item["conversational"]["role"] == "USER"
+        ]
+        text = "User asked about: " + "; ".join(user_messages)
+        if len(text) > SUMMARY_MAX_CHARS:
+            text = text[: SUMMARY_MAX_CHARS - 3] + "..."
+        self._db.execute(
+            "INSERT OR REPLACE INTO records (memory_id, namespace, record_id, text, updated_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (memory_id, f"/summaries/{actor_id}/{session_id}", "summary", text, time.time()),
+        )
@@ -0,0 +1,142 @@
+"""Capability probe and negative-result cache for session summaries.
+
+get_session_summary used to call retrieve_memories on every request and
+silently swallow the error when the summary strategy is not configured (or
+has not produced anything yet), so every turn paid for a failed remote call.
+
+- Per memory_id: a probe checks whether a SUMMARIZATION strategy exists.
+  A negative answer is remembered for `strategy_backoff` seconds.
+- Per session: an empty or failed lookup backs off exponentially from
+  `session_backoff` up to `session_backoff_max` before trying again, and
+  resets as soon as a summary is found. Sessions are kept in LRU order,
+  bounded by `max_sessions`; entries idle for a full backoff past their
+  retry time are swept (the session starts over at `session_backoff`).
+
+Skipped calls are counted in stats()["skipped"].
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SUMMARY_STRATEGY_TYPE = "SUMMARIZATION"
+
+
+def has_summary_strategy(strategies: List[Dict[str, Any]]) -> bool:
+    """Check get_memory_strategies output for a summary strategy."""
+    for strategy in strategies:
+        strategy_type = strategy.get("type") or strategy.get("memoryStrategyType")
+        if strategy_type == SUMMARY_STRATEGY_TYPE or "summaryMemoryStrategy" in strategy:
+            return True
+    return False
+
+
+class SummaryAvailability:
+    """Decides whether a summary lookup is worth the remote call."""
+
+    def __init__(
+        self,
+        probe_fn: Callable[[str], bool],
+        strategy_backoff: float = 600.0,
+        session_backoff: float = 30.0,
+        session_backoff_max: float = 600.0,
+        max_sessions: int = 10000,
+    ):
+        """Initialize the availability cache.
+
+        Args:
+            probe_fn: Returns True if the memory has a summary strategy
+            strategy_backoff: Seconds before re-probing a memory without one
+            session_backoff: Initial backoff after an empty session lookup
+            session_backoff_max: Maximum backoff for a session
+            max_sessions: Sessions with a negative result kept (oldest dropped)
+        """
+        self.probe_fn = probe_fn
+        self.strategy_backoff = strategy_backoff
+        self.session_backoff = session_backoff
+        self.session_backoff_max = session_backoff_max
+        self.max_sessions = max_sessions
+
+        # memory_id -> (has_strategy, probed_at); None means the probe failed
+        self._strategies: Dict[str, Tuple[Optional[bool], float]] = {}
+        # (memory_id, actor_id, session_id) -> (retry_at, current_backoff), LRU order
+        self._sessions: "OrderedDict[Tuple[str, str, str], Tuple[float, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._stats = {"skipped": 0, "probes": 0, "probe_errors": 0}
+
+    def should_fetch(self, memory_id: str, actor_id: str, session_id: str) -> bool:
+        """Return False (and count a skipped call) while a negative result holds."""
+        now = time.monotonic()
+        if not self._strategy_available(memory_id, now):
+            self._count("skipped")
+            return False
+
+        with self._lock:
+            entry = self._sessions.get((memory_id, actor_id, session_id))
+            if entry is not None and now < entry[0]:
+                self._stats["skipped"] += 1
+                return False
+        return True
+
+    def record(
+        self, memory_id: str, actor_id: str, session_id: str, found: bool
+    ) -> None:
+        """Record the outcome of a summary lookup for the session."""
+        key = (memory_id, actor_id, session_id)
+        with self._lock:
+            if found:
+                self._sessions.pop(key, None)
+                return
+            now = time.monotonic()
+            previous = self._sessions.get(key)
+            backoff = (
+                min(previous[1] * 2, self.session_backoff_max)
+                if previous
+                else self.session_backoff
+            )
+            self._sessions[key] = (now + backoff, backoff)
+            self._sessions.move_to_end(key)
+            self._sweep(now)
+
+    def stats(self) -> Dict[str, int]:
+        """Skipped calls, probes and tracked sessions."""
+        with self._lock:
+            return {**self._stats, "negative_sessions": len(self._sessions)}
+
+    def _sweep(self, now: float) -> None:
+        """Drop the oldest sessions over max_sessions or long past retry (lock held)."""
+        while self._sessions:
+            retry_at, backoff = next(iter(self._sessions.values()))
+            if len(self._sessions) <= self.max_sessions and now < retry_at + backoff:
+                break
+            self._sessions.popitem(last=False)
+
+    def _strategy_available(self, memory_id: str, now: float) -> bool:
+        with self._lock:
+            cached = self._strategies.get(memory_id)
+        if cached is not None:
+            available, probed_at = cached
+            if available or now - probed_at < self.strategy_backoff:
+                return available is not False
+
+        self._count("probes")
+        try:
+            available = bool(self.probe_fn(memory_id))
+        except Exception as e:
+            # Unknown capability: allow the lookup and probe again after backoff
+            print(f"⚠️ Summary strategy probe failed: {e}")
+            self._count("probe_errors")
+            with self._lock:
+                self._strategies[memory_id] = (None, now)
+            return True
+
+        with self._lock:
+            self._strategies[memory_id] = (available, now)
+        return available
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
@@ -0,0 +1,42 @@
+"""Metrics module initialization.
+
+Hot-path latency spans, histograms, EMF export and the cost ledger.
+Exports are resolved on first access, like the router and memory packages.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "CostLedger": ".cost_ledger",
+    "Histogram": ".histogram",
+    "MetricsExporter": ".export",
+    "MetricsRegistry": ".registry",
+    "Span": ".registry",
+    "get_registry": ".registry",
+}
+
+if TYPE_CHECKING:
+    from .cost_ledger import CostLedger
+    from .export import MetricsExporter
+    from .histogram import Histogram
+    from .registry import MetricsRegistry, Span, get_registry
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "CostLedger",
+    "Histogram",
+    "MetricsExporter",
+    "MetricsRegistry",
+    "Span",
+    "get_registry",
+]
@@ -0,0 +1,189 @@
+"""
+Cost Ledger - Tokens e custo por request, agregados por ator e por modelo
+
+Cada request registra o uso de tokens do classificador (Nova Micro) e do
+agente principal com o custo calculado pela tabela de preços do Router
+(AgentRouter.models, ver router.usage.usage_cost). O ledger guarda
+totais em buckets de um minuto e soma apenas os buckets da janela móvel
+(COST_LEDGER_WINDOW_SECONDS), então a memória não cresce com o tempo.
+
+snapshot()/dump() mostram o custo real por ator e por modelo e, quando
+recebem o preço de um modelo de referência (ex.: Nova Pro), quanto os
+mesmos tokens de geração custariam sem o roteamento: é com esse número
+que a economia estimada na docstring do Router é verificada sob carga real.
+
+Configuração via ambiente:
+- COST_LEDGER_WINDOW_SECONDS: janela móvel agregada (padrão: 3600)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# Granularidade dos buckets da janela móvel
+BUCKET_SECONDS = 60
+
+_TOTAL_FIELDS = (
+    "requests",
+    "classification_input_tokens",
+    "classification_output_tokens",
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_write_input_tokens",
+    "classification_cost_usd",
+    "generation_cost_usd",
+    "cost_usd",
+)
+
+
+def _empty_totals() -> Dict[str, float]:
+    return {name: 0 for name in _TOTAL_FIELDS}
+
+
+def _add(totals: Dict[str, float], other: Dict[str, float]) -> None:
+    for name in _TOTAL_FIELDS:
+        totals[name] += other[name]
+
+
+class CostLedger:
+    """Totais móveis de tokens e custo por ator e por modelo (thread-safe)."""
+
+    def __init__(self, window_seconds: float = 3600.0):
+        """
+        Args:
+            window_seconds: Janela móvel considerada em snapshot()
+        """
+        self.window_seconds = window_seconds
+        # (início do bucket, {("actor"|"model", valor): totais})
+        self._buckets: Deque[Tuple[int, Dict[Tuple[str, str], Dict[str, float]]]] = deque()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "CostLedger":
+        """Cria o ledger a partir de COST_LEDGER_WINDOW_SECONDS."""
+        return cls(window_seconds=float(os.getenv("COST_LEDGER_WINDOW_SECONDS", "3600")))
+
+    def record(
+        self,
+        actor_id: str,
+        model_id: str,
+        generation_usage: Dict[str, int],
+        generation_cost_usd: float,
+        classification_usage: Optional[Dict[str, int]] = None,
+        classification_cost_usd: float = 0.0,
+    ) -> None:
+        """
+        Registra um request.
+
+        Args:
+            actor_id: Usuário do request
+            model_id: Modelo que gerou a resposta
+            generation_usage: Tokens do agente principal (extract_usage)
+            generation_cost_usd: Custo da geração
+            classification_usage: Tokens do classificador (None sem chamada LLM)
+            classification_cost_usd: Custo da classificação
+        """
+        classification_usage = classification_usage or {}
+        entry = {
+            "requests": 1,
+            "classification_input_tokens": classification_usage.get("input_tokens", 0),
+            "classification_output_tokens": classification_usage.get("output_tokens", 0),
+            "input_tokens": generation_usage.get("input_tokens", 0),
+            "output_tokens": generation_usage.get("output_tokens", 0),
+            "cache_read_input_tokens": generation_usage.get("cache_read_input_tokens", 0),
+            "cache_write_input_tokens": generation_usage.get("cache_write_input_tokens", 0),
+            "classification_cost_usd": classification_cost_usd,
+            "generation_cost_usd": generation_cost_usd,
+            "cost_usd": classification_cost_usd + generation_cost_usd,
+        }
+        now = time.time()
+        bucket_start = int(now // BUCKET_SECONDS * BUCKET_SECONDS)
+        with self._lock:
+            if not self._buckets or self._buckets[-1][0] != bucket_start:
+                self._buckets.append((bucket_start, {}))
+            self._expire(now)
+            bucket = self._buckets[-1][1]
+            for key in (("actor", actor_id), ("model", model_id)):
+                totals = bucket.get(key)
+                if totals is None:
+                    totals = bucket[key] = _empty_totals()
+                _add(totals, entry)
+
+    def snapshot(
+        self, baseline: Optional[Tuple[str, float, float, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Totais da janela móvel por ator e por modelo.
+
+        Args:
+            baseline: (model_id, cost_input, cost_output, cost_cache_read) do
+                modelo de referência; adiciona quanto os mesmos tokens de
+                geração custariam nele e a economia do roteamento
+
+        Returns:
+            dict com window_seconds, total, by_actor, by_model (e baseline)
+        """
+        with self._lock:
+            self._expire(time.time())
+            by_dimension: Dict[str, Dict[str, Dict[str, float]]] = {"actor": {}, "model": {}}
+            for _, bucket in self._buckets:
+                for (dimension, value), totals in bucket.items():
+                    merged = by_dimension[dimension].setdefault(value, _empty_totals())
+                    _add(merged, totals)
+
+        total = _empty_totals()
+        for totals in by_dimension["model"].values():
+            _add(total, totals)
+
+        report: Dict[str, Any] = {
+            "window_seconds": self.window_seconds,
+            "total": _rounded(total),
+            "by_actor": {k: _rounded(v) for k, v in sorted(by_dimension["actor"].items())},
+            "by_model": {k: _rounded(v) for k, v in sorted(by_dimension["model"].items())},
+        }
+        if baseline is not None:
+            model_id, cost_input, cost_output, cost_cache_read = baseline
+            # Mesmos tokens que usage_cost cobra: escritas no cache a preço de entrada
+            baseline_cost = (
+                (total["input_tokens"] + total["cache_write_input_tokens"]) * cost_input
+                + total["cache_read_input_tokens"] * cost_cache_read
+                + total["output_tokens"] * cost_output
+            ) / 1_000_000
+            report["baseline"] = {
+                "model_id": model_id,
+                "cost_usd": round(baseline_cost, 8),
+                "savings_pct": (
+                    round((1 - total["cost_usd"] / baseline_cost) * 100, 1)
+                    if baseline_cost
+                    else 0.0
+                ),
+            }
+        return report
+
+    def dump(
+        self,
+        path: Optional[str] = None,
+        baseline: Optional[Tuple[str, float, float, float]] = None,
+    ) -> str:
+        """Snapshot em JSON; grava em `path` se informado. Returns: o JSON."""
+        text = json.dumps(self.snapshot(baseline), indent=2, ensure_ascii=False)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        return text
+
+    def _expire(self, now: float) -> None:
+        oldest = now - self.window_seconds
+        while self._buckets and self._buckets[0][0] + BUCKET_SECONDS <= oldest:
+            self._buckets.popleft()
+
+
+def _rounded(totals: Dict[str, float]) -> Dict[str, float]:
+    return {
+        name: round(value, 8) if name.endswith("_usd") else value
+        for name, value in totals.items()
+    }
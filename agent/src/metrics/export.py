@@ -0,0 +1,153 @@
+"""
+Exportação das métricas em CloudWatch Embedded Metric Format (EMF)
+
+A cada intervalo, os histogramas do registro são zerados e exportados como
+linhas JSON EMF (uma por estágio × modelo e por estágio × complexidade) com
+LatencyP50/P95/P99 e Count. No AgentCore Runtime o stdout vai para o
+CloudWatch Logs, que extrai as métricas das linhas EMF; localmente as
+linhas podem ir para um arquivo.
+
+Configuração via ambiente:
+- METRICS_EXPORT: "stdout" (padrão), "file" ou "off"
+- METRICS_EXPORT_FILE: arquivo JSON lines quando "file" (padrão: metrics.emf.jsonl)
+- METRICS_EXPORT_INTERVAL_SECONDS: intervalo entre exportações (padrão: 60)
+- METRICS_NAMESPACE: namespace no CloudWatch (padrão: NAgent)
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .histogram import Histogram
+from .registry import STAGES, MetricsRegistry, group_histograms
+
+# Dimensões exportadas: (agrupamento no registro, nome da dimensão EMF)
+VIEWS = (("model", "Model"), ("complexity", "Complexity"))
+
+
+def emf_records(
+    histograms: Dict[Any, Histogram], namespace: str, timestamp_ms: int
+) -> List[Dict[str, Any]]:
+    """Linhas EMF com p50/p95/p99 por estágio × modelo e estágio × complexidade."""
+    records = []
+    for by, dimension in VIEWS:
+        grouped = group_histograms(histograms, by)
+        stages = [s for s in STAGES if s in grouped] + sorted(set(grouped) - set(STAGES))
+        for stage in stages:
+            for value, histogram in sorted(grouped[stage].items()):
+                summary = histogram.summary()
+                records.append(
+                    {
+                        "_aws": {
+                            "Timestamp": timestamp_ms,
+                            "CloudWatchMetrics": [
+                                {
+                                    "Namespace": namespace,
+                                    "Dimensions": [["Stage", dimension]],
+                                    "Metrics": [
+                                        {"Name": "LatencyP50", "Unit": "Milliseconds"},
+                                        {"Name": "LatencyP95", "Unit": "Milliseconds"},
+                                        {"Name": "LatencyP99", "Unit": "Milliseconds"},
+                                        {"Name": "Count", "Unit": "Count"},
+                                    ],
+                                }
+                            ],
+                        },
+                        "Stage": stage,
+                        dimension: value,
+                        "LatencyP50": summary["p50"],
+                        "LatencyP95": summary["p95"],
+                        "LatencyP99": summary["p99"],
+                        "Count": summary["count"],
+                        "LatencyMax": summary["max"],
+                    }
+                )
+    return records
+
+
+class MetricsExporter:
+    """Thread daemon que exporta (e zera) o registro a cada intervalo."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        target: str = "stdout",
+        path: str = "metrics.emf.jsonl",
+        interval: float = 60.0,
+        namespace: str = "NAgent",
+    ):
+        """
+        Args:
+            registry: Registro cujos histogramas são exportados
+            target: "stdout" ou "file"
+            path: Arquivo JSON lines (target "file")
+            interval: Segundos entre exportações
+            namespace: Namespace das métricas no CloudWatch
+        """
+        self.registry = registry
+        self.target = target
+        self.path = path
+        self.interval = interval
+        self.namespace = namespace
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, registry: MetricsRegistry) -> Optional["MetricsExporter"]:
+        """Cria o exportador a partir de METRICS_EXPORT* (None se "off")."""
+        target = os.getenv("METRICS_EXPORT", "stdout").lower()
+        if target in ("off", "false", "none") or not registry.enabled:
+            return None
+        return cls(
+            registry,
+            target=target,
+            path=os.getenv("METRICS_EXPORT_FILE", "metrics.emf.jsonl"),
+            interval=float(os.getenv("METRICS_EXPORT_INTERVAL_SECONDS", "60")),
+            namespace=os.getenv("METRICS_NAMESPACE", "NAgent"),
+        )
+
+    def start(self) -> None:
+        """Inicia a exportação periódica (e uma última exportação na saída)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-exporter", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def flush(self) -> int:
+        """Exporta e zera os histogramas. Returns: linhas escritas."""
+        records = emf_records(
+            self.registry.collect(reset=True), self.namespace, int(time.time() * 1000)
+        )
+        if not records:
+            return 0
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        with self._write_lock:
+            if self.target == "file":
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+            else:
+                sys.stdout.write(lines)
+                sys.stdout.flush()
+        return len(records)
+
+    def close(self) -> None:
+        """Para a thread e exporta o que falta."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Metrics export failed: {e}")
@@ -0,0 +1,83 @@
+"""
+Histograma de latência com buckets logarítmicos
+
+Cada registro é O(1) (um log e um incremento num dict esparso), sem guardar
+as amostras: o histograma pode ficar ligado em produção. Os buckets crescem
+10% a cada passo, então p50/p95/p99 têm erro relativo de no máximo ~10%
+(o valor reportado é o limite superior do bucket, limitado ao máximo visto).
+Histogramas com os mesmos buckets podem ser somados (merge), o que permite
+exportar visões por modelo e por complexidade a partir do mesmo registro.
+"""
+
+import math
+from typing import Dict, Optional
+
+# Razão entre os limites de buckets consecutivos
+GROWTH = 1.1
+_LOG_GROWTH = math.log(GROWTH)
+
+
+def bucket_index(value_ms: float) -> int:
+    """Índice do bucket (GROWTH**(i-1), GROWTH**i]; tudo até 1ms cai no bucket 0."""
+    if value_ms <= 1.0:
+        return 0
+    return math.ceil(math.log(value_ms) / _LOG_GROWTH)
+
+
+class Histogram:
+    """Contagens por bucket + count/sum/min/max (não thread-safe; ver MetricsRegistry)."""
+
+    __slots__ = ("buckets", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value_ms: float) -> None:
+        """Registra uma latência em milissegundos."""
+        index = bucket_index(value_ms)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value_ms
+        if self.min is None or value_ms < self.min:
+            self.min = value_ms
+        if self.max is None or value_ms > self.max:
+            self.max = value_ms
+
+    def merge(self, other: "Histogram") -> None:
+        """Soma as contagens de outro histograma neste."""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, pct: float) -> float:
+        """Percentil (0-100) aproximado pelo limite superior do bucket."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(GROWTH**index, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """count, média, mínimo, máximo e p50/p95/p99 (ms)."""
+        return {
+            "count": self.count,
+            "avg": round(self.sum / self.count, 2) if self.count else 0.0,
+            "min": round(self.min or 0.0, 2),
+            "max": round(self.max or 0.0, 2),
+            "p50": round(self.percentile(50), 2),
+            "p95": round(self.percentile(95), 2),
+            "p99": round(self.percentile(99), 2),
+        }
@@ -0,0 +1,175 @@
+"""
+Registro de métricas do hot path (spans com relógio monotônico)
+
+Estágios medidos por request:
+- classification: Router.route (padrão, cache, local ou Nova Micro)
+- memory_summary / memory_turns: chamadas ao Memory em fetch_context
+- admission_wait: espera por vaga no modelo (serving/admission.py)
+- generation: geração do agente (Strands)
+- memory_write: escrita da interação (enfileiramento em background)
+
+Cada span alimenta um histograma por (estágio, modelo, complexidade); a
+exportação soma esses histogramas em visões por modelo e por complexidade.
+Os spans usam time.perf_counter (monotônico), não datetime.now().
+
+Configuração via ambiente:
+- METRICS_ENABLED: "false" desliga o registro (padrão: true)
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .histogram import Histogram
+
+# Estágios instrumentados (ordem de exportação)
+STAGES = (
+    "classification",
+    "memory_summary",
+    "memory_turns",
+    "admission_wait",
+    "generation",
+    "memory_write",
+)
+
+# Valor de dimensão quando o modelo/complexidade não é conhecido no span
+UNKNOWN = "unknown"
+
+_Key = Tuple[str, str, str]
+
+
+class Span:
+    """Mede um estágio (context manager); modelo/complexidade podem vir depois."""
+
+    __slots__ = ("registry", "stage", "model", "complexity", "start", "elapsed_ms")
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        stage: str,
+        model: Optional[str] = None,
+        complexity: Optional[str] = None,
+    ):
+        self.registry = registry
+        self.stage = stage
+        self.model = model
+        self.complexity = complexity
+        self.start = 0.0
+        self.elapsed_ms = 0.0
+
+    def tag(self, model: Optional[str] = None, complexity: Optional[str] = None) -> None:
+        """Define as dimensões conhecidas só durante o estágio (ex.: após classificar)."""
+        if model is not None:
+            self.model = model
+        if complexity is not None:
+            self.complexity = complexity
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed_ms = (time.perf_counter() - self.start) * 1000
+        self.registry.record(self.stage, self.elapsed_ms, self.model, self.complexity)
+
+
+class MetricsRegistry:
+    """Histogramas de latência por estágio, modelo e complexidade (thread-safe)."""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: Se False, record() e span() não registram nada
+        """
+        self.enabled = enabled
+        self._histograms: Dict[_Key, Histogram] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "MetricsRegistry":
+        """Cria o registro a partir de METRICS_ENABLED."""
+        return cls(
+            enabled=os.getenv("METRICS_ENABLED", "true").lower() not in ("0", "false", "no")
+        )
+
+    def span(
+        self, stage: str, model: Optional[str] = None, complexity: Optional[str] = None
+    ) -> Span:
+        """Span de um estágio: `with metrics.span("generation", model=...) as s:`."""
+        return Span(self, stage, model, complexity)
+
+    def record(
+        self,
+        stage: str,
+        elapsed_ms: float,
+        model: Optional[str] = None,
+        complexity: Optional[str] = None,
+    ) -> None:
+        """Registra uma latência já medida (ms)."""
+        if not self.enabled:
+            return
+        key = (stage, str(model or UNKNOWN), str(complexity or UNKNOWN))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.record(elapsed_ms)
+
+    def collect(self, reset: bool = False) -> Dict[_Key, Histogram]:
+        """Cópia dos histogramas (estágio, modelo, complexidade).
+
+        Args:
+            reset: Zera os histogramas (exportação por intervalo)
+        """
+        with self._lock:
+            histograms = self._histograms
+            if reset:
+                self._histograms = {}
+                return histograms
+            copies = {}
+            for key, histogram in histograms.items():
+                copy = copies[key] = Histogram()
+                copy.merge(histogram)
+            return copies
+
+    def summary(self, by: str = "model") -> Dict[str, Dict[str, Dict[str, float]]]:
+        """p50/p95/p99 por estágio, agrupados por "model" ou "complexity"."""
+        return {
+            stage: {value: histogram.summary() for value, histogram in views.items()}
+            for stage, views in group_histograms(self.collect(), by).items()
+        }
+
+    def reset(self) -> None:
+        """Descarta todos os histogramas."""
+        with self._lock:
+            self._histograms = {}
+
+
+def group_histograms(
+    histograms: Dict[_Key, Histogram], by: str
+) -> Dict[str, Dict[str, Histogram]]:
+    """Soma os histogramas de cada estágio pela dimensão "model" ou "complexity"."""
+    position = {"model": 1, "complexity": 2}[by]
+    grouped: Dict[str, Dict[str, Histogram]] = {}
+    for key, histogram in histograms.items():
+        views = grouped.setdefault(key[0], {})
+        merged = views.get(key[position])
+        if merged is None:
+            merged = views[key[position]] = Histogram()
+        merged.merge(histogram)
+    return grouped
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    """Registro compartilhado pelo processo (Router, Memory e entrypoint)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry.from_env()
+    return _registry
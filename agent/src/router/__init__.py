@@ -1,8 +1,48 @@
 """
 Router Agent module
 Multi-agent routing with cost optimization
+
+Exports are resolved on first access so that importing a light submodule
+(e.g. `src.router.usage`) does not pull in Strands on the cold-start path.
 """
 
-from .agent_router import AgentRouter, QueryComplexity
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "AgentRouter": ".agent_router",
+    "BatchRouteResult": ".batch",
+    "QueryComplexity": ".agent_router",
+    "ClassificationCache": ".classification_cache",
+    "ClassifierPool": ".classifier_pool",
+    "LocalClassifier": ".local_classifier",
+    "TrivialMatcher": ".trivial_matcher",
+}
+
+if TYPE_CHECKING:
+    from .agent_router import AgentRouter, QueryComplexity
+    from .batch import BatchRouteResult
+    from .classification_cache import ClassificationCache
+    from .classifier_pool import ClassifierPool
+    from .local_classifier import LocalClassifier
+    from .trivial_matcher import TrivialMatcher
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["AgentRouter", "QueryComplexity"]
+__all__ = [
+    "AgentRouter",
+    "BatchRouteResult",
+    "QueryComplexity",
+    "ClassificationCache",
+    "ClassifierPool",
+    "LocalClassifier",
+    "TrivialMatcher",
+]
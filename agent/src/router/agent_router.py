@@ -5,6 +5,7 @@ Este módulo implementa o Router Agent que classifica queries e direciona
 para o modelo mais adequado (Nova Micro/Lite/Pro ou Claude Sonnet).
 
 Economia estimada: 76% vs usar apenas Nova Pro (de $6.40 para $1.52/mês)
+(medida sob carga real pelo CostLedger: ver cost_report() em main.py)
 
 USANDO STRANDS AGENTS SDK:
 - Usa Strands Agent para classificação inteligente
@@ -12,18 +13,56 @@ USANDO STRANDS AGENTS SDK:
 - Best practices da AWS documentadas
 """
 
-import re
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
 from strands import Agent
 from strands.models import BedrockModel
-from bedrock_agentcore.memory import MemoryClient
-from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig
-from bedrock_agentcore.memory.integrations.strands.session_manager import (
-    AgentCoreMemorySessionManager,
+
+from .batch import (
+    BatchRouteResult,
+    batch_settings,
+    build_packed_prompt,
+    parse_packed_response,
+    percentile,
 )
+from .classification_cache import ClassificationCache, make_cache_key
+from .classifier_pool import ClassifierPool
+from .local_classifier import LocalClassifier
+from .trivial_matcher import TrivialMatcher
+from .usage import extract_usage, system_prompt_blocks, usage_cost, usage_snapshot
+
+try:
+    from ..metrics.registry import get_registry
+except ImportError:
+    # Executando a partir de src/ (router e metrics como pacotes de topo)
+    from metrics.registry import get_registry
+
+# System prompt do classificador: instruções e exemplos estáticos, idênticos
+# em todas as chamadas (prefixo candidato a prompt caching no Bedrock)
+CLASSIFIER_SYSTEM_PROMPT = """Você é um classificador de mensagens de usuários em um assistente de viagens.
+
+Classifique a complexidade respondendo APENAS UMA das palavras abaixo:
+
+TRIVIAL → Saudações, agradecimentos, confirmações simples ("Oi", "Ok", "Obrigado")
+INFORMATIVE → Perguntas sobre informações já coletadas ("Qual meu hotel?", "A que horas é o voo?")
+COMPLEX → Solicitações de planejamento ou busca de novas informações ("Planeje 3 dias em Roma", "Busque hotéis perto do Coliseu")
+CRITICAL → Solicitações envolvendo documentos importantes ou decisões críticas ("Revise meu contrato de seguro", "Valide minha reserva de voo")
+
+EXEMPLOS:
+- "Bom dia!" → TRIVIAL
+- "Qual o nome do hotel em Paris?" → INFORMATIVE
+- "Quero visitar o Louvre amanhã, me ajuda?" → COMPLEX
+- "Preciso cancelar minha reserva urgente" → CRITICAL
+
+Responda APENAS uma palavra: TRIVIAL, INFORMATIVE, COMPLEX ou CRITICAL."""
 
 
 class QueryComplexity(Enum):
@@ -36,103 +75,121 @@ class QueryComplexity(Enum):
     CRITICAL = "critical"  # Contratos, docs legais → Claude Sonnet
 
 
+@dataclass
+class ClassificationResult:
+    """Resultado da classificação e a etapa que a decidiu.
+
+    source: "vision", "pattern", "cache", "local", "llm", "batch" (prompt
+        empacotado de route_many) ou "fallback"
+    confidence: só preenchida pelo classificador local
+    usage: tokens da chamada ao Nova Micro (só quando source == "llm")
+    """
+
+    complexity: QueryComplexity
+    source: str
+    confidence: Optional[float] = None
+    usage: Optional[Dict[str, int]] = None
+
+
 class AgentRouter:
     """Router que classifica queries e direciona para o modelo adequado usando Strands SDK."""
 
-    def __init__(self, memory_id: Optional[str] = None, region_name: str = "us-east-1"):
+    def __init__(
+        self,
+        memory_id: Optional[str] = None,
+        region_name: str = "us-east-1",
+        classifier_pool_size: Optional[int] = None,
+        classification_cache: Optional[ClassificationCache] = None,
+        trivial_matcher: Optional[TrivialMatcher] = None,
+        local_classifier: Optional[LocalClassifier] = None,
+        decision_log_path: Optional[str] = None,
+    ):
         """
         Inicializa o Router com Strands Agent para classificação.
 
         Args:
-            memory_id: ID da memória AgentCore (opcional, cria uma nova se não fornecido)
+            memory_id: Ignorado; mantido por compatibilidade. O classificador não
+                guarda histórico no Memory (o prompt de cada chamada é autocontido)
             region_name: Região AWS (padrão: us-east-1)
+            classifier_pool_size: Máximo de agentes classificadores reutilizáveis
+                (padrão: ROUTER_CLASSIFIER_POOL_SIZE ou concorrência do runtime)
+            classification_cache: Cache de classificações (padrão: configurado
+                pelas variáveis ROUTER_CACHE_*)
+            trivial_matcher: Detector de mensagens triviais (padrão: frases
+                padrão + extensões de ROUTER_TRIVIAL_*)
+            local_classifier: Classificador local opcional antes do Nova Micro
+                (padrão: modelo de ROUTER_LOCAL_CLASSIFIER_MODEL, se definido)
+            decision_log_path: Arquivo JSONL onde route() registra decisões para
+                treino offline (padrão: ROUTER_DECISION_LOG)
         """
         self.region_name = region_name
         self.memory_id = memory_id
 
         # Configuração de modelos (custos por 1M tokens)
+        # cost_cache_read: leitura do prompt cache (Nova: 75% de desconto)
+        # context_budget_tokens: limite de tokens do contexto do Memory no prompt
+        # supports_prompt_cache: modelo aceita checkpoints de prompt caching
         self.models = {
             "router": {
                 "id": "us.amazon.nova-micro-v1:0",
                 "cost_input": 0.035,  # $0.035/1M
                 "cost_output": 0.14,  # $0.14/1M
+                "cost_cache_read": 0.00875,
+                "supports_prompt_cache": True,
             },
             "chat": {
                 "id": "us.amazon.nova-lite-v1:0",
                 "cost_input": 0.06,  # $0.06/1M
                 "cost_output": 0.24,  # $0.24/1M
+                "cost_cache_read": 0.015,
+                "supports_prompt_cache": True,
+                "context_budget_tokens": 1500,
             },
             "planning": {
                 "id": "us.amazon.nova-pro-v1:0",
                 "cost_input": 0.80,  # $0.80/1M
                 "cost_output": 3.20,  # $3.20/1M
+                "cost_cache_read": 0.20,
+                "supports_prompt_cache": True,
+                "context_budget_tokens": 3000,
             },
             "vision": {
                 "id": "anthropic.claude-3-sonnet-20240229-v1:0",
                 "cost_input": 3.00,  # $3.00/1M
-                "cost_output": 0,  # Não usado (vision apenas lê)
+                "cost_output": 15.00,  # $15.00/1M (a resposta também é gerada)
+                "supports_prompt_cache": False,  # Claude 3 Sonnet não suporta
+                "context_budget_tokens": 2000,
             },
         }
 
-        # Padrões para classificação rápida (antes de chamar Router)
-        self.trivial_patterns = [
-            r"^(oi|olá|hey|hi|hello)[\s!?]*$",
-            r"^(obrigad[oa]|thanks|valeu)[\s!?]*$",
-            r"^(ok|certo|tudo bem|sim|não|yes|no)[\s!?]*$",
-            r"^👍|👋|😊|❤️$",  # Apenas emojis
-        ]
+        # Detector de mensagens triviais (antes de chamar Router), compilado uma vez
+        self.trivial_matcher = trivial_matcher or TrivialMatcher.from_env()
 
         # Configuração do modelo Bedrock para Strands (usando BedrockModel)
         self.model_config = BedrockModel(model_id=self.models["router"]["id"])
 
-        # Inicializar AgentCore Memory se memory_id fornecido
-        self.memory_client = None
-        self.session_manager = None
-        if memory_id:
-            self._setup_memory(memory_id)
-
-    def _setup_memory(
-        self,
-        memory_id: str,
-        session_id: Optional[str] = None,
-        actor_id: Optional[str] = None,
-    ):
-        """
-        Configura AgentCore Memory seguindo best practices da documentação.
-
-        Args:
-            memory_id: ID da memória AgentCore
-            session_id: ID da sessão (gerado automaticamente se não fornecido)
-            actor_id: ID do usuário (gerado automaticamente se não fornecido)
-        """
-        self.memory_client = MemoryClient(region_name=self.region_name)
-
-        # Gerar IDs únicos se não fornecidos
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        session_id = session_id or f"router_session_{timestamp}"
-        actor_id = actor_id or f"router_actor_{timestamp}"
-
-        # Configurar memória seguindo padrão da documentação
-        agentcore_memory_config = AgentCoreMemoryConfig(
-            memory_id=memory_id, session_id=session_id, actor_id=actor_id
+        # Pool de classificadores sem estado (construídos uma vez, reutilizados)
+        self.classifier_pool = ClassifierPool(
+            factory=self._build_classifier_agent, max_size=classifier_pool_size
         )
 
-        # Criar session manager para Strands
-        self.session_manager = AgentCoreMemorySessionManager(
-            agentcore_memory_config=agentcore_memory_config,
-            region_name=self.region_name,
+        # Cache de classificações por conteúdo (evita repetir chamadas ao Nova Micro)
+        self.classification_cache = (
+            classification_cache
+            if classification_cache is not None
+            else ClassificationCache.from_env(region_name=region_name)
         )
 
+        # Classificador local opcional (treinado offline com decisões do Router)
+        self.local_classifier = local_classifier or LocalClassifier.from_env()
+
+        # Log de decisões (JSONL) para treino/avaliação offline
+        self.decision_log_path = decision_log_path or os.getenv("ROUTER_DECISION_LOG")
+        self._decision_log_lock = threading.Lock()
+
     def is_trivial_pattern(self, message: str) -> bool:
         """Verifica se mensagem é trivial sem chamar Router (economia)."""
-        message_lower = message.lower().strip()
-
-        # Mensagens muito curtas (<= 3 palavras) geralmente são triviais
-        if len(message_lower.split()) <= 3:
-            for pattern in self.trivial_patterns:
-                if re.match(pattern, message_lower, re.IGNORECASE):
-                    return True
-        return False
+        return self.trivial_matcher.matches(message)
 
     def classify_query(
         self,
@@ -151,29 +208,73 @@ class AgentRouter:
         Returns:
             QueryComplexity enum
         """
+        return self._classify(user_message, has_image, trip_context).complexity
+
+    def _classify(
+        self,
+        user_message: str,
+        has_image: bool = False,
+        trip_context: Optional[Dict] = None,
+    ) -> ClassificationResult:
+        """Classifica a query registrando qual etapa decidiu (source)."""
+
+        # 1-4. Etapas locais (imagem, padrões triviais, cache, classificador local)
+        fast = self._classify_fast(user_message, has_image, trip_context)
+        if fast:
+            return fast
+
+        # 5. Usar Router Agent (Strands) para classificação inteligente
+        result = self._classify_with_llm(user_message, trip_context)
+        if self.classification_cache and result.source == "llm":
+            self.classification_cache.put(
+                user_message, trip_context, result.complexity.value
+            )
+        return result
+
+    def _classify_fast(
+        self,
+        user_message: str,
+        has_image: bool = False,
+        trip_context: Optional[Dict] = None,
+    ) -> Optional[ClassificationResult]:
+        """Etapas que decidem sem chamar o Nova Micro (None se nenhuma decidir)."""
 
         # 1. Detecção rápida: imagem = visão
         if has_image:
-            return QueryComplexity.VISION
+            return ClassificationResult(QueryComplexity.VISION, "vision")
 
         # 2. Detecção rápida: padrões triviais (economiza chamada ao Router)
         if self.is_trivial_pattern(user_message):
-            return QueryComplexity.TRIVIAL
-
-        # 3. Usar Router Agent (Strands) para classificação inteligente
+            return ClassificationResult(QueryComplexity.TRIVIAL, "pattern")
+
+        # 3. Cache de classificações anteriores (mesma mensagem normalizada)
+        if self.classification_cache:
+            cached = self.classification_cache.get(user_message, trip_context)
+            if cached:
+                return ClassificationResult(QueryComplexity(cached), "cache")
+
+        # 4. Classificador local: decide sem Bedrock quando a confiança é alta
+        if self.local_classifier:
+            local = self.local_classifier.classify(user_message)
+            if local:
+                label, confidence = local
+                return ClassificationResult(
+                    QueryComplexity(label), "local", confidence
+                )
+
+        return None
+
+    def _classify_with_llm(
+        self, user_message: str, trip_context: Optional[Dict]
+    ) -> ClassificationResult:
+        """Classifica a query com o agente Strands (Nova Micro)."""
         prompt = self._build_classification_prompt(user_message, trip_context)
 
         try:
-            # Criar agente Strands para classificação usando Nova Micro
-            classifier_agent = Agent(
-                system_prompt="""Você é um classificador de mensagens de usuários em um assistente de viagens.
-Responda APENAS uma palavra: TRIVIAL, INFORMATIVE, COMPLEX ou CRITICAL.""",
-                model=self.model_config,
-                session_manager=self.session_manager if self.session_manager else None,
-            )
-
-            # Invocar agente para classificação
-            result = classifier_agent(prompt)
+            # Reutilizar agente sem estado do pool
+            with self.classifier_pool.lease() as classifier_agent:
+                baseline = usage_snapshot(classifier_agent)
+                result = classifier_agent(prompt)
 
             # Parse da resposta do Strands Agent (result.message['content'][0]['text'])
             if hasattr(result, "message") and "content" in result.message:
@@ -183,50 +284,52 @@ Responda APENAS uma palavra: TRIVIAL, INFORMATIVE, COMPLEX ou CRITICAL.""",
                 classification = str(result).strip().upper()
 
             # Parse da classificação
-            return QueryComplexity(classification.lower())
+            return ClassificationResult(
+                QueryComplexity(classification.lower()),
+                "llm",
+                usage=extract_usage(result, baseline),
+            )
 
         except (KeyError, ValueError, Exception) as e:
             # Fallback se classificação inválida
             print(f"⚠️ Erro na classificação: {e}, usando INFORMATIVE")
-            return QueryComplexity.INFORMATIVE
+            return ClassificationResult(QueryComplexity.INFORMATIVE, "fallback")
+
+    def _build_classifier_agent(self) -> Agent:
+        """Constrói um agente Strands de classificação usando Nova Micro.
+
+        As instruções estáticas ficam no system prompt com checkpoint de cache;
+        só a mensagem e o contexto da viagem vão no prompt de cada chamada.
+        """
+        return Agent(
+            system_prompt=system_prompt_blocks(
+                CLASSIFIER_SYSTEM_PROMPT,
+                enable_cache=self.models["router"]["supports_prompt_cache"],
+            ),
+            model=self.model_config,
+        )
 
     def _build_classification_prompt(
         self, user_message: str, trip_context: Optional[Dict]
     ) -> str:
-        """Constrói prompt de classificação com exemplos."""
+        """Constrói a parte dinâmica do prompt (instruções em CLASSIFIER_SYSTEM_PROMPT)."""
+        return f"""{self._trip_context_info(trip_context)}
+MENSAGEM DO USUÁRIO:
+"{user_message}"
 
-        # Adiciona contexto da viagem se disponível
-        context_info = ""
-        if trip_context:
-            context_info = f"""
+CLASSIFICAÇÃO (responda apenas UMA palavra):
+"""
+
+    @staticmethod
+    def _trip_context_info(trip_context: Optional[Dict]) -> str:
+        """Bloco com o contexto da viagem para o prompt ("" se não houver)."""
+        if not trip_context:
+            return ""
+        return f"""
 CONTEXTO DA VIAGEM:
 - Status: {trip_context.get("status", "KNOWLEDGE")}
 - Destinos: {", ".join(trip_context.get("destinations", []))}
 - Datas: {trip_context.get("start_date")} → {trip_context.get("end_date")}
-"""
-
-        return f"""
-Você é um classificador de mensagens de usuários em um assistente de viagens.
-
-{context_info}
-
-MENSAGEM DO USUÁRIO:
-"{user_message}"
-
-Classifique a complexidade respondendo APENAS UMA das palavras abaixo:
-
-TRIVIAL → Saudações, agradecimentos, confirmações simples ("Oi", "Ok", "Obrigado")
-INFORMATIVE → Perguntas sobre informações já coletadas ("Qual meu hotel?", "A que horas é o voo?")
-COMPLEX → Solicitações de planejamento ou busca de novas informações ("Planeje 3 dias em Roma", "Busque hotéis perto do Coliseu")
-CRITICAL → Solicitações envolvendo documentos importantes ou decisões críticas ("Revise meu contrato de seguro", "Valide minha reserva de voo")
-
-EXEMPLOS:
-- "Bom dia!" → TRIVIAL
-- "Qual o nome do hotel em Paris?" → INFORMATIVE
-- "Quero visitar o Louvre amanhã, me ajuda?" → COMPLEX
-- "Preciso cancelar minha reserva urgente" → CRITICAL
-
-CLASSIFICAÇÃO (responda apenas UMA palavra):
 """
 
     def get_model_for_complexity(self, complexity: QueryComplexity) -> Dict[str, Any]:
@@ -249,45 +352,325 @@ CLASSIFICAÇÃO (responda apenas UMA palavra):
         """
         Classifica e retorna configuração completa para o agente.
 
+        Seguro para chamadas concorrentes: cada request usa um agente próprio
+        do pool de classificadores sem estado.
+
         Returns:
             dict: Configuração com model_id, complexity, use_tools, use_memory, etc.
         """
 
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         # 1. Classificar query
-        complexity = self.classify_query(user_message, has_image, trip_context)
+        classification = self._classify(user_message, has_image, trip_context)
+        complexity = classification.complexity
+        model_config = self.get_model_for_complexity(complexity)
+
+        # 2-3. Modelo e configurações do agente (relógio monotônico)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        get_registry().record(
+            "classification", elapsed_ms, model_config["id"], complexity.value
+        )
+        config = self._build_route_config(user_message, classification, int(elapsed_ms))
+
+        # 4. Log de roteamento (para métricas)
+        print(
+            f"🔀 Router: '{user_message[:50]}...' → {complexity.value} ({model_config['id']}) em {config['routing_time_ms']}ms"
+        )
+        if self.decision_log_path:
+            self._log_decision(user_message, trip_context, config)
+
+        return config
+
+    def route_many(
+        self,
+        messages: Sequence[Union[str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> BatchRouteResult:
+        """
+        Classifica um lote de mensagens (re-scoring, backfills, avaliação).
+
+        - Mensagens repetidas (mesma normalização, imagem e contexto) são
+          classificadas uma única vez
+        - Imagem, padrões triviais, cache e classificador local resolvem sem
+          chamar o Nova Micro
+        - As restantes vão em prompts empacotados por contexto de viagem,
+          com no máximo `max_concurrency` chamadas simultâneas (agentes do pool)
+
+        Não registra decisões no ROUTER_DECISION_LOG (o lote costuma vir dele).
 
-        # 2. Selecionar modelo
+        Args:
+            messages: Textos ou dicts com "message" (ou "prompt"), "has_image"
+                e "trip_context" (ex.: registros do log de decisões)
+            max_concurrency: Chamadas simultâneas (padrão: ROUTER_BATCH_CONCURRENCY,
+                limitado ao tamanho do pool de classificadores)
+            batch_size: Mensagens por prompt (padrão: ROUTER_BATCH_SIZE; 1 desliga
+                o empacotamento)
+
+        Returns:
+            BatchRouteResult com as configurações na ordem de entrada e os
+            totais do lote
+        """
+        start = time.perf_counter()
+        settings = batch_settings()
+        batch_size = max(1, batch_size or settings["batch_size"])
+        max_concurrency = max(
+            1,
+            min(
+                max_concurrency or settings["max_concurrency"],
+                self.classifier_pool.max_size,
+            ),
+        )
+
+        # 1. Normalizar entradas e deduplicar
+        items: List[Tuple[str, bool, Optional[Dict]]] = []
+        keys: List[str] = []
+        unique: Dict[str, Tuple[str, bool, Optional[Dict]]] = {}
+        for entry in messages:
+            if isinstance(entry, dict):
+                item = (
+                    entry.get("message", entry.get("prompt", "")) or "",
+                    bool(entry.get("has_image", False)),
+                    entry.get("trip_context"),
+                )
+            else:
+                item = (entry, False, None)
+            key = f"{int(item[1])}:{make_cache_key(item[0], item[2])}"
+            items.append(item)
+            keys.append(key)
+            unique.setdefault(key, item)
+
+        # 2. Etapas locais em lote; o resto é agrupado por contexto de viagem
+        decided: Dict[str, Tuple[ClassificationResult, int]] = {}
+        pending: Dict[str, List[Tuple[str, str, Optional[Dict]]]] = {}
+        for key, (message, has_image, trip_context) in unique.items():
+            fast_start = time.perf_counter()
+            fast = self._classify_fast(message, has_image, trip_context)
+            if fast:
+                decided[key] = (fast, int((time.perf_counter() - fast_start) * 1000))
+                continue
+            context_key = make_cache_key("", trip_context)
+            pending.setdefault(context_key, []).append((key, message, trip_context))
+
+        # 3. Pacotes: mensagens longas sempre sozinhas
+        chunks: List[List[Tuple[str, str, Optional[Dict]]]] = []
+        for group in pending.values():
+            packable = []
+            for entry in group:
+                if len(entry[1]) <= settings["pack_max_chars"]:
+                    packable.append(entry)
+                else:
+                    chunks.append([entry])
+            for i in range(0, len(packable), batch_size):
+                chunks.append(packable[i : i + batch_size])
+
+        calls: List[Dict[str, Any]] = []
+        calls_lock = threading.Lock()
+
+        def classify_chunk(chunk):
+            outcome = self._classify_chunk(chunk)
+            with calls_lock:
+                calls.extend(outcome["calls"])
+            return outcome["results"]
+
+        if chunks:
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(chunks)),
+                thread_name_prefix="route-many",
+            ) as executor:
+                for results in executor.map(classify_chunk, chunks):
+                    decided.update(results)
+
+        # 4. Cache das decisões do Nova Micro e resultados na ordem de entrada
+        for key, (message, _, trip_context) in unique.items():
+            result = decided[key][0]
+            if self.classification_cache and result.source in ("llm", "batch"):
+                self.classification_cache.put(
+                    message, trip_context, result.complexity.value
+                )
+
+        results = [
+            self._build_route_config(item[0], *decided[key])
+            for item, key in zip(items, keys)
+        ]
+
+        stats = self._batch_stats(items, unique, decided, calls)
+        stats["elapsed_ms"] = int((time.perf_counter() - start) * 1000)
+        print(
+            f"🔀 Router batch: {stats['messages']} mensagens "
+            f"({stats['unique']} únicas) → {stats['llm_calls']} chamadas ao "
+            f"Nova Micro em {stats['elapsed_ms']}ms (${stats['cost_usd']:.6f})"
+        )
+        return BatchRouteResult(results=results, stats=stats)
+
+    def _classify_chunk(
+        self, chunk: List[Tuple[str, str, Optional[Dict]]]
+    ) -> Dict[str, Any]:
+        """
+        Classifica um pacote com uma chamada (ou uma por mensagem se não der).
+
+        Returns:
+            dict com "results" ({key: (ClassificationResult, ms)}) e "calls"
+            (uso e latência de cada chamada ao Nova Micro)
+        """
+        calls: List[Dict[str, Any]] = []
+        if len(chunk) > 1:
+            prompt = build_packed_prompt(
+                [message for _, message, _ in chunk],
+                self._trip_context_info(chunk[0][2]),
+            )
+            call_start = time.perf_counter()
+            labels = None
+            try:
+                with self.classifier_pool.lease() as classifier_agent:
+                    baseline = usage_snapshot(classifier_agent)
+                    result = classifier_agent(prompt)
+                labels = parse_packed_response(
+                    str(result),
+                    len(chunk),
+                    [c.value for c in QueryComplexity if c != QueryComplexity.VISION],
+                )
+                usage = extract_usage(result, baseline)
+            except Exception as e:
+                print(f"⚠️ Erro na classificação em lote: {e}")
+                usage = extract_usage(None)
+            elapsed_ms = int((time.perf_counter() - call_start) * 1000)
+            calls.append(
+                {"packed": len(chunk), "ok": labels is not None, "ms": elapsed_ms, **usage}
+            )
+            if labels is not None:
+                return {
+                    "results": {
+                        key: (ClassificationResult(QueryComplexity(label), "batch"), elapsed_ms)
+                        for (key, _, _), label in zip(chunk, labels)
+                    },
+                    "calls": calls,
+                }
+
+        # Mensagem isolada ou pacote sem resposta válida: uma chamada por mensagem
+        results = {}
+        for key, message, trip_context in chunk:
+            call_start = time.perf_counter()
+            result = self._classify_with_llm(message, trip_context)
+            elapsed_ms = int((time.perf_counter() - call_start) * 1000)
+            usage = result.usage or extract_usage(None)
+            calls.append(
+                {"packed": 1, "ok": result.source == "llm", "ms": elapsed_ms, **usage}
+            )
+            results[key] = (result, elapsed_ms)
+        return {"results": results, "calls": calls}
+
+    def _batch_stats(
+        self,
+        items: List[Tuple[str, bool, Optional[Dict]]],
+        unique: Dict[str, Tuple[str, bool, Optional[Dict]]],
+        decided: Dict[str, Tuple[ClassificationResult, int]],
+        calls: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Totais do lote: etapas, chamadas, tokens, custo e latência."""
+        sources: Dict[str, int] = {}
+        for result, _ in decided.values():
+            sources[result.source] = sources.get(result.source, 0) + 1
+
+        input_tokens = sum(call["input_tokens"] for call in calls)
+        output_tokens = sum(call["output_tokens"] for call in calls)
+        latencies = [call["ms"] for call in calls]
+        return {
+            "messages": len(items),
+            "unique": len(unique),
+            "duplicates": len(items) - len(unique),
+            "sources": sources,
+            "llm_calls": len(calls),
+            "packed_calls": sum(1 for call in calls if call["packed"] > 1),
+            "packed_failures": sum(
+                1 for call in calls if call["packed"] > 1 and not call["ok"]
+            ),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_read_input_tokens": sum(
+                call["cache_read_input_tokens"] for call in calls
+            ),
+            "cost_usd": sum(self._router_cost(call) for call in calls),
+            "call_latency_ms": {
+                "p50": percentile(latencies, 0.50),
+                "p95": percentile(latencies, 0.95),
+                "max": max(latencies, default=0),
+            },
+        }
+
+    def _router_cost(self, usage: Optional[Dict[str, int]]) -> float:
+        """Custo (USD) de uma chamada ao classificador (Nova Micro)."""
+        router_model = self.models["router"]
+        return usage_cost(
+            usage,
+            router_model["cost_input"],
+            router_model["cost_output"],
+            router_model.get("cost_cache_read"),
+        )
+
+    def _build_route_config(
+        self,
+        user_message: str,
+        classification: ClassificationResult,
+        routing_time_ms: int,
+    ) -> Dict[str, Any]:
+        """Configuração do agente para uma classificação (formato de route())."""
+        complexity = classification.complexity
+
+        # Selecionar modelo
         model_config = self.get_model_for_complexity(complexity)
 
-        # 3. Configurações específicas do agente
         # use_memory=True sempre, exceto para emojis puros (trivial com len<5)
         # Isso permite que o agente lembre contexto mesmo em queries simples
         use_memory = (
             len(user_message.strip()) >= 5 or complexity != QueryComplexity.TRIVIAL
         )
 
-        config = {
+        return {
             "model_id": model_config["id"],
             "complexity": complexity.value,
             "use_tools": complexity
             in [QueryComplexity.COMPLEX, QueryComplexity.CRITICAL],
             "use_memory": use_memory,
-            "enable_cache": True,  # Prompt caching habilitado
+            # Checkpoints de prompt caching (apenas modelos com suporte)
+            "enable_cache": model_config.get("supports_prompt_cache", False),
             "cost_input_per_1m": model_config["cost_input"],
             "cost_output_per_1m": model_config["cost_output"],
-            "routing_time_ms": int(
-                (datetime.now() - start_time).total_seconds() * 1000
+            "cost_cache_read_per_1m": model_config.get(
+                "cost_cache_read", model_config["cost_input"]
+            ),
+            "context_budget_tokens": model_config.get("context_budget_tokens"),
+            "classification_source": classification.source,
+            "classification_confidence": classification.confidence,
+            "classification_usage": classification.usage,
+            "classification_cost_usd": self._router_cost(classification.usage),
+            "classification_cache": (
+                self.classification_cache.stats()
+                if self.classification_cache
+                else None
             ),
+            "routing_time_ms": routing_time_ms,
         }
 
-        # 4. Log de roteamento (para métricas)
-        print(
-            f"🔀 Router: '{user_message[:50]}...' → {complexity.value} ({model_config['id']}) em {config['routing_time_ms']}ms"
-        )
-
-        return config
+    def _log_decision(
+        self, user_message: str, trip_context: Optional[Dict], config: Dict[str, Any]
+    ) -> None:
+        """Registra a decisão em JSONL (dataset do classificador local)."""
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "message": user_message,
+            "trip_context": trip_context,
+            "complexity": config["complexity"],
+            "source": config["classification_source"],
+            "routing_time_ms": config["routing_time_ms"],
+        }
+        try:
+            with self._decision_log_lock:
+                with open(self.decision_log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            print(f"⚠️ Failed to write decision log: {e}")
 
 
 # Exemplo de uso (será integrado no main.py na Fase 1)
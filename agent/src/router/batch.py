@@ -0,0 +1,108 @@
+"""
+Batch Routing - Classificação em lote para re-scoring e backfills
+
+Usado por `AgentRouter.route_many()` para classificar milhares de mensagens
+registradas (ROUTER_DECISION_LOG, analytics, avaliação) sem um round-trip ao
+Nova Micro por mensagem:
+- Várias mensagens com o mesmo contexto de viagem vão em um único prompt
+  numerado ("1: COMPLEX", "2: TRIVIAL", ...)
+- Mensagens longas não são empacotadas (ROUTER_BATCH_PACK_MAX_CHARS)
+- Resposta que não traz exatamente um rótulo válido por mensagem é
+  descartada e as mensagens do pacote são classificadas uma a uma
+
+Configuração via ambiente:
+- ROUTER_BATCH_SIZE: mensagens por prompt empacotado (padrão: 8)
+- ROUTER_BATCH_CONCURRENCY: chamadas simultâneas ao Nova Micro (padrão: 4)
+- ROUTER_BATCH_PACK_MAX_CHARS: tamanho máximo de mensagem empacotável
+  (padrão: 500)
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_BATCH_CONCURRENCY = 4
+DEFAULT_PACK_MAX_CHARS = 500
+
+_ANSWER_LINE = re.compile(r"^\s*(\d+)\s*[:.)\-]\s*([A-Za-zÀ-ú]+)")
+
+
+def batch_settings() -> Dict[str, int]:
+    """Tamanho de pacote, concorrência e limite de empacotamento (ambiente)."""
+    return {
+        "batch_size": max(1, int(os.getenv("ROUTER_BATCH_SIZE", str(DEFAULT_BATCH_SIZE)))),
+        "max_concurrency": max(
+            1, int(os.getenv("ROUTER_BATCH_CONCURRENCY", str(DEFAULT_BATCH_CONCURRENCY)))
+        ),
+        "pack_max_chars": int(
+            os.getenv("ROUTER_BATCH_PACK_MAX_CHARS", str(DEFAULT_PACK_MAX_CHARS))
+        ),
+    }
+
+
+def build_packed_prompt(messages: Sequence[str], context_info: str = "") -> str:
+    """Prompt com várias mensagens numeradas e uma resposta por linha."""
+    numbered = "\n".join(
+        f'{i}. "{message}"' for i, message in enumerate(messages, 1)
+    )
+    return f"""{context_info}
+Classifique CADA mensagem abaixo de forma independente.
+
+MENSAGENS DO USUÁRIO:
+{numbered}
+
+CLASSIFICAÇÃO (responda uma linha por mensagem, no formato "N: CATEGORIA", sem mais nada):
+"""
+
+
+def parse_packed_response(
+    text: str, count: int, labels: Sequence[str]
+) -> Optional[List[str]]:
+    """
+    Extrai um rótulo por mensagem da resposta empacotada.
+
+    Args:
+        text: Resposta do classificador
+        count: Número de mensagens no pacote
+        labels: Rótulos aceitos (minúsculos)
+
+    Returns:
+        Lista de rótulos na ordem das mensagens, ou None se faltar, sobrar
+        ou houver rótulo inválido (o pacote é então classificado um a um)
+    """
+    answers: Dict[int, str] = {}
+    for line in text.splitlines():
+        match = _ANSWER_LINE.match(line)
+        if not match:
+            continue
+        index, label = int(match.group(1)), match.group(2).lower()
+        if label not in labels or index in answers or not 1 <= index <= count:
+            return None
+        answers[index] = label
+
+    if len(answers) != count:
+        return None
+    return [answers[i] for i in range(1, count + 1)]
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Percentil por posição (0.0 sem amostras)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+@dataclass
+class BatchRouteResult:
+    """Resultado de `route_many`.
+
+    results: configurações (mesmo formato de `route()`) na ordem de entrada
+    stats: totais do lote (deduplicação, etapas, chamadas, tokens, custo e
+        latência das chamadas ao Nova Micro)
+    """
+
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,233 @@
+"""
+Classification Cache - Cache de classificações do Router por conteúdo
+
+Mensagens repetidas ("qual meu hotel?", "que horas é o voo?") não precisam
+voltar ao Nova Micro. A chave é o hash da mensagem normalizada mais os campos
+de `trip_context` que entram no prompt de classificação.
+
+BACKENDS:
+- InMemoryCacheBackend: LRU + TTL em processo (padrão)
+- DynamoDBCacheBackend: compartilhado entre réplicas (opcional)
+
+Configuração via ambiente:
+- ROUTER_CACHE_ENABLED: "false" desabilita o cache (padrão: true)
+- ROUTER_CACHE_MAX_ENTRIES: limite de entradas em processo (padrão: 1024)
+- ROUTER_CACHE_TTL_SECONDS: validade de cada entrada (padrão: 3600)
+- ROUTER_CACHE_DYNAMODB_TABLE: usa DynamoDB como backend compartilhado
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Campos do trip_context usados em _build_classification_prompt
+TRIP_CONTEXT_KEYS = ("status", "destinations", "start_date", "end_date")
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s!?.,;:…]+$")
+
+
+def normalize_message(message: str) -> str:
+    """Normaliza a mensagem para que variações triviais gerem a mesma chave.
+
+    Remove acentos, caixa, espaços repetidos e pontuação final:
+    "Que horas é o voo?" e "que horas e o voo" → "que horas e o voo"
+    """
+    text = unicodedata.normalize("NFKD", message)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _WHITESPACE.sub(" ", text.casefold()).strip()
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+def make_cache_key(message: str, trip_context: Optional[Dict] = None) -> str:
+    """Gera a chave (sha256) para mensagem + contexto relevante da viagem."""
+    context = {key: (trip_context or {}).get(key) for key in TRIP_CONTEXT_KEYS}
+    raw = json.dumps(
+        [normalize_message(message), context],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Interface de armazenamento para o cache de classificação."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Retorna o valor da chave ou None se ausente/expirado."""
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """Armazena o valor com validade de ttl_seconds."""
+
+    def size(self) -> Optional[int]:
+        """Número de entradas (None se o backend não consegue contar barato)."""
+        return None
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Backend em processo com despejo LRU e expiração por TTL."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self) -> Optional[int]:
+        return len(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DynamoDBCacheBackend(CacheBackend):
+    """Backend compartilhado entre réplicas usando uma tabela DynamoDB.
+
+    A tabela precisa de partition key `cache_key` (String) e, idealmente,
+    TTL habilitado no atributo `expires_at`. Como a remoção por TTL do
+    DynamoDB é assíncrona, a expiração também é verificada na leitura.
+    """
+
+    def __init__(self, table_name: str, region_name: str = "us-east-1"):
+        self.table_name = table_name
+        self.region_name = region_name
+        self._table = None
+
+    @property
+    def table(self):
+        """Lazy initialization da tabela DynamoDB."""
+        if self._table is None:
+            import boto3
+
+            self._table = boto3.resource(
+                "dynamodb", region_name=self.region_name
+            ).Table(self.table_name)
+        return self._table
+
+    def get(self, key: str) -> Optional[str]:
+        item = self.table.get_item(Key={"cache_key": key}).get("Item")
+        if not item or int(item.get("expires_at", 0)) <= time.time():
+            return None
+        return item.get("value")
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        self.table.put_item(
+            Item={
+                "cache_key": key,
+                "value": value,
+                "expires_at": int(time.time() + ttl_seconds),
+            }
+        )
+
+
+class ClassificationCache:
+    """Cache de classificações com contadores de hit/miss.
+
+    Falhas do backend nunca interrompem a classificação: são contadas como
+    miss (leitura) ou ignoradas (escrita).
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+    ):
+        """
+        Args:
+            backend: Backend de armazenamento (padrão: InMemoryCacheBackend)
+            max_entries: Limite de entradas do backend em processo
+            ttl_seconds: Validade de cada classificação armazenada
+        """
+        self.backend = (
+            backend if backend is not None else InMemoryCacheBackend(max_entries=max_entries)
+        )
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, region_name: str = "us-east-1") -> Optional["ClassificationCache"]:
+        """Cria o cache a partir das variáveis ROUTER_CACHE_* (None se desabilitado)."""
+        if os.getenv("ROUTER_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+            return None
+
+        max_entries = int(os.getenv("ROUTER_CACHE_MAX_ENTRIES", "1024"))
+        ttl_seconds = float(os.getenv("ROUTER_CACHE_TTL_SECONDS", "3600"))
+        table_name = os.getenv("ROUTER_CACHE_DYNAMODB_TABLE")
+
+        backend = (
+            DynamoDBCacheBackend(table_name, region_name=region_name)
+            if table_name
+            else InMemoryCacheBackend(max_entries=max_entries)
+        )
+        return cls(backend=backend, ttl_seconds=ttl_seconds)
+
+    def get(self, message: str, trip_context: Optional[Dict] = None) -> Optional[str]:
+        """Busca a classificação armazenada para a mensagem."""
+        try:
+            value = self.backend.get(make_cache_key(message, trip_context))
+        except Exception as e:
+            print(f"⚠️ Classification cache read failed: {e}")
+            value = None
+            with self._lock:
+                self.errors += 1
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, message: str, trip_context: Optional[Dict], value: str) -> None:
+        """Armazena a classificação da mensagem."""
+        try:
+            self.backend.set(
+                make_cache_key(message, trip_context), value, self.ttl_seconds
+            )
+        except Exception as e:
+            print(f"⚠️ Classification cache write failed: {e}")
+            with self._lock:
+                self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores acumulados do cache ("size" é None em backends remotos)."""
+        size = self.backend.size()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "size": size,
+            }
@@ -0,0 +1,123 @@
+"""
+Classifier Pool - Reuso de agentes Strands de classificação
+
+Cada chamada ao Nova Micro precisava construir um novo `Agent` (system prompt,
+tool registry, estado da conversa). O pool mantém agentes sem estado,
+construídos sob demanda e reutilizados entre requests/threads.
+
+GARANTIAS:
+- Um agente nunca é usado por duas threads ao mesmo tempo (Strands lança
+  ConcurrencyException em invocações concorrentes)
+- Histórico da conversa, métricas do event loop (invocações, traces, uso
+  acumulado) e estado do agente são recriados antes de devolvê-lo ao pool:
+  nada vaza entre requests e a memória não cresce com o número de leases
+- O tamanho do pool acompanha a concorrência do runtime
+"""
+
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+
+def default_pool_size() -> int:
+    """Tamanho padrão do pool, alinhado à concorrência do runtime.
+
+    Usa ROUTER_CLASSIFIER_POOL_SIZE se definido; caso contrário segue o mesmo
+    cálculo do ThreadPoolExecutor, que é onde o AgentCore Runtime executa
+    entrypoints síncronos.
+    """
+    configured = os.getenv("ROUTER_CLASSIFIER_POOL_SIZE")
+    if configured:
+        return max(1, int(configured))
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class ClassifierPool:
+    """Pool thread-safe de agentes classificadores sem estado."""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: Optional[int] = None,
+        acquire_timeout: float = 30.0,
+    ):
+        """
+        Inicializa o pool (agentes são criados sob demanda, não no __init__).
+
+        Args:
+            factory: Função que constrói um novo agente classificador
+            max_size: Número máximo de agentes (padrão: default_pool_size())
+            acquire_timeout: Segundos aguardando um agente livre antes de falhar
+        """
+        self.factory = factory
+        self.max_size = max_size or default_pool_size()
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> int:
+        """Quantidade de agentes já construídos pelo pool."""
+        return self._created
+
+    def acquire(self) -> Any:
+        """Obtém um agente livre, construindo um novo se houver capacidade."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.max_size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        # Pool cheio: aguarda um agente ser devolvido
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No classifier agent available after {self.acquire_timeout}s"
+            ) from None
+
+    def release(self, agent: Any) -> None:
+        """Devolve o agente ao pool sem histórico, métricas ou estado."""
+        self._reset(agent)
+        self._idle.put(agent)
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """Context manager para usar um agente do pool com segurança."""
+        agent = self.acquire()
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    @staticmethod
+    def _reset(agent: Any) -> None:
+        """Remove histórico, métricas e estado acumulados na última invocação."""
+        messages = getattr(agent, "messages", None)
+        if isinstance(messages, list):
+            messages.clear()
+        # Strands importado aqui: o agente já existe, então o módulo já carregou
+        if hasattr(agent, "event_loop_metrics"):
+            from strands.telemetry.metrics import EventLoopMetrics
+
+            agent.event_loop_metrics = EventLoopMetrics()
+        if hasattr(agent, "state"):
+            from strands.agent.state import AgentState
+
+            agent.state = AgentState()
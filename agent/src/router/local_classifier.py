@@ -0,0 +1,166 @@
+"""
+Local Classifier - Classificação no próprio processo antes do Nova Micro
+
+Etapa opcional entre `is_trivial_pattern` e o agente Strands: um Naive Bayes
+multinomial (unigramas + bigramas) treinado offline a partir das decisões
+registradas por `AgentRouter.route()` (ROUTER_DECISION_LOG). Quando a
+confiança passa do limiar, a classificação é resolvida localmente e o
+round-trip ao Bedrock é evitado.
+
+Configuração via ambiente:
+- ROUTER_LOCAL_CLASSIFIER_MODEL: caminho do modelo JSON (habilita a etapa)
+- ROUTER_LOCAL_CLASSIFIER_THRESHOLD: confiança mínima (padrão: 0.9)
+
+Treino e avaliação: benchmarks/eval_local_classifier.py
+"""
+
+import json
+import math
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .classification_cache import normalize_message
+
+# Labels que o classificador local pode decidir (VISION vem de has_image)
+LABELS = ("trivial", "informative", "complex", "critical")
+
+
+def extract_features(message: str) -> List[str]:
+    """Tokens normalizados (unigramas + bigramas) da mensagem."""
+    tokens = [
+        token.strip(".,;:!?\"'()") for token in normalize_message(message).split()
+    ]
+    tokens = [token for token in tokens if token]
+    bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return tokens + bigrams
+
+
+class LocalClassifier:
+    """Naive Bayes multinomial com suavização de Laplace."""
+
+    def __init__(
+        self,
+        class_counts: Dict[str, int],
+        feature_counts: Dict[str, Dict[str, int]],
+        threshold: float = 0.9,
+        alpha: float = 1.0,
+    ):
+        """
+        Args:
+            class_counts: Número de exemplos de treino por label
+            feature_counts: Contagem de cada feature por label
+            threshold: Confiança mínima para decidir sem o Nova Micro
+            alpha: Suavização de Laplace
+        """
+        self.class_counts = class_counts
+        self.feature_counts = feature_counts
+        self.threshold = threshold
+        self.alpha = alpha
+
+        # Pré-cálculo dos termos constantes por label
+        total = sum(class_counts.values())
+        self.vocabulary = set().union(*(set(c) for c in feature_counts.values()))
+        self._log_prior = {
+            label: math.log(count / total) for label, count in class_counts.items()
+        }
+        self._log_denominator = {
+            label: math.log(
+                sum(feature_counts.get(label, {}).values())
+                + alpha * len(self.vocabulary)
+            )
+            for label in class_counts
+        }
+
+    @classmethod
+    def train(
+        cls, records: Iterable[Tuple[str, str]], threshold: float = 0.9
+    ) -> "LocalClassifier":
+        """Treina a partir de pares (mensagem, label) já decididos pelo LLM."""
+        class_counts: Counter = Counter()
+        feature_counts: Dict[str, Counter] = {}
+        for message, label in records:
+            if label not in LABELS:
+                continue
+            class_counts[label] += 1
+            feature_counts.setdefault(label, Counter()).update(
+                extract_features(message)
+            )
+        if not class_counts:
+            raise ValueError("No labeled records to train the local classifier")
+        return cls(
+            dict(class_counts),
+            {label: dict(counts) for label, counts in feature_counts.items()},
+            threshold=threshold,
+        )
+
+    @classmethod
+    def load(cls, path: str, threshold: Optional[float] = None) -> "LocalClassifier":
+        """Carrega um modelo salvo com save()."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            data["class_counts"],
+            data["feature_counts"],
+            threshold=threshold if threshold is not None else data["threshold"],
+            alpha=data.get("alpha", 1.0),
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["LocalClassifier"]:
+        """Carrega o modelo de ROUTER_LOCAL_CLASSIFIER_MODEL (None se ausente)."""
+        path = os.getenv("ROUTER_LOCAL_CLASSIFIER_MODEL")
+        if not path:
+            return None
+        threshold = float(os.getenv("ROUTER_LOCAL_CLASSIFIER_THRESHOLD", "0.9"))
+        try:
+            return cls.load(path, threshold=threshold)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Local classifier not loaded ({path}): {e}")
+            return None
+
+    def save(self, path: str) -> None:
+        """Salva o modelo em JSON."""
+        Path(path).write_text(
+            json.dumps(
+                {
+                    "class_counts": self.class_counts,
+                    "feature_counts": self.feature_counts,
+                    "threshold": self.threshold,
+                    "alpha": self.alpha,
+                },
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+
+    def predict(self, message: str) -> Tuple[str, float]:
+        """Retorna (label, confiança) para a mensagem.
+
+        A confiança é a probabilidade posterior do label vencedor; mensagens
+        sem nenhuma feature conhecida têm confiança 0.
+        """
+        features = [f for f in extract_features(message) if f in self.vocabulary]
+        if not features:
+            return "informative", 0.0
+
+        scores = {}
+        for label, log_prior in self._log_prior.items():
+            counts = self.feature_counts.get(label, {})
+            denominator = self._log_denominator[label]
+            scores[label] = log_prior + sum(
+                math.log(counts.get(f, 0) + self.alpha) - denominator
+                for f in features
+            )
+
+        # Softmax estável para obter a probabilidade posterior
+        best = max(scores, key=scores.get)
+        total = sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, 1.0 / total
+
+    def classify(self, message: str) -> Optional[Tuple[str, float]]:
+        """Retorna (label, confiança) se a confiança atingir o limiar."""
+        label, confidence = self.predict(message)
+        if confidence >= self.threshold:
+            return label, confidence
+        return None
@@ -0,0 +1,118 @@
+"""
+Trivial Matcher - Detecção de mensagens triviais em uma única passada
+
+Substitui o loop de `re.match` sobre padrões crus por estruturas construídas
+uma vez no `AgentRouter.__init__`:
+- frozenset de frases triviais normalizadas ("oi", "obrigado", "tudo bem"...)
+- verificação de mensagem composta apenas por emojis
+- uma única regex (alternação) para padrões extras vindos de configuração
+
+Configuração via ambiente:
+- ROUTER_TRIVIAL_PHRASES: frases extras separadas por vírgula ("bom dia,boa noite")
+- ROUTER_TRIVIAL_PATTERNS: lista JSON de regex extras (ex: '["^k+$"]')
+"""
+
+import json
+import os
+import re
+from typing import Iterable, Optional
+
+# Frases triviais padrão (equivalentes aos padrões originais do Router)
+DEFAULT_TRIVIAL_PHRASES = frozenset(
+    {
+        # Saudações
+        "oi",
+        "olá",
+        "hey",
+        "hi",
+        "hello",
+        # Agradecimentos
+        "obrigado",
+        "obrigada",
+        "thanks",
+        "valeu",
+        # Confirmações
+        "ok",
+        "certo",
+        "tudo bem",
+        "sim",
+        "não",
+        "yes",
+        "no",
+    }
+)
+
+# Mensagens com mais palavras que isso nunca são triviais
+MAX_TRIVIAL_WORDS = 3
+
+# Faixas Unicode de emojis (pictográficos, símbolos, bandeiras, dingbats)
+_EMOJI = "\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF\u2300-\u23FF"
+
+# Modificadores que só aparecem compondo emojis (ZWJ, variation selectors, keycap, tags)
+_EMOJI_MODIFIERS = "\u200D\uFE0E\uFE0F\u20E3\U000E0020-\U000E007F"
+
+# Ao menos um emoji, cercado apenas por modificadores, espaços e '!'/'?'
+_EMOJI_ONLY = re.compile(
+    f"[{_EMOJI_MODIFIERS}\\s!?]*[{_EMOJI}][{_EMOJI}{_EMOJI_MODIFIERS}\\s!?]*"
+)
+
+
+def is_emoji_only(text: str) -> bool:
+    """Verifica se o texto contém apenas emojis (e espaços/pontuação final)."""
+    return _EMOJI_ONLY.fullmatch(text) is not None
+
+
+class TrivialMatcher:
+    """Detector de mensagens triviais construído uma única vez."""
+
+    def __init__(
+        self,
+        extra_phrases: Optional[Iterable[str]] = None,
+        extra_patterns: Optional[Iterable[str]] = None,
+    ):
+        """
+        Args:
+            extra_phrases: Frases triviais adicionais (comparadas após normalização)
+            extra_patterns: Regex adicionais, aplicadas sobre o texto normalizado
+        """
+        self.phrases = DEFAULT_TRIVIAL_PHRASES | frozenset(
+            self.normalize(phrase) for phrase in extra_phrases or ()
+        )
+
+        patterns = list(extra_patterns or ())
+        self.pattern = (
+            re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+            if patterns
+            else None
+        )
+
+    @classmethod
+    def from_env(cls) -> "TrivialMatcher":
+        """Cria o matcher com extensões de ROUTER_TRIVIAL_PHRASES/PATTERNS."""
+        phrases = [
+            phrase
+            for phrase in os.getenv("ROUTER_TRIVIAL_PHRASES", "").split(",")
+            if phrase.strip()
+        ]
+        patterns = json.loads(os.getenv("ROUTER_TRIVIAL_PATTERNS", "[]"))
+        return cls(extra_phrases=phrases, extra_patterns=patterns)
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Caixa baixa, espaços colapsados e sem '!'/'?' finais."""
+        return " ".join(message.lower().split()).rstrip("!? ")
+
+    def matches(self, message: str) -> bool:
+        """Verifica se a mensagem é trivial."""
+        words = message.lower().split(None, MAX_TRIVIAL_WORDS)
+
+        # Mensagens longas (> 3 palavras) só são triviais se forem apenas emojis
+        if len(words) > MAX_TRIVIAL_WORDS:
+            return is_emoji_only(message)
+
+        normalized = " ".join(words).rstrip("!? ")
+        if normalized in self.phrases or is_emoji_only(normalized):
+            return True
+        return (
+            self.pattern is not None and self.pattern.fullmatch(normalized) is not None
+        )
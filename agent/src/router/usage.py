@@ -0,0 +1,125 @@
+"""
+Uso de tokens por invocação e checkpoints de prompt caching do Bedrock.
+
+- `system_prompt_blocks` monta o system prompt como blocos do Converse, com
+  um `cachePoint` logo após o prefixo estático (persona / instruções do
+  classificador). O Bedrock cobra a parte em cache com desconto nas leituras.
+- `extract_usage` lê o uso de tokens (incluindo leituras/escritas de cache)
+  do AgentResult do Strands; `usage_snapshot` guarda o acumulado do agente
+  antes da chamada, para versões do Strands sem métrica por invocação.
+- `usage_cost` converte esse uso em dólares com a tabela de preços do Router
+  (AgentRouter.models).
+
+Obs.: o Bedrock só cria o checkpoint quando o prefixo atinge o mínimo de
+tokens do modelo; abaixo disso a requisição segue normal, sem cache.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+USAGE_FIELDS = {
+    "input_tokens": "inputTokens",
+    "output_tokens": "outputTokens",
+    "cache_read_input_tokens": "cacheReadInputTokens",
+    "cache_write_input_tokens": "cacheWriteInputTokens",
+}
+
+
+def system_prompt_blocks(
+    static_prefix: str, dynamic_suffix: str = "", enable_cache: bool = False
+) -> Union[str, List[Dict[str, Any]]]:
+    """
+    Monta o system prompt com checkpoint de cache após o prefixo estático.
+
+    Args:
+        static_prefix: Parte idêntica em todos os requests
+        dynamic_suffix: Parte que muda por request (fica depois do checkpoint)
+        enable_cache: Se False, devolve a string concatenada (sem checkpoint)
+
+    Returns:
+        String ou lista de SystemContentBlock para o Agent Strands
+    """
+    if not enable_cache:
+        return f"{static_prefix}{dynamic_suffix}"
+
+    blocks: List[Dict[str, Any]] = [{"text": static_prefix}, CACHE_POINT]
+    if dynamic_suffix:
+        blocks.append({"text": dynamic_suffix})
+    return blocks
+
+
+def _usage_fields(usage: Any) -> Dict[str, int]:
+    if not isinstance(usage, dict):
+        usage = {}
+    return {name: int(usage.get(key, 0) or 0) for name, key in USAGE_FIELDS.items()}
+
+
+def usage_snapshot(agent: Any) -> Dict[str, int]:
+    """
+    Uso acumulado do agente antes de uma chamada (base de extract_usage).
+
+    Agentes reutilizados (pool, sessão) acumulam uso em `event_loop_metrics`
+    por toda a vida; o uso da chamada é a diferença para este snapshot.
+    """
+    metrics = getattr(agent, "event_loop_metrics", None)
+    return _usage_fields(getattr(metrics, "accumulated_usage", None))
+
+
+def extract_usage(
+    result: Any, baseline: Optional[Dict[str, int]] = None
+) -> Dict[str, int]:
+    """
+    Extrai o uso de tokens da última invocação de um AgentResult.
+
+    Usa a métrica da invocação quando o Strands a fornece (agent_invocations);
+    senão, o acumulado do agente menos `baseline` (usage_snapshot antes da
+    chamada), já que agentes reutilizados acumulam uso entre chamadas.
+
+    Returns:
+        dict com input/output tokens e tokens lidos/escritos no cache
+        (zeros quando o resultado não traz métricas)
+    """
+    metrics = getattr(result, "metrics", None)
+    invocations = getattr(metrics, "agent_invocations", None)
+    if isinstance(invocations, list) and invocations:
+        return _usage_fields(getattr(invocations[-1], "usage", None))
+
+    usage = _usage_fields(getattr(metrics, "accumulated_usage", None))
+    if baseline:
+        usage = {name: max(0, value - baseline.get(name, 0)) for name, value in usage.items()}
+    return usage
+
+
+def usage_cost(
+    usage: Optional[Dict[str, int]],
+    cost_input: float,
+    cost_output: float,
+    cost_cache_read: Optional[float] = None,
+) -> float:
+    """
+    Custo em dólares de uma invocação.
+
+    No Converse, `inputTokens` não inclui os tokens lidos/escritos no cache:
+    leituras pagam `cost_cache_read` (desconto do modelo) e escritas pagam o
+    preço normal de entrada.
+
+    Args:
+        usage: Resultado de extract_usage (None = sem chamada ao modelo)
+        cost_input: Preço por 1M tokens de entrada
+        cost_output: Preço por 1M tokens de saída
+        cost_cache_read: Preço por 1M tokens lidos do cache (padrão: cost_input)
+
+    Returns:
+        Custo em USD
+    """
+    if not usage:
+        return 0.0
+    if cost_cache_read is None:
+        cost_cache_read = cost_input
+    return (
+        (usage.get("input_tokens", 0) + usage.get("cache_write_input_tokens", 0))
+        * cost_input
+        + usage.get("cache_read_input_tokens", 0) * cost_cache_read
+        + usage.get("output_tokens", 0) * cost_output
+    ) / 1_000_000
@@ -0,0 +1,42 @@
+"""Serving module initialization.
+
+Request-path optimizations around the entrypoint (speculative generation, response cache,
+admission control).
+Exports are resolved on first access, like the router and memory packages.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "AdmissionController": ".admission",
+    "AdmissionRejected": ".admission",
+    "ResponseCache": ".response_cache",
+    "SpeculationLedger": ".speculation",
+    "SpeculativeGeneration": ".speculation",
+    "speculation_enabled": ".speculation",
+}
+
+if TYPE_CHECKING:
+    from .admission import AdmissionController, AdmissionRejected
+    from .response_cache import ResponseCache
+    from .speculation import SpeculationLedger, SpeculativeGeneration, speculation_enabled
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionRejected",
+    "ResponseCache",
+    "SpeculationLedger",
+    "SpeculativeGeneration",
+    "speculation_enabled",
+]
@@ -0,0 +1,362 @@
+"""
+Admission Control - Limite de concorrência adaptativo por modelo (AIMD)
+
+Em rajadas, todo request chamava o Bedrock na hora; Nova Pro e Sonnet
+devolviam throttling e o usuário recebia ERROR_RESPONSE. O controle de
+admissão fica entre `router.route()` e a chamada do agente:
+- Cada model_id tem seu limite de gerações simultâneas, ajustado por AIMD:
+  +1/limite a cada sucesso com o limite em uso (≈ +1 por janela cheia) e
+  ×ADMISSION_BACKOFF a cada throttling (no máximo uma redução por
+  ADMISSION_COOLDOWN_SECONDS: os erros da mesma rajada contam uma vez só)
+- Acima do limite o request espera numa fila FIFO limitada do modelo;
+  a geração especulativa usa try_acquire (vaga imediata ou não especula)
+- Descarte ciente do prazo, sem chamar o Bedrock (AdmissionRejected):
+  fila cheia, espera estimada (posição × tempo médio de serviço / limite)
+  maior que o prazo, ou prazo vencido ainda na fila
+- Métricas: espera na fila no estágio "admission_wait" dos histogramas;
+  profundidade da fila, limite, em uso, throttles e descartes em stats()
+
+Configuração via ambiente:
+- ADMISSION_ENABLED: "false" desliga o controle (padrão: true)
+- ADMISSION_INITIAL_LIMIT: limite inicial por modelo (padrão: 16)
+- ADMISSION_MIN_LIMIT / ADMISSION_MAX_LIMIT: faixa do limite (padrão: 1 / 128)
+- ADMISSION_BACKOFF: fator aplicado no throttling (padrão: 0.5)
+- ADMISSION_COOLDOWN_SECONDS: intervalo mínimo entre reduções (padrão: 1)
+- ADMISSION_QUEUE_SIZE: requests em espera por modelo (padrão: 64)
+- ADMISSION_QUEUE_TIMEOUT_SECONDS: prazo padrão na fila (padrão: 10)
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+try:
+    from metrics.histogram import Histogram
+    from metrics.registry import MetricsRegistry, get_registry
+except ImportError:
+    from src.metrics.histogram import Histogram
+    from src.metrics.registry import MetricsRegistry, get_registry
+
+# Motivos de descarte
+QUEUE_FULL = "queue_full"
+DEADLINE_UNREACHABLE = "deadline_unreachable"
+DEADLINE = "deadline"
+SHED_REASONS = (QUEUE_FULL, DEADLINE_UNREACHABLE, DEADLINE)
+
+# Códigos de erro do Bedrock tratados como throttling
+THROTTLING_CODES = frozenset(
+    {"ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException"}
+)
+
+# Peso da última amostra na média móvel do tempo de serviço
+_SERVICE_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Request descartado antes de chamar o modelo."""
+
+    def __init__(self, model_id: str, reason: str, waited_ms: float = 0.0):
+        super().__init__(f"{model_id}: {reason}")
+        self.model_id = model_id
+        self.reason = reason
+        self.waited_ms = waited_ms
+
+
+def is_throttling_error(exc: BaseException) -> bool:
+    """Throttling do Bedrock (ModelThrottledException do Strands ou ClientError)."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        # Pelo nome: não importa Strands/botocore só para o isinstance
+        if any(cls.__name__ == "ModelThrottledException" for cls in type(exc).__mro__):
+            return True
+        response = getattr(exc, "response", None)
+        if isinstance(response, dict):
+            if response.get("Error", {}).get("Code") in THROTTLING_CODES:
+                return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+@dataclass
+class AdmissionTicket:
+    """Vaga concedida para uma geração."""
+
+    model_id: str
+    waited_ms: float
+    queued: bool
+    limit: int
+    started: float = field(default_factory=time.monotonic)
+
+
+@dataclass(eq=False)
+class _Waiter:
+    future: asyncio.Future
+    granted: bool = False
+
+
+class _ModelLimiter:
+    """Estado de um model_id (protegido pelo lock do controller)."""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters: Deque[_Waiter] = deque()
+        self.last_decrease = float("-inf")
+        self.service_ms: Optional[float] = None
+        self.queue_depth = Histogram()
+        self.peak_queue = 0
+        self.counters = {"admitted": 0, "enqueued": 0, "throttled": 0}
+        self.shed = {reason: 0 for reason in SHED_REASONS}
+
+    @property
+    def capacity(self) -> int:
+        return max(1, int(self.limit))
+
+    def estimated_wait_ms(self, position: int) -> float:
+        """Espera estimada para a posição na fila (0 sem histórico)."""
+        if self.service_ms is None:
+            return 0.0
+        return position * self.service_ms / self.capacity
+
+
+class AdmissionController:
+    """Limites AIMD por modelo com fila limitada e descarte por prazo (thread-safe)."""
+
+    def __init__(
+        self,
+        initial_limit: float = 16,
+        min_limit: float = 1,
+        max_limit: float = 128,
+        backoff: float = 0.5,
+        cooldown_seconds: float = 1.0,
+        queue_size: int = 64,
+        queue_timeout_seconds: float = 10.0,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """
+        Args:
+            initial_limit: Gerações simultâneas por modelo no início
+            min_limit: Limite mínimo após reduções
+            max_limit: Limite máximo após aumentos
+            backoff: Fator multiplicativo aplicado no throttling
+            cooldown_seconds: Intervalo mínimo entre duas reduções do mesmo modelo
+            queue_size: Requests em espera por modelo (além disso, descarta)
+            queue_timeout_seconds: Prazo na fila quando o request não informa um
+            registry: Histogramas onde a espera é registrada (padrão: global)
+        """
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.cooldown_seconds = cooldown_seconds
+        self.queue_size = queue_size
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.registry = registry if registry is not None else get_registry()
+
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["AdmissionController"]:
+        """Cria o controller a partir das variáveis ADMISSION_* (None se desabilitado)."""
+        if os.getenv("ADMISSION_ENABLED", "true").lower() in ("0", "false", "no"):
+            return None
+        return cls(
+            initial_limit=float(os.getenv("ADMISSION_INITIAL_LIMIT", "16")),
+            min_limit=float(os.getenv("ADMISSION_MIN_LIMIT", "1")),
+            max_limit=float(os.getenv("ADMISSION_MAX_LIMIT", "128")),
+            backoff=float(os.getenv("ADMISSION_BACKOFF", "0.5")),
+            cooldown_seconds=float(os.getenv("ADMISSION_COOLDOWN_SECONDS", "1")),
+            queue_size=int(os.getenv("ADMISSION_QUEUE_SIZE", "64")),
+            queue_timeout_seconds=float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10")),
+        )
+
+    def _limiter(self, model_id: str) -> _ModelLimiter:
+        limiter = self._limiters.get(model_id)
+        if limiter is None:
+            limiter = self._limiters[model_id] = _ModelLimiter(self.initial_limit)
+        return limiter
+
+    async def acquire(
+        self,
+        model_id: str,
+        timeout: Optional[float] = None,
+        complexity: Optional[str] = None,
+    ) -> AdmissionTicket:
+        """
+        Espera uma vaga de geração no modelo.
+
+        Args:
+            model_id: Modelo escolhido pelo Router
+            timeout: Prazo (s) para conseguir a vaga (padrão: queue_timeout_seconds)
+            complexity: Dimensão dos histogramas de espera
+
+        Returns:
+            AdmissionTicket, a devolver com release()
+
+        Raises:
+            AdmissionRejected: fila cheia, prazo inalcançável ou vencido na fila
+        """
+        timeout = self.queue_timeout_seconds if timeout is None else max(0.0, timeout)
+        start = time.monotonic()
+        waiter = None
+        reason = None
+        with self._lock:
+            limiter = self._limiter(model_id)
+            if limiter.in_flight < limiter.capacity and not limiter.waiters:
+                limiter.in_flight += 1
+                limiter.counters["admitted"] += 1
+            elif len(limiter.waiters) >= self.queue_size:
+                reason = QUEUE_FULL
+            elif limiter.estimated_wait_ms(len(limiter.waiters) + 1) > timeout * 1000:
+                reason = DEADLINE_UNREACHABLE
+            else:
+                waiter = _Waiter(asyncio.get_running_loop().create_future())
+                limiter.waiters.append(waiter)
+                limiter.counters["enqueued"] += 1
+                depth = len(limiter.waiters)
+                limiter.queue_depth.record(depth)
+                limiter.peak_queue = max(limiter.peak_queue, depth)
+            if reason is not None:
+                limiter.shed[reason] += 1
+            capacity = limiter.capacity
+
+        if reason is not None:
+            self.registry.record("admission_wait", 0.0, model_id, complexity)
+            raise AdmissionRejected(model_id, reason)
+
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(waiter.future, timeout)
+            except asyncio.TimeoutError as exc:
+                # A vaga pode ter sido concedida junto com o timeout: nesse caso vale
+                if self._abandon(limiter, waiter):
+                    waited_ms = (time.monotonic() - start) * 1000
+                    self.registry.record("admission_wait", waited_ms, model_id, complexity)
+                    raise AdmissionRejected(model_id, DEADLINE, waited_ms) from exc
+            except asyncio.CancelledError:
+                if not self._abandon(limiter, waiter):
+                    self._release(limiter, throttled=False, service_ms=None)
+                raise
+
+        waited_ms = (time.monotonic() - start) * 1000
+        self.registry.record("admission_wait", waited_ms, model_id, complexity)
+        return AdmissionTicket(model_id, waited_ms, waiter is not None, capacity)
+
+    def try_acquire(self, model_id: str) -> Optional[AdmissionTicket]:
+        """Vaga imediata ou None, sem entrar na fila (geração especulativa)."""
+        with self._lock:
+            limiter = self._limiter(model_id)
+            if limiter.in_flight >= limiter.capacity or limiter.waiters:
+                return None
+            limiter.in_flight += 1
+            limiter.counters["admitted"] += 1
+            return AdmissionTicket(model_id, 0.0, False, limiter.capacity)
+
+    def release_when_done(self, ticket: AdmissionTicket, task: "asyncio.Future") -> None:
+        """Devolve a vaga quando a task terminar (sucesso, erro ou cancelamento)."""
+
+        def done(finished: "asyncio.Future") -> None:
+            error = None if finished.cancelled() else finished.exception()
+            self.release(ticket, throttled=error is not None and is_throttling_error(error))
+
+        task.add_done_callback(done)
+
+    def release(self, ticket: AdmissionTicket, throttled: bool = False) -> None:
+        """Devolve a vaga e ajusta o limite (AIMD) pelo resultado da geração."""
+        service_ms = (time.monotonic() - ticket.started) * 1000
+        with self._lock:
+            limiter = self._limiter(ticket.model_id)
+        self._release(limiter, throttled, service_ms)
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self,
+        model_id: str,
+        timeout: Optional[float] = None,
+        complexity: Optional[str] = None,
+    ) -> AsyncIterator[AdmissionTicket]:
+        """Vaga durante o bloco; exceção de throttling no bloco reduz o limite."""
+        ticket = await self.acquire(model_id, timeout, complexity)
+        try:
+            yield ticket
+        except BaseException as e:
+            self.release(ticket, throttled=is_throttling_error(e))
+            raise
+        self.release(ticket)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Limite, em uso, fila (atual, pico, profundidade) e contadores por modelo."""
+        with self._lock:
+            return {
+                model_id: {
+                    "limit": round(limiter.limit, 2),
+                    "in_flight": limiter.in_flight,
+                    "queued": len(limiter.waiters),
+                    "peak_queue": limiter.peak_queue,
+                    "queue_depth": limiter.queue_depth.summary(),
+                    "service_ms": round(limiter.service_ms or 0.0, 1),
+                    **limiter.counters,
+                    "shed": dict(limiter.shed),
+                }
+                for model_id, limiter in sorted(self._limiters.items())
+            }
+
+    def _abandon(self, limiter: _ModelLimiter, waiter: _Waiter) -> bool:
+        """Tira o waiter da fila; False se a vaga já tinha sido concedida."""
+        with self._lock:
+            if waiter.granted:
+                return False
+            limiter.waiters.remove(waiter)
+            limiter.shed[DEADLINE] += 1
+            return True
+
+    def _release(
+        self, limiter: _ModelLimiter, throttled: bool, service_ms: Optional[float]
+    ) -> None:
+        granted = []
+        with self._lock:
+            if throttled:
+                limiter.counters["throttled"] += 1
+                now = time.monotonic()
+                if now - limiter.last_decrease >= self.cooldown_seconds:
+                    limiter.limit = max(self.min_limit, limiter.limit * self.backoff)
+                    limiter.last_decrease = now
+            elif service_ms is not None:
+                # Só cresce quando o limite está sendo usado
+                if limiter.in_flight * 2 >= limiter.capacity:
+                    limiter.limit = min(self.max_limit, limiter.limit + 1 / limiter.limit)
+                limiter.service_ms = (
+                    service_ms
+                    if limiter.service_ms is None
+                    else limiter.service_ms
+                    + _SERVICE_EWMA_ALPHA * (service_ms - limiter.service_ms)
+                )
+            limiter.in_flight -= 1
+
+            # Vagas livres vão para a fila, em ordem
+            while limiter.waiters and limiter.in_flight < limiter.capacity:
+                waiter = limiter.waiters.popleft()
+                waiter.granted = True
+                limiter.in_flight += 1
+                limiter.counters["admitted"] += 1
+                granted.append(waiter)
+
+        for waiter in granted:
+            try:
+                # O waiter pode estar no event loop de outra thread (invoke síncrono)
+                waiter.future.get_loop().call_soon_threadsafe(_wake, waiter.future)
+            except RuntimeError:
+                # Loop encerrado: ninguém vai usar a vaga
+                self._release(limiter, throttled=False, service_ms=None)
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
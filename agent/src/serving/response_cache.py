@@ -0,0 +1,166 @@
+"""
+Response Cache - Respostas TRIVIAL/INFORMATIVE reutilizadas dentro da sessão
+
+Respostas triviais ("Oi", "Obrigado") e perguntas informativas repetidas na
+mesma sessão passavam pelo pipeline completo do agente. O cache fica na
+frente da geração em `invoke_async`:
+- Chave: complexidade + mensagem normalizada + actor/session
+- Só complexidades de baixo risco são cacheáveis (TRIVIAL e INFORMATIVE);
+  COMPLEX/CRITICAL/VISION sempre geram de novo
+- Toda escrita no Memory da sessão (add_interaction/add_conversation)
+  invalida as entradas dela: o estado da conversa mudou. A resposta é
+  guardada depois da escrita do próprio turno, e respostas servidas do cache
+  não são gravadas no Memory, então uma pergunta repetida continua
+  acertando até a sessão receber um turno novo
+- O contexto do Memory não entra na chave: ele muda a cada escrita (o
+  próprio turno entra no histórico), e mudanças vindas de outro processo
+  ficam limitadas pelo TTL
+- LRU + TTL em processo; stats() reporta hit rate e latência economizada
+
+Configuração via ambiente:
+- RESPONSE_CACHE_ENABLED: "false" desabilita o cache (padrão: true)
+- RESPONSE_CACHE_MAX_ENTRIES: limite de entradas (padrão: 1024)
+- RESPONSE_CACHE_TTL_SECONDS: validade de cada entrada (padrão: 300)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+try:
+    from router.classification_cache import normalize_message
+except ImportError:
+    from src.router.classification_cache import normalize_message
+
+# Complexidades cujas respostas podem ser reutilizadas
+CACHEABLE_COMPLEXITIES = ("trivial", "informative")
+
+
+@dataclass
+class CachedResponse:
+    """Resposta em cache e quanto custou gerá-la."""
+
+    response: str
+    generation_ms: int
+    expires_at: float
+
+
+def make_response_key(complexity: str, message: str, actor_id: str, session_id: str) -> str:
+    """Chave (sha256) da resposta para a sessão."""
+    raw = json.dumps(
+        [complexity, normalize_message(message), actor_id, session_id], ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Cache LRU + TTL de respostas por sessão, thread-safe."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        """
+        Args:
+            max_entries: Número máximo de respostas em cache
+            ttl_seconds: Validade de cada entrada
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, Tuple[Tuple[str, str], CachedResponse]]" = (
+            OrderedDict()
+        )
+        # (actor_id, session_id) -> chaves da sessão (invalidação)
+        self._sessions: Dict[Tuple[str, str], Set[str]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "saved_ms": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Cria o cache a partir das variáveis RESPONSE_CACHE_* (None se desabilitado)."""
+        if os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+            return None
+        return cls(
+            max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+            ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300")),
+        )
+
+    @staticmethod
+    def is_cacheable(complexity: str) -> bool:
+        """Só TRIVIAL e INFORMATIVE podem ser servidas do cache."""
+        return complexity in CACHEABLE_COMPLEXITIES
+
+    def get(
+        self, complexity: str, message: str, actor_id: str, session_id: str
+    ) -> Optional[CachedResponse]:
+        """Retorna a resposta em cache (e contabiliza a latência economizada)."""
+        if not self.is_cacheable(complexity):
+            return None
+        key = make_response_key(complexity, message, actor_id, session_id)
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[1].expires_at <= now:
+                self._remove(key)
+                item = None
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            self._stats["saved_ms"] += item[1].generation_ms
+            return item[1]
+
+    def put(
+        self,
+        complexity: str,
+        message: str,
+        actor_id: str,
+        session_id: str,
+        response: str,
+        generation_ms: int,
+    ) -> bool:
+        """Guarda a resposta se a complexidade for cacheável."""
+        if not self.is_cacheable(complexity):
+            return False
+        key = make_response_key(complexity, message, actor_id, session_id)
+        session = (actor_id, session_id)
+        entry = CachedResponse(response, generation_ms, time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = (session, entry)
+            self._entries.move_to_end(key)
+            self._sessions.setdefault(session, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def invalidate_session(self, actor_id: str, session_id: str) -> int:
+        """Remove as respostas da sessão (chamado a cada escrita no Memory)."""
+        with self._lock:
+            keys = self._sessions.pop((actor_id, session_id), set())
+            for key in keys:
+                self._entries.pop(key, None)
+            if keys:
+                self._stats["invalidations"] += 1
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits, misses, hit rate, latência economizada e entradas."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def _remove(self, key: str) -> None:
+        session, _ = self._entries.pop(key)
+        keys = self._sessions.get(session)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._sessions[session]
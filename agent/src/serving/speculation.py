@@ -0,0 +1,139 @@
+"""
+Geração especulativa enquanto a classificação está em andamento
+
+Quando o padrão trivial não resolve a mensagem, o usuário espera o Nova Micro
+classificar antes de a geração começar. No modo especulativo
+(SPECULATIVE_GENERATION=true) o entrypoint inicia a geração no modelo de chat
+(Nova Lite) assim que o contexto do Memory chega, em paralelo com a
+classificação:
+- TRIVIAL/INFORMATIVE (mesmo modelo): a resposta especulativa é mantida
+- demais: a especulação é cancelada e a geração vai para Nova Pro/Sonnet
+
+SpeculationLedger contabiliza quantas especulações foram aproveitadas, o
+tempo economizado e o custo extra das canceladas, para calibrar o modo.
+O custo de uma especulação cancelada é estimado pelos tokens de entrada
+(~4 caracteres por token), já cobrados quando a requisição chega ao Bedrock.
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from typing import Any, Awaitable, Dict, Optional
+
+# Resultados possíveis de uma especulação
+ACCEPTED = "accepted"  # resposta especulativa usada
+CANCELLED = "cancelled"  # classificação escolheu outro modelo
+FAILED = "failed"  # especulação falhou; geração normal no modelo escolhido
+SKIPPED = "skipped"  # classificação terminou antes do contexto (nada a ganhar)
+
+
+def speculation_enabled() -> bool:
+    """Modo especulativo ligado via SPECULATIVE_GENERATION (padrão: desligado)."""
+    return os.getenv("SPECULATIVE_GENERATION", "false").lower() in ("1", "true", "yes")
+
+
+class SpeculativeGeneration:
+    """Geração iniciada antes de a classificação terminar."""
+
+    def __init__(
+        self,
+        model_id: str,
+        generation: Awaitable[Any],
+        context: Any = None,
+        input_tokens: int = 0,
+        cost_input_per_1m: float = 0.0,
+    ):
+        """
+        Args:
+            model_id: Modelo usado na especulação (modelo de chat)
+            generation: Coroutine da geração (ex.: agent.invoke_async(prompt))
+            context: Contexto usado no prompt (comparado com o da rota final)
+            input_tokens: Tokens de entrada estimados (custo se descartada)
+            cost_input_per_1m: Custo de entrada do modelo especulativo
+        """
+        self.model_id = model_id
+        self.context = context
+        self.input_tokens = input_tokens
+        self.cost_input_per_1m = cost_input_per_1m
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.task = asyncio.ensure_future(generation)
+        self.task.add_done_callback(self._finished)
+
+    def _finished(self, _task) -> None:
+        self.finished_at = time.perf_counter()
+
+    async def accept(self) -> Any:
+        """Aguarda e devolve o resultado da especulação (propaga erros)."""
+        return await self.task
+
+    async def cancel(self) -> None:
+        """Cancela a geração em andamento (sem propagar o cancelamento)."""
+        self.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await self.task
+
+
+class SpeculationLedger:
+    """Contadores thread-safe do modo especulativo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {ACCEPTED: 0, CANCELLED: 0, FAILED: 0, SKIPPED: 0}
+        self._saved_ms = 0
+        self._wasted_input_tokens = 0
+        self._extra_cost_usd = 0.0
+
+    def record(
+        self,
+        outcome: str,
+        saved_ms: int = 0,
+        wasted_input_tokens: int = 0,
+        cost_input_per_1m: float = 0.0,
+    ) -> None:
+        """
+        Registra o resultado de uma especulação.
+
+        Args:
+            outcome: ACCEPTED, CANCELLED, FAILED ou SKIPPED
+            saved_ms: Quanto antes a geração começou (especulações aceitas)
+            wasted_input_tokens: Tokens de entrada de uma geração descartada
+            cost_input_per_1m: Custo de entrada do modelo especulativo
+        """
+        with self._lock:
+            self._counts[outcome] += 1
+            self._saved_ms += saved_ms
+            self._wasted_input_tokens += wasted_input_tokens
+            self._extra_cost_usd += wasted_input_tokens * cost_input_per_1m / 1_000_000
+
+    def stats(self) -> Dict[str, Any]:
+        """Totais, taxa de acerto e custo extra acumulado."""
+        with self._lock:
+            started = sum(
+                self._counts[outcome] for outcome in (ACCEPTED, CANCELLED, FAILED)
+            )
+            return {
+                **self._counts,
+                "started": started,
+                "hit_rate": self._counts[ACCEPTED] / started if started else 0.0,
+                "saved_ms": self._saved_ms,
+                "wasted_input_tokens": self._wasted_input_tokens,
+                "extra_cost_usd": round(self._extra_cost_usd, 8),
+            }
+
+
+def saved_ms(speculation: SpeculativeGeneration, routed_at: float) -> int:
+    """Tempo de geração que correu em paralelo com a classificação."""
+    overlap_end = min(routed_at, speculation.finished_at or routed_at)
+    return max(0, int((overlap_end - speculation.started_at) * 1000))
+
+
+def outcome_metadata(
+    outcome: Optional[str], saved: int, ledger: SpeculationLedger
+) -> Optional[Dict[str, Any]]:
+    """Bloco `speculation` dos metadados da resposta (None se desligado)."""
+    if outcome is None:
+        return None
+    return {"outcome": outcome, "saved_ms": saved, "totals": ledger.stats()}
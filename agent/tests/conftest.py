@@ -0,0 +1,23 @@
+"""
+Shared fixtures for the agent test suite
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.serving.admission import AdmissionController
+from src.serving.response_cache import ResponseCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache():
+    """Give each test an empty response cache (mocked Memory never invalidates it)."""
+    with patch("src.main.response_cache", ResponseCache()) as cache:
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_admission():
+    """Give each test fresh per-model limits (AIMD state is process-wide)."""
+    with patch("src.main.admission", AdmissionController()) as controller:
+        yield controller
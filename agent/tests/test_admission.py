@@ -0,0 +1,270 @@
+"""
+Unit tests for the admission controller (serving/admission.py)
+Tests AIMD limits, the bounded queue, deadline shedding and the entrypoint
+"""
+
+import asyncio
+
+import pytest
+from botocore.exceptions import ClientError
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.metrics.registry import MetricsRegistry
+from src.serving.admission import (
+    DEADLINE,
+    DEADLINE_UNREACHABLE,
+    QUEUE_FULL,
+    AdmissionController,
+    AdmissionRejected,
+    is_throttling_error,
+)
+
+MODEL = "us.amazon.nova-pro-v1:0"
+
+
+def _throttle() -> ClientError:
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}},
+        "ConverseStream",
+    )
+
+
+class TestAdmissionController:
+    """Test suite for AdmissionController class."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create a private metrics registry."""
+        return MetricsRegistry()
+
+    def controller(self, registry, **kwargs):
+        return AdmissionController(registry=registry, **kwargs)
+
+    def test_throttling_detection(self):
+        """Test that Bedrock throttling is recognized, directly or wrapped."""
+        class ModelThrottledException(Exception):
+            pass
+
+        try:
+            try:
+                raise _throttle()
+            except ClientError as e:
+                raise RuntimeError("agent failed") from e
+        except RuntimeError as wrapped:
+            assert is_throttling_error(wrapped)
+        assert is_throttling_error(ModelThrottledException("slow down"))
+        assert not is_throttling_error(ValueError("bad input"))
+
+    def test_excess_requests_wait_in_fifo_order(self, registry):
+        """Test that requests above the limit queue and run in arrival order."""
+        controller = self.controller(registry, initial_limit=2)
+        order = []
+
+        async def generate(i):
+            async with controller.slot(MODEL) as ticket:
+                order.append(i)
+                await asyncio.sleep(0.02)
+                return ticket
+
+        async def burst():
+            return await asyncio.gather(*(generate(i) for i in range(5)))
+
+        tickets = asyncio.run(burst())
+        stats = controller.stats()[MODEL]
+
+        assert order == [0, 1, 2, 3, 4]
+        assert [t.queued for t in tickets] == [False, False, True, True, True]
+        assert tickets[-1].waited_ms >= 30
+        assert stats["peak_queue"] == 3
+        assert stats["queue_depth"]["count"] == 3
+        assert stats["in_flight"] == 0
+        assert registry.summary("model")["admission_wait"][MODEL]["count"] == 5
+
+    def test_throttling_halves_limit_once_per_burst(self, registry):
+        """Test multiplicative decrease with a cooldown between reductions."""
+        controller = self.controller(registry, initial_limit=16, cooldown_seconds=60)
+
+        async def throttled_call():
+            async with controller.slot(MODEL):
+                raise _throttle()
+
+        async def burst():
+            return await asyncio.gather(
+                *(throttled_call() for _ in range(4)), return_exceptions=True
+            )
+
+        asyncio.run(burst())
+        stats = controller.stats()[MODEL]
+
+        assert stats["limit"] == 8
+        assert stats["throttled"] == 4
+
+    def test_success_increases_limit_additively(self, registry):
+        """Test additive increase while the limit is in use."""
+        controller = self.controller(registry, initial_limit=2, max_limit=2.4)
+
+        async def busy():
+            async def call():
+                async with controller.slot(MODEL):
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(*(call() for _ in range(4)))
+
+        asyncio.run(busy())
+
+        assert 2 < controller.stats()[MODEL]["limit"] <= 2.4
+
+    def test_queue_full_sheds_immediately(self, registry):
+        """Test that a full queue rejects without waiting."""
+        controller = self.controller(registry, initial_limit=1, queue_size=1)
+
+        async def scenario():
+            first = await controller.acquire(MODEL)
+            waiting = asyncio.ensure_future(controller.acquire(MODEL))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected) as excinfo:
+                await controller.acquire(MODEL)
+            controller.release(first)
+            controller.release(await waiting)
+            return excinfo.value
+
+        rejected = asyncio.run(scenario())
+
+        assert rejected.reason == QUEUE_FULL
+        assert controller.stats()[MODEL]["shed"][QUEUE_FULL] == 1
+
+    def test_deadline_expires_in_queue(self, registry):
+        """Test that a waiter past its deadline leaves the queue."""
+        controller = self.controller(registry, initial_limit=1)
+
+        async def scenario():
+            first = await controller.acquire(MODEL)
+            with pytest.raises(AdmissionRejected) as excinfo:
+                await controller.acquire(MODEL, timeout=0.02)
+            controller.release(first)
+            return excinfo.value
+
+        rejected = asyncio.run(scenario())
+        stats = controller.stats()[MODEL]
+
+        assert rejected.reason == DEADLINE
+        assert rejected.waited_ms >= 15
+        assert stats["queued"] == 0
+        assert stats["in_flight"] == 0
+
+    def test_unreachable_deadline_sheds_up_front(self, registry):
+        """Test that the estimated wait sheds before queueing."""
+        controller = self.controller(registry, initial_limit=1, max_limit=1)
+
+        async def scenario():
+            async with controller.slot(MODEL):
+                await asyncio.sleep(0.05)  # tempo de serviço observado ≈ 50ms
+            first = await controller.acquire(MODEL)
+            with pytest.raises(AdmissionRejected) as excinfo:
+                await controller.acquire(MODEL, timeout=0.01)
+            controller.release(first)
+            return excinfo.value
+
+        rejected = asyncio.run(scenario())
+
+        assert rejected.reason == DEADLINE_UNREACHABLE
+        assert rejected.waited_ms == 0.0
+
+    def test_models_have_independent_limits(self, registry):
+        """Test that a saturated model does not block another."""
+        controller = self.controller(registry, initial_limit=1)
+
+        async def scenario():
+            first = await controller.acquire(MODEL)
+            other = await asyncio.wait_for(controller.acquire("us.amazon.nova-lite-v1:0"), 0.1)
+            controller.release(first)
+            controller.release(other)
+            return other
+
+        assert asyncio.run(scenario()).queued is False
+
+    def test_disabled_by_env(self, monkeypatch):
+        """Test that ADMISSION_ENABLED=false turns admission control off."""
+        monkeypatch.setenv("ADMISSION_ENABLED", "false")
+
+        assert AdmissionController.from_env() is None
+
+
+class TestEntrypointAdmission:
+    """Test admission control in invoke_async."""
+
+    @pytest.fixture
+    def mock_router(self):
+        with patch("src.main.router") as mock:
+            mock.route.return_value = {
+                "model_id": MODEL,
+                "complexity": "complex",
+                "use_tools": True,
+                "use_memory": False,
+                "routing_time_ms": 100,
+            }
+            yield mock
+
+    @pytest.fixture
+    def mock_agent(self):
+        with patch("src.main.get_bedrock_model", side_effect=lambda model_id: model_id), \
+                patch("src.main.Agent") as mock:
+            instance = Mock()
+            instance.invoke_async = AsyncMock(return_value="roteiro pronto")
+            mock.return_value = instance
+            yield instance
+
+    def test_admitted_request_reports_outcome(self, mock_router, mock_agent):
+        """Test that the admission result goes to the metadata."""
+        from src.main import invoke
+
+        result = invoke({"prompt": "Planeje 5 dias em Lisboa"})
+
+        assert result["response"] == "roteiro pronto"
+        assert result["metadata"]["admission"]["outcome"] == "admitted"
+        assert "admission_wait" in result["metadata"]["timings_ms"]
+
+    def test_shed_request_skips_model(self, mock_router, mock_agent, fresh_admission):
+        """Test that a shed request answers BUSY_RESPONSE without calling Bedrock."""
+        from src.main import BUSY_RESPONSE, invoke
+
+        with patch.object(
+            fresh_admission, "acquire", AsyncMock(side_effect=AdmissionRejected(MODEL, QUEUE_FULL))
+        ):
+            result = invoke({"prompt": "Planeje 5 dias em Lisboa", "deadline_ms": 500})
+
+        assert result["response"] == BUSY_RESPONSE
+        assert result["metadata"]["admission"] == {
+            "outcome": "shed",
+            "reason": QUEUE_FULL,
+            "wait_ms": 0.0,
+        }
+        mock_agent.invoke_async.assert_not_called()
+
+    def test_shed_request_is_not_written_to_memory(
+        self, mock_router, mock_agent, fresh_admission, fresh_response_cache
+    ):
+        """Test that a BUSY_RESPONSE never becomes a session turn or a cached answer."""
+        from src.main import BUSY_RESPONSE, invoke
+
+        mock_router.route.return_value = {
+            **mock_router.route.return_value,
+            "complexity": "informative",
+            "use_memory": True,
+        }
+        memory = Mock()
+        memory.is_configured.return_value = True
+        memory.fetch_context.return_value = None
+        with patch("src.main.memory", memory), patch.object(
+            fresh_admission, "acquire", AsyncMock(side_effect=AdmissionRejected(MODEL, QUEUE_FULL))
+        ):
+            result = invoke({"prompt": "Qual o fuso de Lisboa?", "session_id": "s1"})
+
+        assert result["response"] == BUSY_RESPONSE
+        assert result["metadata"]["memory_write"] == "skipped"
+        memory.add_interaction.assert_not_called()
+        assert fresh_response_cache.stats()["entries"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
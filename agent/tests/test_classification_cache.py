@@ -0,0 +1,109 @@
+"""
+Unit tests for ClassificationCache
+Tests key normalization, LRU/TTL eviction and hit/miss accounting
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from src.router.classification_cache import (
+    ClassificationCache,
+    DynamoDBCacheBackend,
+    InMemoryCacheBackend,
+    make_cache_key,
+    normalize_message,
+)
+
+
+class TestCacheKey:
+    """Test suite for message normalization and cache keys."""
+
+    def test_normalization_ignores_case_accents_and_punctuation(self):
+        """Test that near-identical messages normalize to the same text."""
+        assert normalize_message("Que horas é o voo?") == "que horas e o voo"
+        assert normalize_message("  QUE   horas e o voo  ") == "que horas e o voo"
+
+    def test_key_includes_relevant_trip_context(self):
+        """Test that trip context fields used in the prompt change the key."""
+        base = make_cache_key("Qual meu hotel?", {"status": "PLANNING"})
+
+        assert base == make_cache_key("qual meu hotel", {"status": "PLANNING"})
+        assert base != make_cache_key("Qual meu hotel?", {"status": "ONGOING"})
+
+    def test_key_ignores_irrelevant_trip_context(self):
+        """Test that fields not used in the prompt do not fragment the cache."""
+        assert make_cache_key("Qual meu hotel?", {"trip_id": "a"}) == make_cache_key(
+            "Qual meu hotel?", {"trip_id": "b"}
+        )
+
+
+class TestInMemoryCacheBackend:
+    """Test suite for the in-process backend."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        backend = InMemoryCacheBackend(max_entries=2)
+        backend.set("a", "trivial", 60)
+        backend.set("b", "complex", 60)
+        backend.get("a")
+        backend.set("c", "critical", 60)
+
+        assert backend.get("a") == "trivial"
+        assert backend.get("b") is None
+        assert len(backend) == 2
+
+    def test_ttl_expiration(self):
+        """Test that expired entries are not returned."""
+        backend = InMemoryCacheBackend()
+        with patch("src.router.classification_cache.time.monotonic", return_value=0):
+            backend.set("a", "trivial", 10)
+        with patch("src.router.classification_cache.time.monotonic", return_value=11):
+            assert backend.get("a") is None
+
+
+class TestClassificationCache:
+    """Test suite for ClassificationCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that hits and misses are counted."""
+        cache = ClassificationCache()
+
+        assert cache.get("Qual meu hotel?") is None
+        cache.put("Qual meu hotel?", None, "informative")
+        assert cache.get("qual meu hotel") == "informative"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_backend_errors_do_not_raise(self):
+        """Test that a failing shared backend degrades to a miss."""
+        backend = MagicMock()
+        backend.get.side_effect = Exception("connection refused")
+        backend.set.side_effect = Exception("connection refused")
+        cache = ClassificationCache(backend=backend)
+
+        cache.put("Oi", None, "trivial")
+        assert cache.get("Oi") is None
+        assert cache.stats()["errors"] == 2
+
+    def test_shared_backend_is_kept_and_size_unknown(self):
+        """Test that a DynamoDB backend is used as given and reports no size."""
+        backend = DynamoDBCacheBackend("router-cache")
+        backend._table = MagicMock()
+        backend._table.get_item.return_value = {}
+        cache = ClassificationCache(backend=backend)
+
+        assert cache.backend is backend
+        assert cache.get("Oi") is None
+        backend._table.get_item.assert_called_once()
+        assert cache.stats()["size"] is None
+
+    def test_from_env_disabled(self):
+        """Test that the cache can be disabled by environment variable."""
+        with patch.dict("os.environ", {"ROUTER_CACHE_ENABLED": "false"}):
+            assert ClassificationCache.from_env() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+"""
+Unit tests for ClassifierPool
+Tests agent reuse, history isolation and concurrency bounds
+"""
+
+import threading
+
+import pytest
+from unittest.mock import Mock
+from src.router.classifier_pool import ClassifierPool
+
+
+class TestClassifierPool:
+    """Test suite for ClassifierPool class."""
+
+    @pytest.fixture
+    def factory(self):
+        """Factory producing mock agents with a messages list."""
+        def build():
+            agent = Mock()
+            agent.messages = []
+            return agent
+
+        return Mock(side_effect=build)
+
+    def test_agent_is_reused(self, factory):
+        """Test that sequential leases reuse the same agent."""
+        pool = ClassifierPool(factory=factory, max_size=4)
+
+        with pool.lease() as first:
+            pass
+        with pool.lease() as second:
+            pass
+
+        assert first is second
+        assert factory.call_count == 1
+
+    def test_history_cleared_on_release(self, factory):
+        """Test that conversation history does not leak between leases."""
+        pool = ClassifierPool(factory=factory, max_size=1)
+
+        with pool.lease() as agent:
+            agent.messages.append({"role": "user", "content": [{"text": "Oi"}]})
+
+        with pool.lease() as agent:
+            assert agent.messages == []
+
+    def test_metrics_and_state_reset_on_release(self):
+        """Test that a pooled agent does not accumulate invocations, traces or state."""
+        from strands import Agent
+
+        agent = Agent(callback_handler=None)
+        pool = ClassifierPool(factory=lambda: agent, max_size=1)
+
+        for i in range(3):
+            with pool.lease() as leased:
+                leased.event_loop_metrics.agent_invocations.append(Mock())
+                leased.event_loop_metrics.traces.append(Mock())
+                leased.event_loop_metrics.accumulated_usage["inputTokens"] += 100
+                leased.state.set("turn", i)
+
+        assert agent.event_loop_metrics.agent_invocations == []
+        assert agent.event_loop_metrics.traces == []
+        assert agent.event_loop_metrics.accumulated_usage["inputTokens"] == 0
+        assert agent.state.get() == {}
+
+    def test_concurrent_leases_get_distinct_agents(self, factory):
+        """Test that concurrent callers never share an agent."""
+        pool = ClassifierPool(factory=factory, max_size=2)
+
+        with pool.lease() as first, pool.lease() as second:
+            assert first is not second
+
+        assert pool.created == 2
+
+    def test_acquire_blocks_until_release(self, factory):
+        """Test that a full pool waits for an agent instead of growing."""
+        pool = ClassifierPool(factory=factory, max_size=1)
+        agent = pool.acquire()
+        threading.Timer(0.05, pool.release, args=(agent,)).start()
+
+        assert pool.acquire() is agent
+        assert pool.created == 1
+
+    def test_acquire_timeout(self, factory):
+        """Test that acquire fails when no agent is released in time."""
+        pool = ClassifierPool(factory=factory, max_size=1, acquire_timeout=0.01)
+        pool.acquire()
+
+        with pytest.raises(TimeoutError):
+            pool.acquire()
+
+    def test_factory_error_frees_capacity(self):
+        """Test that a failed construction does not consume pool capacity."""
+        pool = ClassifierPool(factory=Mock(side_effect=Exception("boom")), max_size=1)
+
+        with pytest.raises(Exception):
+            pool.acquire()
+
+        assert pool.created == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Unit tests for the shared Memory client registry
+Tests per-region reuse, pool configuration and sharing across modules
+"""
+
+import os
+
+import pytest
+from unittest.mock import Mock, patch
+from src.memory import client_registry
+from src.memory.agentcore_memory import AgentCoreMemory
+
+
+class TestClientRegistry:
+    """Test suite for the process-wide MemoryClient registry."""
+
+    @pytest.fixture(autouse=True)
+    def clean_registry(self):
+        """Start and end every test with an empty registry."""
+        client_registry.clear_clients()
+        yield
+        client_registry.clear_clients()
+
+    def test_one_client_per_region(self):
+        """Test that clients are created once per region."""
+        with patch(
+            "src.memory.client_registry._new_memory_client", side_effect=lambda *args: Mock()
+        ) as mock_client:
+            first = client_registry.get_memory_client("us-east-1")
+            second = client_registry.get_memory_client("us-east-1")
+            other = client_registry.get_memory_client("us-west-2")
+
+        assert first is second
+        assert first is not other
+        assert mock_client.call_count == 2
+
+    def test_pool_size_applies_to_created_clients(self):
+        """Test that the shared session's clients use the configured pool size."""
+        with patch.dict(os.environ, {"MEMORY_MAX_POOL_CONNECTIONS": "48"}):
+            session = client_registry.get_boto_session("us-east-1")
+        client = session.client("bedrock-agentcore", region_name="us-east-1")
+
+        assert client.meta.config.max_pool_connections == 48
+        assert client.meta.config.tcp_keepalive is True
+
+    def test_real_client_uses_shared_session(self):
+        """Test that a real MemoryClient is built and wired to the shared pool."""
+        with patch.dict(os.environ, {"MEMORY_MAX_POOL_CONNECTIONS": "40"}):
+            client = client_registry.get_memory_client("us-east-1")
+
+        assert isinstance(client, client_registry.MemoryClient)
+        for boto_client in (client.gmcp_client, client.gmdp_client):
+            assert boto_client.meta.config.max_pool_connections == 40
+            assert boto_client.meta.config.tcp_keepalive is True
+            assert boto_client.meta.config.user_agent_extra.startswith("bedrock-agentcore")
+            assert boto_client.meta.region_name == "us-east-1"
+
+    def test_real_client_skips_default_construction(self):
+        """Test that no throwaway boto3 clients are built by MemoryClient.__init__."""
+        with patch.object(client_registry.MemoryClient, "__init__") as default_init:
+            client = client_registry.get_memory_client("us-east-1")
+
+        default_init.assert_not_called()
+        assert client.region_name == "us-east-1"
+
+    def test_memory_and_router_share_client(self):
+        """Test that AgentCoreMemory and the registry return the same client."""
+        with patch("src.memory.client_registry._new_memory_client"):
+            memory = AgentCoreMemory(memory_id="mem-test-123", region_name="us-east-1")
+
+            assert memory.client is client_registry.get_memory_client("us-east-1")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
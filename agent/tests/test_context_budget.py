@@ -0,0 +1,81 @@
+"""
+Unit tests for token-budgeted context assembly
+Tests estimation, trimming order and summary preservation
+"""
+
+import pytest
+from src.memory.context_budget import build_prompt_context, estimate_tokens
+
+
+def _messages(count, size=200):
+    return [
+        {"content": {"text": f"msg{i} " + "x" * size}, "role": "USER" if i % 2 == 0 else "ASSISTANT"}
+        for i in range(count)
+    ]
+
+
+class TestBuildPromptContext:
+    """Test suite for build_prompt_context."""
+
+    def test_estimate_tokens(self):
+        """Test the ~4 chars per token estimate."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+    def test_unlimited_budget_keeps_original_format(self):
+        """Test that without a budget the previous format is preserved."""
+        messages = [
+            {"content": {"text": "Planning Paris trip"}, "role": "USER"},
+            {"content": "Great choice!", "role": "ASSISTANT", "score": 0.5},
+        ]
+
+        context = build_prompt_context("Trip to Paris", messages)
+
+        assert context.text == (
+            "# Session Summary\nTrip to Paris\n\n"
+            "# Relevant Previous Context\n"
+            "1. [USER] Planning Paris trip (relevance: 0.00)\n"
+            "2. [ASSISTANT] Great choice! (relevance: 0.50)"
+        )
+        assert context.tokens == estimate_tokens(context.text)
+        assert context.messages_dropped == 0
+        assert context.truncated is False
+
+    def test_older_messages_are_dropped_first(self):
+        """Test that the newest messages survive a tight budget."""
+        context = build_prompt_context("Trip to Rome", _messages(6), max_tokens=150)
+
+        assert context.tokens <= 150
+        assert "Trip to Rome" in context.text
+        assert "msg5" in context.text
+        assert "msg0" not in context.text
+        assert context.messages_dropped > 0
+        assert context.truncated is True
+
+    def test_boundary_message_is_truncated(self):
+        """Test that the first message that does not fit is cut, not skipped."""
+        context = build_prompt_context(None, _messages(2, size=400), max_tokens=160)
+
+        assert context.messages_used == 2
+        assert context.text.count("…") == 1
+        assert context.tokens <= 160
+
+    def test_oversized_summary_is_truncated(self):
+        """Test that a summary larger than the budget is cut to fit."""
+        context = build_prompt_context("s" * 2000, _messages(2), max_tokens=50)
+
+        assert context.text.startswith("# Session Summary\nsss")
+        assert context.tokens <= 50
+        assert context.messages_used == 0
+
+    def test_zero_budget_returns_empty_context(self):
+        """Test that a zero budget disables the context."""
+        context = build_prompt_context("Trip", _messages(2), max_tokens=0)
+
+        assert context.text == ""
+        assert context.tokens == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
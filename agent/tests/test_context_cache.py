@@ -0,0 +1,93 @@
+"""
+Unit tests for SessionContextCache
+Tests write-through, staleness, idle and memory-cap eviction
+"""
+
+import pytest
+from unittest.mock import patch
+from src.memory.context_cache import SessionContextCache
+
+
+def _turn(text):
+    return [
+        {"content": {"text": text}, "role": "USER"},
+        {"content": {"text": f"re: {text}"}, "role": "ASSISTANT"},
+    ]
+
+
+class TestSessionContextCache:
+    """Test suite for SessionContextCache class."""
+
+    def test_miss_before_load(self):
+        """Test that unknown sessions are a miss."""
+        cache = SessionContextCache()
+
+        assert cache.get("user", "s1", 5) is None
+        assert cache.stats()["misses"] == 1
+
+    def test_load_then_hit(self):
+        """Test that loaded turns are served without a remote call."""
+        cache = SessionContextCache()
+        cache.load("user", "s1", [_turn("a"), _turn("b")], k=5)
+
+        assert cache.get("user", "s1", 5) == [_turn("a"), _turn("b")]
+        assert cache.get("user", "s1", 1) == [_turn("b")]
+        assert cache.stats()["hits"] == 2
+
+    def test_write_through_appends_to_loaded_session(self):
+        """Test that new turns are visible to the next read."""
+        cache = SessionContextCache()
+        cache.load("user", "s1", [_turn("a")], k=5)
+        cache.append("user", "s1", [_turn("b")])
+
+        assert cache.get("user", "s1", 5) == [_turn("a"), _turn("b")]
+
+    def test_write_through_ignores_unloaded_session(self):
+        """Test that a write alone does not create a partial entry."""
+        cache = SessionContextCache()
+        cache.append("user", "s1", [_turn("b")])
+
+        assert cache.get("user", "s1", 5) is None
+
+    def test_incomplete_entry_is_a_miss(self):
+        """Test that asking for more turns than known forces a refresh."""
+        cache = SessionContextCache(max_turns=2)
+        cache.load("user", "s1", [_turn("a"), _turn("b")], k=2)
+
+        assert cache.get("user", "s1", 2) is not None
+        assert cache.get("user", "s1", 5) is None
+
+    def test_stale_entry_is_refreshed(self):
+        """Test that entries older than stale_after are not served."""
+        cache = SessionContextCache(stale_after=10, idle_ttl=100)
+        with patch("src.memory.context_cache.time.monotonic", return_value=0):
+            cache.load("user", "s1", [_turn("a")], k=5)
+        with patch("src.memory.context_cache.time.monotonic", return_value=11):
+            assert cache.get("user", "s1", 5) is None
+        assert cache.stats()["stale"] == 1
+
+    def test_idle_sessions_are_evicted(self):
+        """Test that sessions without access are evicted after idle_ttl."""
+        cache = SessionContextCache(idle_ttl=10, stale_after=100)
+        with patch("src.memory.context_cache.time.monotonic", return_value=0):
+            cache.load("user", "s1", [_turn("a")], k=5)
+        with patch("src.memory.context_cache.time.monotonic", return_value=11):
+            assert cache.get("user", "s1", 5) is None
+
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["sessions"] == 0
+        assert stats["bytes"] == 0
+
+    def test_memory_cap_evicts_least_recently_used(self):
+        """Test that the byte cap evicts the oldest session first."""
+        cache = SessionContextCache(max_bytes=400)
+        cache.load("user", "s1", [_turn("a" * 100)], k=5)
+        cache.load("user", "s2", [_turn("b" * 100)], k=5)
+
+        assert cache.get("user", "s1", 5) is None
+        assert cache.get("user", "s2", 5) is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
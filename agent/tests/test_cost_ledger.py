@@ -0,0 +1,148 @@
+"""
+Unit tests for per-request cost accounting (usage_cost, CostLedger)
+"""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.metrics.cost_ledger import CostLedger
+from src.router.usage import usage_cost
+
+NOVA_PRO = ("us.amazon.nova-pro-v1:0", 0.80, 3.20, 0.20)
+
+
+def _usage(input_tokens=0, output_tokens=0, cache_read=0, cache_write=0):
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_read_input_tokens": cache_read,
+        "cache_write_input_tokens": cache_write,
+    }
+
+
+class TestUsageCost:
+    """Test pricing of a single invocation."""
+
+    def test_cache_reads_use_discounted_price(self):
+        """Test that cache reads and writes are priced separately from input."""
+        cost = usage_cost(_usage(1000, 200, cache_read=4000, cache_write=500), 0.06, 0.24, 0.015)
+
+        assert cost == pytest.approx((1500 * 0.06 + 4000 * 0.015 + 200 * 0.24) / 1_000_000)
+
+    def test_no_call_costs_nothing(self):
+        """Test that pattern/cache classifications (usage None) cost zero."""
+        assert usage_cost(None, 0.035, 0.14) == 0.0
+
+
+class TestCostLedger:
+    """Test rolling totals per actor and per model."""
+
+    def test_totals_per_actor_and_model(self):
+        """Test that one request feeds both the actor and the model views."""
+        ledger = CostLedger()
+        ledger.record("ana", "nova-lite", _usage(1000, 100), 0.00008, _usage(300, 1), 0.00001)
+        ledger.record("ana", "nova-pro", _usage(2000, 500), 0.0032)
+        ledger.record("bruno", "nova-lite", _usage(500, 50), 0.00004)
+
+        report = ledger.snapshot()
+
+        assert report["total"]["requests"] == 3
+        assert report["by_actor"]["ana"]["requests"] == 2
+        assert report["by_actor"]["ana"]["cost_usd"] == pytest.approx(0.00329)
+        assert report["by_model"]["nova-lite"]["input_tokens"] == 1500
+        assert report["by_model"]["nova-lite"]["classification_input_tokens"] == 300
+        assert report["total"]["cost_usd"] == pytest.approx(0.00333)
+
+    def test_baseline_savings(self):
+        """Test the comparison against generating every answer on Nova Pro."""
+        ledger = CostLedger()
+        usage = _usage(1_000_000, 100_000)
+        lite_cost = usage_cost(usage, 0.06, 0.24)
+        ledger.record("ana", "nova-lite", usage, lite_cost)
+
+        baseline = ledger.snapshot(baseline=NOVA_PRO)["baseline"]
+
+        assert baseline["cost_usd"] == pytest.approx(0.80 + 0.32)
+        assert baseline["savings_pct"] == pytest.approx((1 - lite_cost / 1.12) * 100, abs=0.1)
+
+    def test_baseline_savings_include_cache_writes(self):
+        """Test that cache writes are priced on both sides of savings_pct."""
+        ledger = CostLedger()
+        usage = _usage(200_000, 100_000, cache_read=300_000, cache_write=500_000)
+        lite_cost = usage_cost(usage, 0.06, 0.24, 0.015)
+        ledger.record("ana", "nova-lite", usage, lite_cost)
+
+        report = ledger.snapshot(baseline=NOVA_PRO)
+        baseline = report["baseline"]
+
+        assert report["total"]["cache_write_input_tokens"] == 500_000
+        pro_cost = 0.7 * 0.80 + 0.3 * 0.20 + 0.1 * 3.20
+        assert baseline["cost_usd"] == pytest.approx(pro_cost)
+        assert baseline["savings_pct"] == pytest.approx((1 - lite_cost / pro_cost) * 100, abs=0.1)
+
+    def test_old_buckets_leave_the_window(self, monkeypatch):
+        """Test that requests older than the window are dropped."""
+        ledger = CostLedger(window_seconds=120)
+        clock = Mock(return_value=1_000_000.0)
+        monkeypatch.setattr("src.metrics.cost_ledger.time.time", clock)
+        ledger.record("ana", "nova-lite", _usage(100, 10), 0.00001)
+
+        clock.return_value += 600
+        ledger.record("ana", "nova-lite", _usage(100, 10), 0.00001)
+
+        assert ledger.snapshot()["total"]["requests"] == 1
+
+    def test_dump_writes_json(self, tmp_path):
+        """Test that the ledger can be dumped on demand."""
+        ledger = CostLedger()
+        ledger.record("ana", "nova-lite", _usage(100, 10), 0.00001)
+        path = tmp_path / "costs.json"
+
+        ledger.dump(str(path), baseline=NOVA_PRO)
+
+        report = json.loads(path.read_text())
+        assert report["by_actor"]["ana"]["requests"] == 1
+        assert report["baseline"]["model_id"] == "us.amazon.nova-pro-v1:0"
+
+
+class TestInvokeCost:
+    """Test the cost reported by the entrypoint."""
+
+    def test_metadata_and_ledger(self):
+        """Test that classifier and agent costs are summed and recorded."""
+        from src.main import invoke
+
+        ledger = CostLedger()
+        agent_result = Mock()
+        agent_result.__str__ = Mock(return_value="Roteiro pronto")
+        agent_result.metrics.agent_invocations = [
+            Mock(usage={"inputTokens": 2000, "outputTokens": 500})
+        ]
+        with patch("src.main.cost_ledger", ledger), \
+                patch("src.main.memory", None), \
+                patch("src.main.router") as mock_router, \
+                patch("src.main.get_bedrock_model"), \
+                patch("src.main.Agent") as mock_agent:
+            mock_router.route.return_value = {
+                "model_id": "us.amazon.nova-pro-v1:0",
+                "complexity": "complex",
+                "use_tools": True,
+                "use_memory": True,
+                "routing_time_ms": 150,
+                "cost_input_per_1m": 0.80,
+                "cost_output_per_1m": 3.20,
+                "classification_usage": _usage(400, 1),
+                "classification_cost_usd": 0.0000141,
+            }
+            mock_agent.return_value.invoke_async = AsyncMock(return_value=agent_result)
+
+            result = invoke({"prompt": "Planeje 3 dias em Roma", "actor_id": "ana"})
+
+        cost = result["metadata"]["cost_usd"]
+        assert cost["generation"] == pytest.approx((2000 * 0.80 + 500 * 3.20) / 1_000_000)
+        assert cost["total"] == pytest.approx(cost["generation"] + 0.0000141)
+        report = ledger.snapshot()
+        assert report["by_actor"]["ana"]["cost_usd"] == pytest.approx(cost["total"])
+        assert report["by_model"]["us.amazon.nova-pro-v1:0"]["output_tokens"] == 500
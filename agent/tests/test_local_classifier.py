@@ -0,0 +1,91 @@
+"""
+Unit tests for LocalClassifier
+Tests training, confidence threshold, persistence and router integration
+"""
+
+import json
+
+import pytest
+from unittest.mock import patch
+from src.router.agent_router import AgentRouter
+from src.router.local_classifier import LocalClassifier
+
+TRAINING_DATA = [
+    ("Planeje 3 dias em Roma", "complex"),
+    ("Planeje um roteiro em Lisboa", "complex"),
+    ("Monte um roteiro de 5 dias em Paris", "complex"),
+    ("Qual meu hotel em Roma?", "informative"),
+    ("Qual o horário do voo?", "informative"),
+    ("Qual o endereço do hotel?", "informative"),
+    ("Revise meu contrato de seguro", "critical"),
+    ("Preciso cancelar minha reserva urgente", "critical"),
+]
+
+
+class TestLocalClassifier:
+    """Test suite for LocalClassifier class."""
+
+    @pytest.fixture
+    def classifier(self):
+        """Train a small classifier for tests."""
+        return LocalClassifier.train(TRAINING_DATA, threshold=0.8)
+
+    def test_predict_known_vocabulary(self, classifier):
+        """Test that messages close to the training data are classified."""
+        label, confidence = classifier.predict("Planeje 2 dias em Roma")
+
+        assert label == "complex"
+        assert confidence >= 0.8
+
+    def test_unknown_vocabulary_has_zero_confidence(self, classifier):
+        """Test that unseen messages never short-circuit the LLM."""
+        assert classifier.predict("xyz abc") == ("informative", 0.0)
+        assert classifier.classify("xyz abc") is None
+
+    def test_save_and_load(self, classifier, tmp_path):
+        """Test that a trained model round-trips through JSON."""
+        path = tmp_path / "model.json"
+        classifier.save(str(path))
+
+        loaded = LocalClassifier.load(str(path), threshold=0.5)
+        assert loaded.threshold == 0.5
+        assert loaded.predict("Qual meu hotel?") == classifier.predict("Qual meu hotel?")
+
+    def test_train_requires_labeled_records(self):
+        """Test that training fails without valid labels."""
+        with pytest.raises(ValueError):
+            LocalClassifier.train([("Analise este documento", "vision")])
+
+
+class TestRouterWithLocalClassifier:
+    """Test AgentRouter integration with the local classifier stage."""
+
+    @patch('src.router.agent_router.Agent')
+    def test_confident_local_decision_skips_llm(self, mock_agent_class):
+        """Test that a confident local decision avoids the Nova Micro call."""
+        router = AgentRouter(
+            local_classifier=LocalClassifier.train(TRAINING_DATA, threshold=0.8)
+        )
+
+        config = router.route(user_message="Planeje 2 dias em Roma")
+
+        assert config['complexity'] == 'complex'
+        assert config['classification_source'] == 'local'
+        assert config['classification_confidence'] >= 0.8
+        mock_agent_class.assert_not_called()
+
+    def test_decisions_are_logged(self, tmp_path):
+        """Test that route() appends decisions to the JSONL log."""
+        log_path = tmp_path / "decisions.jsonl"
+        router = AgentRouter(decision_log_path=str(log_path))
+
+        router.route(user_message="Oi!")
+
+        record = json.loads(log_path.read_text(encoding="utf-8"))
+        assert record["message"] == "Oi!"
+        assert record["complexity"] == "trivial"
+        assert record["source"] == "pattern"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
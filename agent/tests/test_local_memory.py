@@ -0,0 +1,136 @@
+"""
+Unit tests for LocalMemoryClient
+Tests the MemoryClient-compatible API, fault injection and backend selection
+"""
+
+import os
+
+import pytest
+from botocore.exceptions import ClientError
+from unittest.mock import patch
+from src.memory import client_registry
+from src.memory.agentcore_memory import AgentCoreMemory, create_memory_if_not_exists
+from src.memory.local_client import LocalMemoryClient
+
+
+class TestLocalMemoryClient:
+    """Test suite for LocalMemoryClient class."""
+
+    @pytest.fixture
+    def client(self):
+        """Create an in-memory local client."""
+        client = LocalMemoryClient()
+        yield client
+        client.close()
+
+    def test_last_k_turns_in_order(self, client):
+        """Test that turns come back oldest first and grouped by user message."""
+        for i in range(3):
+            client.create_event(
+                "mem", "user", "s1", [(f"pergunta {i}", "USER"), (f"resposta {i}", "ASSISTANT")]
+            )
+        client.create_event("mem", "user", "other", [("outra sessão", "USER")])
+
+        turns = client.get_last_k_turns("mem", "user", "s1", k=2)
+
+        assert [[m["content"]["text"] for m in turn] for turn in turns] == [
+            ["pergunta 1", "resposta 1"],
+            ["pergunta 2", "resposta 2"],
+        ]
+        assert turns[0][0]["role"] == "USER"
+
+    def test_summary_record_tracks_session(self, client):
+        """Test that the summary strategy keeps a session summary record."""
+        client.create_event("mem", "user", "s1", [("Quero ir a Paris", "USER")])
+        client.create_event("mem", "user", "s1", [("E Roma?", "USER")])
+
+        records = client.retrieve_memories("mem", namespace="/summaries/user/s1")
+
+        assert len(records) == 1
+        assert "Paris" in records[0]["content"]["text"]
+        assert "Roma" in records[0]["content"]["text"]
+        assert client.retrieve_memories("mem", namespace="/summaries/user/s2") == []
+
+    def test_create_and_list_memories(self, client):
+        """Test the control plane used by create_memory_if_not_exists."""
+        memory = client.create_memory_and_wait(name="n-agent-memory", strategies=[])
+
+        listed = client.list_memories()
+
+        assert memory["status"] == "ACTIVE"
+        assert [m["id"] for m in listed] == [memory["id"]]
+        assert client.get_memory_strategies(memory["id"]) == []
+
+    def test_fault_injection_raises_throttling(self):
+        """Test that injected faults look like a throttled service call."""
+        client = LocalMemoryClient(fault_rate=1.0, seed=1)
+
+        with pytest.raises(ClientError) as excinfo:
+            client.get_last_k_turns("mem", "user", "s1")
+
+        assert excinfo.value.response["Error"]["Code"] == "ThrottlingException"
+        assert client.stats == {"calls": 1, "faults": 1}
+
+    def test_injected_latency(self):
+        """Test that every call waits for the injected latency."""
+        client = LocalMemoryClient(latency_fn=lambda: 0.25)
+
+        with patch("src.memory.local_client.time.sleep") as sleep:
+            client.list_memories()
+
+        sleep.assert_called_once_with(0.25)
+
+    def test_file_database_persists(self, tmp_path):
+        """Test that events survive a new client on the same file."""
+        path = str(tmp_path / "memory.db")
+        first = LocalMemoryClient(db_path=path)
+        first.create_event("mem", "user", "s1", [("Oi", "USER")])
+        first.close()
+
+        second = LocalMemoryClient(db_path=path)
+
+        assert len(second.get_last_k_turns("mem", "user", "s1")) == 1
+        second.close()
+
+
+class TestLocalBackendSelection:
+    """Test suite for AGENTCORE_MEMORY_BACKEND=local."""
+
+    @pytest.fixture(autouse=True)
+    def local_backend(self):
+        """Select the local backend with a clean registry."""
+        client_registry.clear_clients()
+        with patch.dict(os.environ, {"AGENTCORE_MEMORY_BACKEND": "local"}):
+            yield
+        client_registry.clear_clients()
+
+    def test_registry_returns_shared_local_client(self):
+        """Test that every region shares one local client and no MemoryClient is built."""
+        with patch("src.memory.client_registry._new_memory_client") as mock_client:
+            first = client_registry.get_memory_client("us-east-1")
+            other = client_registry.get_memory_client("us-west-2")
+
+        assert isinstance(first, LocalMemoryClient)
+        assert first is other
+        mock_client.assert_not_called()
+
+    def test_agentcore_memory_round_trip(self):
+        """Test AgentCoreMemory end to end on the local backend."""
+        memory = AgentCoreMemory(memory_id="local-memory", region_name="us-east-1")
+
+        memory.add_interaction("user", "s1", "Quero ir a Lisboa", "Ótima escolha!")
+        context = memory.fetch_context("user", "s1", "E o Porto?")
+
+        assert [t["content"] for t in context.turns] == ["Quero ir a Lisboa", "Ótima escolha!"]
+        assert "Lisboa" in context.summary
+
+    def test_create_memory_if_not_exists_reuses_memory(self):
+        """Test that the memory is created once and then found by name."""
+        first = create_memory_if_not_exists("n-agent-memory")
+        second = create_memory_if_not_exists("n-agent-memory")
+
+        assert first == second
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
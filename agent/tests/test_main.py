@@ -4,8 +4,9 @@ Tests BedrockAgentCoreApp entrypoint and integration
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from src.main import invoke
+from src.memory.agentcore_memory import MemoryContext
 from src.router.agent_router import QueryComplexity
 
 
@@ -200,5 +201,337 @@ class TestMainEntrypoint:
         assert 'nova-pro' in result['metadata']['routing']['model_id']
 
 
+class TestStartupMode:
+    """Test deferred imports and background warm-up."""
+
+    def test_import_does_not_load_heavy_modules(self):
+        """Test that importing main leaves Strands and Memory for first use."""
+        import os
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, src.main; "
+            "print(any(m == 'strands' or m.startswith('bedrock_agentcore.memory') "
+            "for m in sys.modules))"
+        )
+        env = {k: v for k, v in os.environ.items() if k != "STARTUP_MODE"}
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env, capture_output=True, text=True, check=True,
+        )
+        assert out.stdout.strip().splitlines()[-1] == "False"
+
+    def test_router_is_created_on_first_use(self):
+        """Test that get_router() builds the router once."""
+        from src import main
+
+        with patch('src.main.router', None), \
+                patch('src.router.agent_router.AgentRouter') as mock_router_class:
+            first = main.get_router()
+            second = main.get_router()
+
+        mock_router_class.assert_called_once_with(region_name=main.REGION)
+        assert first is second
+
+    def test_warm_mode_warms_in_background(self):
+        """Test that the app lifespan starts warm-up without blocking."""
+        import asyncio
+        from src import main
+
+        async def run_lifespan():
+            async with main._lifespan(main.app):
+                pass
+
+        with patch('src.main.STARTUP_MODE', 'warm'), \
+                patch('src.main.MetricsExporter'), \
+                patch('src.main.threading.Thread') as mock_thread:
+            asyncio.run(run_lifespan())
+
+        assert mock_thread.call_args[1]['target'] is main.warm_up
+        mock_thread.return_value.start.assert_called_once()
+
+
+
+class TestMainWithMemory:
+    """Test main.py integration with Memory."""
+
+    @pytest.fixture
+    def mock_router(self):
+        """Mock router for tests."""
+        with patch("src.main.router") as mock:
+            mock.route.return_value = {
+                "model_id": "us.amazon.nova-lite-v1:0",
+                "complexity": "informative",
+                "use_tools": False,
+                "use_memory": True,
+                "routing_time_ms": 50,
+            }
+            yield mock
+
+    @pytest.fixture
+    def mock_agent(self):
+        """Mock Strands Agent."""
+        with patch("src.main.Agent") as mock:
+            instance = Mock()
+            instance.return_value = "Test response from agent"
+            instance.invoke_async = AsyncMock(return_value="Test response from agent")
+            mock.return_value = instance
+            yield mock
+
+    @pytest.fixture
+    def mock_memory_module(self):
+        """Mock the memory module."""
+        with patch("src.main.memory") as mock:
+            mock.is_configured.return_value = True
+            mock.fetch_context.return_value = MemoryContext(summary="Previous context...")
+            mock.add_interaction.return_value = None
+            yield mock
+
+    def test_invoke_uses_memory_context(
+        self, mock_router, mock_agent, mock_memory_module
+    ):
+        """Test that invoke retrieves and uses memory context."""
+        from src.main import invoke
+
+        payload = {"prompt": "What about the Eiffel Tower?"}
+        context = Mock()
+        context.session_id = "test-session"
+        context.headers = {}
+
+        result = invoke(payload, context)
+
+        # Verify memory was queried for context
+        mock_memory_module.fetch_context.assert_called_once()
+
+        # Verify response structure
+        assert "response" in result
+        assert result["response"] == "Test response from agent"
+        assert result["metadata"]["memory_enabled"] is True
+        assert result["metadata"]["memory_context_used"] is True
+
+    def test_invoke_saves_to_memory(self, mock_router, mock_agent, mock_memory_module):
+        """Test that invoke saves interaction to memory."""
+        from src.main import invoke
+
+        payload = {"prompt": "Hello!"}
+        context = Mock()
+        context.session_id = "test-session"
+        context.headers = {"X-Amzn-Bedrock-AgentCore-Runtime-Custom-Actor-Id": "user1"}
+
+        invoke(payload, context)
+
+        # Verify interaction was saved
+        mock_memory_module.add_interaction.assert_called_once()
+        call_kwargs = mock_memory_module.add_interaction.call_args[1]
+        assert call_kwargs["actor_id"] == "user1"
+        assert call_kwargs["session_id"] == "test-session"
+        assert call_kwargs["user_message"] == "Hello!"
+
+    def test_invoke_discards_context_when_memory_not_needed(
+        self, mock_router, mock_agent, mock_memory_module
+    ):
+        """Test that context fetched in parallel is dropped when use_memory=False."""
+        from src.main import invoke
+
+        mock_router.route.return_value = {
+            **mock_router.route.return_value,
+            "complexity": "trivial",
+            "use_memory": False,
+        }
+
+        result = invoke({"prompt": "👍"}, None)
+
+        mock_memory_module.fetch_context.assert_called_once()
+        system_prompt = mock_agent.call_args[1]["system_prompt"]
+        assert "Previous context..." not in system_prompt
+        assert result["metadata"]["memory_context_used"] is False
+
+    def test_routing_and_context_overlap(self, mock_router, mock_agent, mock_memory_module):
+        """Test that classification and memory retrieval run concurrently."""
+        import threading
+        from src.main import invoke
+
+        # Each call waits for the other one: run in sequence, the barrier breaks
+        both_running = threading.Barrier(2, timeout=5)
+
+        def route(**kwargs):
+            both_running.wait()
+            return mock_router.route.return_value
+
+        def fetch_context(**kwargs):
+            both_running.wait()
+            return MemoryContext(summary="Previous context...")
+
+        mock_router.route.side_effect = route
+        mock_memory_module.fetch_context.side_effect = fetch_context
+
+        result = invoke({"prompt": "Qual meu hotel?"}, None)
+
+        assert not both_running.broken
+        assert result["metadata"]["memory_context_used"] is True
+        timings = result["metadata"]["timings_ms"]
+        assert {"routing", "memory_context", "generation", "memory_write", "total"} <= set(
+            timings
+        )
+
+    def test_context_is_trimmed_to_model_budget(
+        self, mock_router, mock_agent, mock_memory_module
+    ):
+        """Test that the context respects the routed model's token budget."""
+        from src.main import invoke
+
+        mock_router.route.return_value = {
+            **mock_router.route.return_value,
+            "context_budget_tokens": 200,
+        }
+        mock_memory_module.fetch_context.return_value = MemoryContext(
+            summary="Trip to Paris",
+            turns=[
+                {"content": {"text": f"message {i} " + "x" * 400}, "role": "USER"}
+                for i in range(5)
+            ],
+        )
+
+        result = invoke({"prompt": "E o hotel?"}, None)
+
+        metadata = result["metadata"]
+        assert 0 < metadata["context_tokens"] <= 200
+        assert metadata["context_truncated"] is True
+        system_prompt = mock_agent.call_args[1]["system_prompt"]
+        assert "Trip to Paris" in system_prompt
+        assert "message 4" in system_prompt
+        assert "message 0" not in system_prompt
+
+    def test_bedrock_model_is_cached_per_model_id(self, mock_agent):
+        """Test that the model client is built once per model_id."""
+        from src import main
+
+        with patch("src.main.BedrockModel") as mock_model, patch.dict(main._models, clear=True):
+            main.get_strands_agent("us.amazon.nova-lite-v1:0", context="ctx 1")
+            main.get_strands_agent("us.amazon.nova-lite-v1:0", context="ctx 2")
+            main.get_strands_agent("us.amazon.nova-pro-v1:0")
+
+        assert mock_model.call_count == 2
+        prompts = [c[1]["system_prompt"] for c in mock_agent.call_args_list]
+        assert all(p.startswith(main.PERSONA_PROMPT) for p in prompts)
+        assert "ctx 2" in prompts[1]
+        assert prompts[2] == main.PERSONA_PROMPT
+
+    def test_prompt_cache_checkpoint_and_usage(
+        self, mock_router, mock_agent, mock_memory_module
+    ):
+        """Test that enable_cache adds a cache point and usage is reported."""
+        from src.main import PERSONA_PROMPT, invoke
+
+        mock_router.route.return_value = {
+            **mock_router.route.return_value,
+            "enable_cache": True,
+        }
+        response = MagicMock()
+        response.__str__.return_value = "Resposta"
+        response.metrics.agent_invocations = [
+            Mock(
+                usage={
+                    "inputTokens": 50,
+                    "outputTokens": 20,
+                    "cacheReadInputTokens": 400,
+                    "cacheWriteInputTokens": 0,
+                }
+            )
+        ]
+        mock_agent.return_value.invoke_async = AsyncMock(return_value=response)
+
+        result = invoke({"prompt": "Qual meu hotel?"}, None)
+
+        system_prompt = mock_agent.call_args[1]["system_prompt"]
+        assert system_prompt[0] == {"text": PERSONA_PROMPT}
+        assert system_prompt[1] == {"cachePoint": {"type": "default"}}
+        assert "Previous context..." in system_prompt[2]["text"]
+        usage = result["metadata"]["usage"]["generation"]
+        assert usage["cache_read_input_tokens"] == 400
+        assert usage["input_tokens"] == 50
+
+    def test_stream_yields_chunks_then_metadata(
+        self, mock_router, mock_agent, mock_memory_module
+    ):
+        """Test that stream=True yields text chunks before the final metadata."""
+        from src.main import invoke
+
+        async def stream_async(prompt):
+            for text in ["Seu hotel ", "é o ", "Hotel Roma."]:
+                yield {"data": text}
+            yield {"result": "Seu hotel é o Hotel Roma."}
+
+        mock_agent.return_value.stream_async = stream_async
+
+        events = invoke({"prompt": "Qual meu hotel?", "stream": True}, None)
+
+        assert [e["data"] for e in events[:-1]] == ["Seu hotel ", "é o ", "Hotel Roma."]
+        assert events[-1]["type"] == "done"
+        metadata = events[-1]["metadata"]
+        assert "first_token" in metadata["timings_ms"]
+        # Interação completa é salva no Memory ao final do stream
+        call_kwargs = mock_memory_module.add_interaction.call_args[1]
+        assert call_kwargs["agent_response"] == "Seu hotel é o Hotel Roma."
+
+    def test_concurrent_invocations_do_not_cross_talk(
+        self, mock_router, mock_agent, mock_memory_module
+    ):
+        """Test that parallel requests keep prompt, context and writes per session."""
+        import asyncio
+        from src.main import invoke_async
+
+        def echo_agent(model, system_prompt):
+            instance = Mock()
+            instance.invoke_async = AsyncMock(
+                side_effect=lambda message: f"{message} :: {system_prompt}"
+            )
+            return instance
+
+        def session_context(actor_id, session_id, **kwargs):
+            return MemoryContext(summary=f"resumo de {session_id}")
+
+        mock_agent.side_effect = echo_agent
+        mock_memory_module.fetch_context.side_effect = session_context
+
+        async def run_all():
+            return await asyncio.gather(
+                *(
+                    invoke_async(
+                        {"prompt": f"pergunta {i}", "session_id": f"s{i}", "actor_id": f"u{i}"}
+                    )
+                    for i in range(20)
+                )
+            )
+
+        results = asyncio.run(run_all())
+
+        for i, result in enumerate(results):
+            prompt, system_prompt = result["response"].split(" :: ")
+            assert prompt == f"pergunta {i}"
+            assert f"resumo de s{i}\n" in system_prompt
+            assert result["metadata"]["session_id"] == f"s{i}"
+        routed = {call.kwargs["user_message"] for call in mock_router.route.call_args_list}
+        assert routed == {f"pergunta {i}" for i in range(20)}
+        written = {
+            (call.kwargs["session_id"], call.kwargs["user_message"])
+            for call in mock_memory_module.add_interaction.call_args_list
+        }
+        assert written == {(f"s{i}", f"pergunta {i}") for i in range(20)}
+
+    @patch("src.main.memory", None)
+    def test_invoke_works_without_memory(self, mock_router, mock_agent):
+        """Test that invoke works gracefully without memory configured."""
+        from src.main import invoke
+
+        payload = {"prompt": "Hello!"}
+
+        result = invoke(payload, None)
+
+        assert "response" in result
+        assert result["metadata"]["memory_enabled"] is False
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
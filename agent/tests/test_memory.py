@@ -1,13 +1,15 @@
 """
 Unit tests for AgentCore Memory integration.
 
-Tests the Memory wrapper and its integration with the main entrypoint.
+Tests the Memory wrapper and its background write queue.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 import os
 
+from src.memory.client_registry import clear_clients
+
 
 class TestAgentCoreMemory:
     """Test suite for AgentCoreMemory class."""
@@ -15,10 +17,14 @@ class TestAgentCoreMemory:
     @pytest.fixture
     def mock_memory_client(self):
         """Create mock MemoryClient."""
-        with patch("src.memory.agentcore_memory.MemoryClient") as mock:
+        with patch("src.memory.client_registry._new_memory_client") as mock, patch(
+            "src.memory.client_registry.get_boto_session"
+        ):
+            clear_clients()
             client_instance = Mock()
             mock.return_value = client_instance
             yield client_instance
+        clear_clients()
 
     def test_memory_init_with_env_var(self, mock_memory_client):
         """Test Memory initialization with environment variable."""
@@ -70,6 +76,24 @@ class TestAgentCoreMemory:
         assert call_kwargs["messages"][0] == ("Olá!", "USER")
         assert call_kwargs["messages"][1] == ("Olá! Como posso ajudar?", "ASSISTANT")
 
+    def test_add_interaction_in_background(self, mock_memory_client):
+        """Test that background writes reach create_event after flush."""
+        from src.memory.agentcore_memory import AgentCoreMemory
+
+        memory = AgentCoreMemory(memory_id="mem-test-123")
+        queued = memory.add_interaction(
+            actor_id="user123",
+            session_id="session-abc",
+            user_message="Olá!",
+            agent_response="Olá! Como posso ajudar?",
+            background=True,
+        )
+
+        assert queued is True
+        assert memory.flush(timeout=2) is True
+        mock_memory_client.create_event.assert_called_once()
+        assert memory.write_stats()["written"] == 1
+
     def test_add_interaction_when_not_configured(self, mock_memory_client, capsys):
         """Test add_interaction gracefully skips when not configured."""
         with patch.dict(os.environ, {}, clear=True):
@@ -159,6 +183,116 @@ class TestAgentCoreMemory:
         assert "Planning Paris trip" in context
         assert "1.00" in context  # Score formatted (now always 1.0)
 
+    def test_record_summary_is_text_and_fits_budget(self, mock_memory_client):
+        """Test that a {"text": ...} summary record becomes text and can be truncated."""
+        from src.memory.agentcore_memory import AgentCoreMemory
+
+        mock_memory_client.get_last_k_turns.return_value = []
+        mock_memory_client.retrieve_memories.return_value = [
+            {"content": {"text": "x" * 4000}}
+        ]
+
+        memory = AgentCoreMemory(memory_id="mem-test-123")
+        assert memory.get_session_summary("user123", "session-abc") == "x" * 4000
+
+        context = memory.format_context_for_prompt(
+            actor_id="user123",
+            session_id="session-abc",
+            current_query="E o hotel?",
+            max_tokens=100,
+        )
+
+        assert context.startswith("# Session Summary\nxxx")
+        assert len(context) < 4000
+
+    def test_summary_and_turns_fetched_concurrently(self, mock_memory_client):
+        """Test that summary and last turns are requested in parallel."""
+        import threading
+        from src.memory.agentcore_memory import AgentCoreMemory
+
+        # Each call waits for the other one: fetched in sequence, the barrier breaks
+        both_running = threading.Barrier(2, timeout=5)
+
+        def turns(**kwargs):
+            both_running.wait()
+            return [[{"content": "Planning Paris trip", "role": "USER"}]]
+
+        def summary(**kwargs):
+            both_running.wait()
+            return [{"content": "User is planning Paris"}]
+
+        mock_memory_client.get_last_k_turns.side_effect = turns
+        mock_memory_client.retrieve_memories.side_effect = summary
+
+        memory = AgentCoreMemory(memory_id="mem-test-123")
+        context = memory.format_context_for_prompt(
+            actor_id="user123",
+            session_id="session-abc",
+            current_query="What about the Eiffel Tower?",
+        )
+
+        assert not both_running.broken
+        assert "User is planning Paris" in context
+        assert "Planning Paris trip" in context
+
+    def test_fetch_context_degrades_on_timeout(self, mock_memory_client):
+        """Test that a slow call is dropped and the other part is kept."""
+        import time
+        from src.memory.agentcore_memory import AgentCoreMemory
+
+        def slow_summary(**kwargs):
+            time.sleep(0.5)
+            return [{"content": "late summary"}]
+
+        mock_memory_client.retrieve_memories.side_effect = slow_summary
+        mock_memory_client.get_last_k_turns.return_value = [
+            [{"content": "Planning Paris trip", "role": "USER"}],
+        ]
+
+        memory = AgentCoreMemory(memory_id="mem-test-123")
+        context = memory.fetch_context(
+            actor_id="user123",
+            session_id="session-abc",
+            current_query="test",
+            timeout=0.1,
+        )
+
+        assert context.summary is None
+        assert context.turns[0]["content"] == "Planning Paris trip"
+        assert context.missing == ["summary"]
+        # Timed-out part reports the time waited for it
+        assert context.timings_ms["summary"] >= 100
+        assert context.timings_ms["turns"] < context.timings_ms["summary"]
+
+    def test_retrieve_context_served_from_session_cache(self, mock_memory_client):
+        """Test that the turn written by this process is read back without a remote call."""
+        from src.memory.agentcore_memory import AgentCoreMemory
+
+        mock_memory_client.get_last_k_turns.return_value = [
+            [
+                {"content": {"text": "Planning Paris trip"}, "role": "USER"},
+                {"content": {"text": "Great choice!"}, "role": "ASSISTANT"},
+            ],
+        ]
+
+        memory = AgentCoreMemory(memory_id="mem-test-123")
+        memory.retrieve_context("user123", "session-abc", "query")
+        memory.add_interaction(
+            actor_id="user123",
+            session_id="session-abc",
+            user_message="E o hotel?",
+            agent_response="Hotel Lutetia",
+        )
+        result = memory.retrieve_context("user123", "session-abc", "query")
+
+        mock_memory_client.get_last_k_turns.assert_called_once()
+        assert [m["content"] for m in result] == [
+            "Planning Paris trip",
+            "Great choice!",
+            "E o hotel?",
+            "Hotel Lutetia",
+        ]
+
     def test_add_conversation_batch(self, mock_memory_client):
         """Test add_conversation with multiple messages."""
         from src.memory.agentcore_memory import AgentCoreMemory
@@ -183,86 +317,95 @@ class TestAgentCoreMemory:
         assert len(call_kwargs["messages"]) == 4
 
 
-class TestMainWithMemory:
-    """Test main.py integration with Memory."""
-
-    @pytest.fixture
-    def mock_router(self):
-        """Mock router for tests."""
-        with patch("src.main.router") as mock:
-            mock.route.return_value = {
-                "model_id": "us.amazon.nova-lite-v1:0",
-                "complexity": "informative",
-                "use_tools": False,
-                "use_memory": True,
-                "routing_time_ms": 50,
-            }
-            yield mock
+class TestBackgroundWriter:
+    """Test suite for the background Memory write queue."""
 
-    @pytest.fixture
-    def mock_agent(self):
-        """Mock Strands Agent."""
-        with patch("src.main.Agent") as mock:
-            instance = Mock()
-            instance.return_value = "Test response from agent"
-            mock.return_value = instance
-            yield mock
+    def test_retries_retryable_errors(self):
+        """Test that throttling errors are retried with backoff."""
+        from botocore.exceptions import ClientError
+        from src.memory.agentcore_memory import BackgroundWriter
 
-    @pytest.fixture
-    def mock_memory_module(self):
-        """Mock the memory module."""
-        with patch("src.main.memory") as mock:
-            mock.is_configured.return_value = True
-            mock.format_context_for_prompt.return_value = "Previous context..."
-            mock.add_interaction.return_value = None
-            yield mock
-
-    def test_invoke_uses_memory_context(
-        self, mock_router, mock_agent, mock_memory_module
-    ):
-        """Test that invoke retrieves and uses memory context."""
-        from src.main import invoke
-
-        payload = {"prompt": "What about the Eiffel Tower?"}
-        context = Mock()
-        context.session_id = "test-session"
-        context.headers = {}
-
-        result = invoke(payload, context)
-
-        # Verify memory was queried for context
-        mock_memory_module.format_context_for_prompt.assert_called_once()
-
-        # Verify response structure
-        assert "response" in result
-        assert result["metadata"]["memory_enabled"] is True
-
-    def test_invoke_saves_to_memory(self, mock_router, mock_agent, mock_memory_module):
-        """Test that invoke saves interaction to memory."""
-        from src.main import invoke
-
-        payload = {"prompt": "Hello!"}
-        context = Mock()
-        context.session_id = "test-session"
-        context.headers = {"X-Amzn-Bedrock-AgentCore-Runtime-Custom-Actor-Id": "user1"}
-
-        invoke(payload, context)
-
-        # Verify interaction was saved
-        mock_memory_module.add_interaction.assert_called_once()
-        call_kwargs = mock_memory_module.add_interaction.call_args[1]
-        assert call_kwargs["actor_id"] == "user1"
-        assert call_kwargs["session_id"] == "test-session"
-        assert call_kwargs["user_message"] == "Hello!"
-
-    @patch("src.main.memory", None)
-    def test_invoke_works_without_memory(self, mock_router, mock_agent):
-        """Test that invoke works gracefully without memory configured."""
-        from src.main import invoke
-
-        payload = {"prompt": "Hello!"}
-
-        result = invoke(payload, None)
-
-        assert "response" in result
-        assert result["metadata"]["memory_enabled"] is False
+        throttled = ClientError(
+            {"Error": {"Code": "ThrottlingException"}}, "CreateEvent"
+        )
+        write_fn = Mock(side_effect=[throttled, throttled, None])
+        writer = BackgroundWriter(write_fn, max_retries=3, backoff_base=0.001)
+
+        writer.submit(memory_id="m", actor_id="a", session_id="s", messages=[])
+        assert writer.flush(timeout=2)
+
+        stats = writer.stats()
+        assert write_fn.call_count == 3
+        assert stats["retries"] == 2
+        assert stats["written"] == 1
+        assert stats["failed"] == 0
+
+    def test_non_retryable_errors_fail_fast(self):
+        """Test that validation errors are counted as failed without retries."""
+        from botocore.exceptions import ClientError
+        from src.memory.agentcore_memory import BackgroundWriter
+
+        invalid = ClientError({"Error": {"Code": "ValidationException"}}, "CreateEvent")
+        write_fn = Mock(side_effect=invalid)
+        writer = BackgroundWriter(write_fn, max_retries=3, backoff_base=0.001)
+
+        writer.submit(memory_id="m", actor_id="a", session_id="s", messages=[])
+        assert writer.flush(timeout=2)
+
+        assert write_fn.call_count == 1
+        assert writer.stats()["failed"] == 1
+
+    def test_full_queue_drops_writes(self):
+        """Test that a full queue drops writes instead of blocking."""
+        import threading
+        from src.memory.agentcore_memory import BackgroundWriter
+
+        release = threading.Event()
+        writer = BackgroundWriter(lambda **kwargs: release.wait(2), max_queue_size=1)
+
+        results = [writer.submit(n=i) for i in range(5)]
+        release.set()
+        writer.close()
+
+        assert results[0] is True
+        assert False in results
+        assert writer.stats()["dropped"] >= 1
+
+    def test_close_flushes_pending_writes(self):
+        """Test that closing the writer persists everything queued."""
+        from src.memory.agentcore_memory import BackgroundWriter
+
+        write_fn = Mock()
+        writer = BackgroundWriter(write_fn)
+        for i in range(10):
+            writer.submit(n=i)
+        writer.close()
+
+        assert write_fn.call_count == 10
+        assert writer.submit(n=11) is False
+
+    def test_close_abandons_wedged_worker_with_full_queue(self):
+        """Test that close returns when the worker is stuck and the queue is full."""
+        import threading
+        import time
+        from src.memory.agentcore_memory import BackgroundWriter
+
+        release = threading.Event()
+        started = threading.Event()
+
+        def wedged(**kwargs):
+            started.set()
+            release.wait(10)
+
+        writer = BackgroundWriter(wedged, max_queue_size=1)
+        writer.submit(n=0)
+        assert started.wait(2)
+        assert writer.submit(n=1) is True
+
+        start = time.monotonic()
+        writer.close(timeout=0.1)
+        elapsed = time.monotonic() - start
+        release.set()
+
+        assert elapsed < 3
+        assert writer.submit(n=2) is False
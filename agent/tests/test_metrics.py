@@ -0,0 +1,173 @@
+"""
+Unit tests for hot-path metrics (histograms, spans, EMF export)
+"""
+
+import json
+import random
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.memory.agentcore_memory import MemoryContext
+from src.metrics.export import MetricsExporter, emf_records
+from src.metrics.histogram import Histogram
+from src.metrics.registry import MetricsRegistry
+
+
+class TestHistogram:
+    """Test bucketed percentiles and merging."""
+
+    def test_percentiles_within_bucket_error(self):
+        """Test that p50/p95/p99 stay within ~10% of the exact values."""
+        rng = random.Random(7)
+        samples = sorted(rng.lognormvariate(5, 1) for _ in range(10_000))
+        histogram = Histogram()
+        for value in samples:
+            histogram.record(value)
+
+        for pct in (50, 95, 99):
+            exact = samples[int(pct / 100 * len(samples)) - 1]
+            assert histogram.percentile(pct) == pytest.approx(exact, rel=0.1)
+        assert histogram.count == 10_000
+        assert histogram.max == samples[-1]
+
+    def test_merge_adds_counts(self):
+        """Test that merged histograms summarize all samples."""
+        fast, slow = Histogram(), Histogram()
+        for _ in range(90):
+            fast.record(10)
+        for _ in range(10):
+            slow.record(1000)
+
+        fast.merge(slow)
+
+        assert fast.count == 100
+        assert fast.percentile(50) == pytest.approx(10, rel=0.1)
+        assert fast.percentile(99) == 1000
+        assert fast.min == 10
+
+    def test_empty_histogram(self):
+        """Test that an empty histogram reports zeros."""
+        assert Histogram().summary()["p99"] == 0.0
+
+
+class TestMetricsRegistry:
+    """Test spans, dimensions and grouping."""
+
+    def test_span_records_with_late_dimensions(self):
+        """Test that dimensions tagged inside the span are recorded."""
+        registry = MetricsRegistry()
+
+        with registry.span("classification") as span:
+            span.tag(model="nova-micro", complexity="trivial")
+
+        assert span.elapsed_ms >= 0
+        summary = registry.summary(by="complexity")
+        assert summary["classification"]["trivial"]["count"] == 1
+
+    def test_views_by_model_and_complexity(self):
+        """Test that one record feeds both the model and the complexity views."""
+        registry = MetricsRegistry()
+        registry.record("generation", 300, "nova-lite", "trivial")
+        registry.record("generation", 500, "nova-lite", "informative")
+        registry.record("generation", 4000, "nova-pro", "complex")
+
+        by_model = registry.summary(by="model")["generation"]
+        by_complexity = registry.summary(by="complexity")["generation"]
+
+        assert by_model["nova-lite"]["count"] == 2
+        assert by_model["nova-pro"]["p50"] == 4000
+        assert set(by_complexity) == {"trivial", "informative", "complex"}
+
+    def test_disabled_registry_records_nothing(self):
+        """Test that METRICS_ENABLED=false turns recording off."""
+        registry = MetricsRegistry(enabled=False)
+        with registry.span("generation"):
+            pass
+
+        assert registry.collect() == {}
+
+    def test_collect_reset(self):
+        """Test that an export interval starts from empty histograms."""
+        registry = MetricsRegistry()
+        registry.record("memory_write", 1.5)
+
+        assert len(registry.collect(reset=True)) == 1
+        assert registry.collect() == {}
+
+
+class TestEMFExport:
+    """Test the EMF lines and the exporter targets."""
+
+    def test_records_have_emf_metadata(self):
+        """Test that each line declares its metrics and dimensions."""
+        registry = MetricsRegistry()
+        registry.record("classification", 120, "nova-micro", "informative")
+
+        records = emf_records(registry.collect(), "NAgent", 1700000000000)
+
+        assert len(records) == 2
+        by_model = records[0]
+        directive = by_model["_aws"]["CloudWatchMetrics"][0]
+        assert directive["Namespace"] == "NAgent"
+        assert directive["Dimensions"] == [["Stage", "Model"]]
+        assert by_model["Stage"] == "classification"
+        assert by_model["Model"] == "nova-micro"
+        assert by_model["LatencyP99"] == 120
+        assert records[1]["Complexity"] == "informative"
+
+    def test_file_target_appends_json_lines(self, tmp_path):
+        """Test that flush writes JSON lines to a local file and resets."""
+        registry = MetricsRegistry()
+        registry.record("generation", 800, "nova-lite", "informative")
+        path = tmp_path / "metrics.jsonl"
+        exporter = MetricsExporter(registry, target="file", path=str(path))
+
+        assert exporter.flush() == 2
+        assert exporter.flush() == 0
+
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)["Stage"] for line in lines] == ["generation"] * 2
+
+    def test_export_off(self, monkeypatch):
+        """Test that METRICS_EXPORT=off disables the exporter."""
+        monkeypatch.setenv("METRICS_EXPORT", "off")
+        assert MetricsExporter.from_env(MetricsRegistry()) is None
+
+
+class TestInvokeMetrics:
+    """Test the spans recorded by the entrypoint."""
+
+    def test_stages_recorded_per_route(self):
+        """Test that memory, generation and write spans carry the route dimensions."""
+        from src.main import invoke
+
+        registry = MetricsRegistry()
+        context = MemoryContext(
+            summary="Viagem para Roma", timings_ms={"summary": 40.0, "turns": 25.0}
+        )
+        with patch("src.main.metrics", registry), \
+                patch("src.main.router") as mock_router, \
+                patch("src.main.memory") as mock_memory, \
+                patch("src.main.get_bedrock_model"), \
+                patch("src.main.Agent") as mock_agent:
+            mock_router.route.return_value = {
+                "model_id": "us.amazon.nova-pro-v1:0",
+                "complexity": "complex",
+                "use_tools": True,
+                "use_memory": True,
+                "routing_time_ms": 150,
+            }
+            mock_memory.is_configured.return_value = True
+            mock_memory.fetch_context.return_value = context
+            mock_agent.return_value.invoke_async = AsyncMock(return_value="Roteiro")
+
+            invoke({"prompt": "Planeje 3 dias em Roma"})
+
+        summary = registry.summary(by="model")
+        for stage in ("memory_summary", "memory_turns", "generation", "memory_write"):
+            assert summary[stage]["us.amazon.nova-pro-v1:0"]["count"] == 1
+        assert summary["memory_summary"]["us.amazon.nova-pro-v1:0"]["p50"] == (
+            pytest.approx(40, rel=0.1)
+        )
+        assert registry.summary(by="complexity")["generation"]["complex"]["count"] == 1
@@ -0,0 +1,209 @@
+"""
+Unit tests for the response cache (TRIVIAL/INFORMATIVE answers per session)
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.memory.agentcore_memory import AgentCoreMemory, MemoryContext
+from src.memory.client_registry import clear_clients
+from src.serving.response_cache import ResponseCache
+
+CHAT_MODEL = "us.amazon.nova-lite-v1:0"
+
+
+def _route_config(complexity):
+    return {
+        "model_id": CHAT_MODEL,
+        "complexity": complexity,
+        "use_tools": False,
+        "use_memory": True,
+        "enable_cache": True,
+        "routing_time_ms": 100,
+    }
+
+
+class TestResponseCache:
+    """Test keys, cacheable complexities, expiry and invalidation."""
+
+    @pytest.fixture
+    def cache(self):
+        return ResponseCache(max_entries=2, ttl_seconds=60)
+
+    def test_hit_requires_same_session(self, cache):
+        """Test that the key covers prompt, complexity, actor and session."""
+        cache.put("informative", "Qual meu hotel?", "user", "s1", "Hotel Roma", 800)
+
+        assert cache.get("informative", "qual meu hotel", "user", "s1").response == (
+            "Hotel Roma"
+        )
+        assert cache.get("informative", "Qual meu hotel?", "user", "s2") is None
+        assert cache.get("informative", "Qual meu hotel?", "other", "s1") is None
+        assert cache.get("trivial", "Qual meu hotel?", "user", "s1") is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+        assert stats["hit_rate"] == pytest.approx(0.25)
+        assert stats["saved_ms"] == 800
+
+    @pytest.mark.parametrize("complexity", ["complex", "critical", "vision"])
+    def test_only_low_risk_complexities_are_cached(self, cache, complexity):
+        """Test that planning/critical/vision answers are never stored."""
+        assert cache.put(complexity, "Planeje Roma", "user", "s1", "Plano", 5000) is False
+        assert cache.get(complexity, "Planeje Roma", "user", "s1") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate_session_drops_only_that_session(self, cache):
+        """Test that a write to one session keeps the other sessions' entries."""
+        cache.put("trivial", "Obrigado", "user", "s1", "De nada!", 300)
+        cache.put("trivial", "Obrigado", "user", "s2", "De nada!", 300)
+
+        assert cache.invalidate_session("user", "s1") == 1
+
+        assert cache.get("trivial", "Obrigado", "user", "s1") is None
+        assert cache.get("trivial", "Obrigado", "user", "s2") is not None
+
+    def test_lru_and_ttl(self, cache, monkeypatch):
+        """Test that entries are evicted by size and expire after the TTL."""
+        for i in range(3):
+            cache.put("trivial", f"Oi {i}", "user", "s1", "Olá!", 100)
+
+        assert cache.get("trivial", "Oi 0", "user", "s1") is None
+        assert cache.stats()["entries"] == 2
+
+        monkeypatch.setattr("src.serving.response_cache.time.monotonic", lambda: 1e12)
+        assert cache.get("trivial", "Oi 2", "user", "s1") is None
+        assert cache.stats()["entries"] == 1
+
+    def test_disabled_by_env(self, monkeypatch):
+        """Test that RESPONSE_CACHE_ENABLED=false turns the cache off."""
+        monkeypatch.setenv("RESPONSE_CACHE_ENABLED", "false")
+        assert ResponseCache.from_env() is None
+        monkeypatch.setenv("RESPONSE_CACHE_ENABLED", "true")
+        monkeypatch.setenv("RESPONSE_CACHE_TTL_SECONDS", "30")
+        assert ResponseCache.from_env().ttl_seconds == 30
+
+
+class TestCachedInvoke:
+    """Test the entrypoint serving answers from the response cache."""
+
+    @pytest.fixture
+    def mock_router(self):
+        with patch("src.main.router") as mock:
+            mock.route.return_value = _route_config("informative")
+            yield mock
+
+    @pytest.fixture
+    def mock_agent(self):
+        with patch("src.main.get_bedrock_model"), patch("src.main.Agent") as mock:
+            instance = Mock()
+            instance.invoke_async = AsyncMock(return_value="Seu hotel é o Hotel Roma")
+            mock.return_value = instance
+            yield instance
+
+    @pytest.fixture
+    def memory(self, fresh_response_cache):
+        """Real AgentCoreMemory (mocked client) wired to the cache like get_memory."""
+        with patch("src.memory.client_registry._new_memory_client"), patch(
+            "src.memory.client_registry.get_boto_session"
+        ):
+            clear_clients()
+            memory = AgentCoreMemory(memory_id="mem-test-123")
+            memory.add_write_listener(fresh_response_cache.invalidate_session)
+            memory.fetch_context = Mock(return_value=MemoryContext(summary="Viagem a Roma"))
+            with patch("src.main.memory", memory):
+                yield memory
+            memory.flush(timeout=5)
+        clear_clients()
+
+    def test_repeated_question_is_served_from_cache(self, mock_router, mock_agent):
+        """Test that the second identical question skips generation."""
+        from src.main import invoke
+
+        payload = {"prompt": "Qual meu hotel?", "session_id": "s1"}
+        with patch("src.main.memory", None):
+            first = invoke(payload)
+            second = invoke(payload)
+
+        assert mock_agent.invoke_async.await_count == 1
+        assert second["response"] == first["response"]
+        assert first["metadata"]["response_cache"]["hit"] is False
+        cache_info = second["metadata"]["response_cache"]
+        assert cache_info["hit"] is True
+        assert cache_info["totals"]["hit_rate"] == pytest.approx(0.5)
+        assert "generation" not in second["metadata"]["timings_ms"]
+
+    def test_complex_answers_are_regenerated(self, mock_router, mock_agent):
+        """Test that non-cacheable complexities always reach the agent."""
+        from src.main import invoke
+
+        mock_router.route.return_value = _route_config("complex")
+        payload = {"prompt": "Planeje 3 dias em Roma", "session_id": "s1"}
+        with patch("src.main.memory", None):
+            invoke(payload)
+            result = invoke(payload)
+
+        assert mock_agent.invoke_async.await_count == 2
+        assert result["metadata"]["response_cache"]["cacheable"] is False
+
+    def test_memory_write_invalidates_session(
+        self, mock_router, mock_agent, memory, fresh_response_cache
+    ):
+        """Test that the next add_interaction drops the session's cached answers."""
+        from src.main import invoke
+
+        payload = {"prompt": "Qual meu hotel?", "session_id": "s1"}
+        invoke(payload)
+        # Resposta guardada depois da escrita do próprio turno
+        assert fresh_response_cache.stats()["entries"] == 1
+
+        memory.add_interaction(
+            actor_id="user",
+            session_id="s1",
+            user_message="Mudei de hotel",
+            agent_response="Anotado!",
+            background=True,
+        )
+        result = invoke(payload)
+
+        assert result["metadata"]["response_cache"]["hit"] is False
+        assert mock_agent.invoke_async.await_count == 2
+
+    def test_repeated_question_hits_with_memory_enabled(
+        self, mock_router, mock_agent, memory, fresh_response_cache
+    ):
+        """Test that three identical requests generate and write to Memory only once."""
+        from src.main import invoke
+
+        # Contexto muda a cada escrita na sessão (o turno entra no histórico)
+        writes = []
+        memory.add_write_listener(lambda actor_id, session_id: writes.append(session_id))
+        memory.fetch_context.side_effect = lambda **kwargs: MemoryContext(
+            summary=f"Viagem a Roma ({len(writes)} turnos)"
+        )
+
+        payload = {"prompt": "Qual meu hotel?", "session_id": "s1"}
+        results = [invoke(payload) for _ in range(3)]
+        memory.flush(timeout=5)
+
+        assert mock_agent.invoke_async.await_count == 1
+        assert [r["metadata"]["response_cache"]["hit"] for r in results] == [False, True, True]
+        assert [r["metadata"]["memory_write"] for r in results] == [
+            "queued", "skipped", "skipped"
+        ]
+        assert writes == ["s1"]
+        assert memory.client.create_event.call_count == 1
+        assert fresh_response_cache.stats()["invalidations"] == 0
+
+    def test_stream_hit_yields_single_chunk(self, mock_router, mock_agent):
+        """Test that a cached answer keeps the streaming event format."""
+        from src.main import invoke
+
+        with patch("src.main.memory", None):
+            invoke({"prompt": "Qual meu hotel?", "session_id": "s1"})
+            events = invoke({"prompt": "Qual meu hotel?", "session_id": "s1", "stream": True})
+
+        assert events[0] == {"type": "chunk", "data": "Seu hotel é o Hotel Roma"}
+        assert events[-1]["type"] == "done"
+        assert events[-1]["metadata"]["response_cache"]["hit"] is True
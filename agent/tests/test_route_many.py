@@ -0,0 +1,196 @@
+"""
+Unit tests for AgentRouter.route_many (batch classification)
+"""
+
+import re
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.router.agent_router import AgentRouter
+from src.router.batch import build_packed_prompt, parse_packed_response
+
+LABELS = ["trivial", "informative", "complex", "critical"]
+
+
+def _result(text):
+    """AgentResult falso com texto e uso de tokens."""
+    result = MagicMock()
+    result.__str__.return_value = text
+    result.message = {"content": [{"text": text}]}
+    result.metrics.agent_invocations = [
+        MagicMock(usage={"inputTokens": 400, "outputTokens": 10})
+    ]
+    return result
+
+
+def _answer(prompt):
+    """Classificador falso: COMPLEX para 'planeje', INFORMATIVE para o resto."""
+    numbered = re.findall(r'^(\d+)\. "(.*)"$', prompt, re.MULTILINE)
+    if numbered:
+        return _result(
+            "\n".join(
+                f"{n}: {'COMPLEX' if 'planeje' in m.lower() else 'INFORMATIVE'}"
+                for n, m in numbered
+            )
+        )
+    return _result("COMPLEX" if "planeje" in prompt.lower() else "INFORMATIVE")
+
+
+class TestPackedPrompt:
+    """Test the packed prompt format and its parser."""
+
+    def test_prompt_numbers_messages(self):
+        """Test that each message gets its own numbered line."""
+        prompt = build_packed_prompt(["Qual meu hotel?", "Planeje Roma"])
+
+        assert '1. "Qual meu hotel?"' in prompt
+        assert '2. "Planeje Roma"' in prompt
+
+    def test_parse_returns_labels_in_order(self):
+        """Test that answers are mapped back by number, not line order."""
+        text = "2: COMPLEX\n1: informative\n"
+
+        assert parse_packed_response(text, 2, LABELS) == ["informative", "complex"]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "1: COMPLEX",  # faltando
+            "1: COMPLEX\n2: TRIVIAL\n3: TRIVIAL",  # sobrando
+            "1: COMPLEX\n2: MAYBE",  # rótulo inválido
+            "1: COMPLEX\n1: TRIVIAL",  # duplicado
+            "COMPLEX",  # resposta simples
+        ],
+    )
+    def test_parse_rejects_incomplete_answers(self, text):
+        """Test that any mismatch rejects the whole packed answer."""
+        assert parse_packed_response(text, 2, LABELS) is None
+
+
+class TestRouteMany:
+    """Test batch routing: dedupe, fast paths, packing and ordering."""
+
+    @pytest.fixture
+    def classifier(self):
+        """Fake classifier agent shared by the pool."""
+        with patch("src.router.agent_router.Agent") as agent_class:
+            agent = MagicMock(messages=[])
+            agent.side_effect = _answer
+            agent_class.return_value = agent
+            yield agent
+
+    @pytest.fixture
+    def router(self, classifier, monkeypatch):
+        """Router without classification cache."""
+        monkeypatch.setenv("ROUTER_CACHE_ENABLED", "false")
+        return AgentRouter(region_name="us-east-1")
+
+    def test_results_follow_input_order(self, router):
+        """Test that results come back in input order, duplicates included."""
+        messages = [
+            "Planeje 3 dias em Roma",
+            "Qual meu hotel?",
+            "planeje 3 dias em roma!",
+            {"message": "Analise esta foto", "has_image": True},
+            "Ok",
+        ]
+
+        batch = router.route_many(messages)
+
+        assert [r["complexity"] for r in batch.results] == [
+            "complex",
+            "informative",
+            "complex",
+            "vision",
+            "trivial",
+        ]
+        assert batch.stats["messages"] == 5
+        assert batch.stats["unique"] == 4
+        assert batch.stats["duplicates"] == 1
+        assert batch.stats["sources"] == {"batch": 2, "vision": 1, "pattern": 1}
+
+    def test_messages_are_packed_per_trip_context(self, router, classifier):
+        """Test that one prompt carries several messages of the same trip."""
+        rome = {"status": "PLANNING", "destinations": ["Roma"]}
+        paris = {"status": "PLANNING", "destinations": ["Paris"]}
+        messages = [
+            {"message": f"Pergunta {i} sobre a viagem", "trip_context": rome}
+            for i in range(5)
+        ] + [{"message": "Planeje o passeio de amanhã", "trip_context": paris}]
+
+        batch = router.route_many(messages, batch_size=8)
+
+        prompts = [c.args[0] for c in classifier.call_args_list]
+        assert len(prompts) == 2
+        rome_prompt = next(p for p in prompts if "Roma" in p)
+        assert rome_prompt.count('. "Pergunta') == 5
+        assert "Paris" not in rome_prompt
+        assert batch.stats["llm_calls"] == 2
+        # Mensagem isolada no seu contexto vai em prompt simples
+        assert batch.stats["packed_calls"] == 1
+        assert batch.stats["input_tokens"] == 800
+        assert batch.stats["cost_usd"] == pytest.approx(
+            (800 * 0.035 + 20 * 0.14) / 1_000_000
+        )
+
+    def test_invalid_packed_answer_falls_back_per_message(self, router, classifier):
+        """Test that a malformed packed answer reclassifies messages one by one."""
+
+        def answer(prompt):
+            if '2. "' in prompt:
+                return _result("1: COMPLEX")
+            return _answer(prompt)
+
+        classifier.side_effect = answer
+
+        batch = router.route_many(["Planeje Roma", "Qual meu voo?"])
+
+        assert [r["complexity"] for r in batch.results] == ["complex", "informative"]
+        assert batch.stats["llm_calls"] == 3
+        assert batch.stats["packed_failures"] == 1
+        assert batch.stats["sources"] == {"llm": 2}
+
+    def test_long_messages_are_not_packed(self, router, classifier, monkeypatch):
+        """Test that messages above the packing limit go in their own prompt."""
+        monkeypatch.setenv("ROUTER_BATCH_PACK_MAX_CHARS", "20")
+
+        router.route_many(["Curta", "Mensagem bem mais longa que o limite", "Outra"])
+
+        prompts = [c.args[0] for c in classifier.call_args_list]
+        assert len(prompts) == 2
+        assert any("MENSAGEM DO USUÁRIO" in p and "longa" in p for p in prompts)
+
+    def test_concurrency_is_bounded(self, monkeypatch):
+        """Test that no more than max_concurrency calls run at once."""
+        monkeypatch.setenv("ROUTER_CACHE_ENABLED", "false")
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_answer(prompt):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return _answer(prompt)
+
+        with patch("src.router.agent_router.Agent") as agent_class:
+            agent_class.side_effect = lambda **kwargs: MagicMock(
+                messages=[], side_effect=slow_answer
+            )
+            router = AgentRouter(region_name="us-east-1", classifier_pool_size=8)
+            batch = router.route_many(
+                [f"Pergunta número {i}" for i in range(12)],
+                max_concurrency=3,
+                batch_size=1,
+            )
+
+        assert batch.stats["llm_calls"] == 12
+        assert peak == 3
+        assert router.classifier_pool.created == 3
@@ -4,8 +4,11 @@ Tests classification logic, model selection, and cost optimization
 """
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
-from src.router.agent_router import AgentRouter, QueryComplexity
+from src.router.agent_router import AgentRouter, CLASSIFIER_SYSTEM_PROMPT, QueryComplexity
+from src.router.usage import extract_usage, system_prompt_blocks
+from src.memory.client_registry import clear_clients
 
 
 class TestAgentRouter:
@@ -69,6 +72,42 @@ class TestAgentRouter:
         assert result == QueryComplexity.COMPLEX
         mock_agent_class.assert_called_once()
     
+    @patch('src.router.agent_router.Agent')
+    def test_classifier_agent_reused_across_calls(self, mock_agent_class, router):
+        """Test that the pooled classifier agent is built once and reused."""
+        mock_agent_instance = MagicMock()
+        mock_agent_instance.messages = []
+        mock_agent_class.return_value = mock_agent_instance
+        mock_result = MagicMock()
+        mock_result.message = {'content': [{'text': 'INFORMATIVE'}]}
+        mock_agent_instance.return_value = mock_result
+
+        router.classify_query(user_message="Qual meu hotel em Roma?")
+        router.classify_query(user_message="A que horas é o voo?")
+
+        mock_agent_class.assert_called_once()
+        assert mock_agent_instance.call_count == 2
+
+    @patch('src.router.agent_router.Agent')
+    def test_repeated_message_served_from_cache(self, mock_agent_class, router):
+        """Test that repeated messages skip the classifier call."""
+        mock_agent_instance = MagicMock()
+        mock_agent_instance.messages = []
+        mock_agent_class.return_value = mock_agent_instance
+        mock_result = MagicMock()
+        mock_result.message = {'content': [{'text': 'INFORMATIVE'}]}
+        mock_agent_instance.return_value = mock_result
+
+        first = router.route(user_message="Qual meu hotel?")
+        second = router.route(user_message="qual meu hotel")
+
+        assert mock_agent_instance.call_count == 1
+        assert first['classification_source'] == 'llm'
+        assert second['classification_source'] == 'cache'
+        assert second['complexity'] == 'informative'
+        assert second['classification_cache']['hits'] == 1
+        assert second['classification_cache']['misses'] == 1
+
     def test_model_selection_for_trivial(self, router):
         """Test that trivial queries use Nova Lite (cheapest)."""
         config = router.get_model_for_complexity(QueryComplexity.TRIVIAL)
@@ -130,19 +169,152 @@ class TestAgentRouter:
             result = router.classify_query(user_message="Test")
             assert result == QueryComplexity.INFORMATIVE
     
-    @patch('src.router.agent_router.AgentCoreMemorySessionManager')
-    @patch('src.router.agent_router.MemoryClient')
-    def test_memory_setup(self, mock_memory_client, mock_session_manager):
-        """Test AgentCore Memory configuration."""
+    @patch('src.memory.client_registry._new_memory_client')
+    def test_memory_setup(self, mock_memory_client):
+        """Test that memory_id is kept but builds no Memory client."""
+        clear_clients()
         # Use valid memory ID format: [a-zA-Z][a-zA-Z0-9-_]{0,99}-[a-zA-Z0-9]{10}
         memory_id = "test-memory-1234567890"
         
-        # Mock the memory client and session manager to avoid AWS API calls
         router = AgentRouter(memory_id=memory_id, region_name='us-east-1')
         
         assert router.memory_id == memory_id
-        # Verify memory client was initialized
-        mock_memory_client.assert_called_once_with(region_name='us-east-1')
+        # Classificador sem histórico: nenhum cliente do Memory no Router
+        mock_memory_client.assert_not_called()
+        clear_clients()
+
+
+class TestPromptCaching:
+    """Test Bedrock prompt-cache checkpoints and usage reporting."""
+
+    @patch('src.router.agent_router.Agent')
+    def test_classifier_static_prompt_has_cache_point(self, mock_agent_class):
+        """Test that the static classifier instructions end in a cache point."""
+        router = AgentRouter(region_name='us-east-1')
+        mock_agent_instance = MagicMock()
+        mock_agent_instance.messages = []
+        mock_agent_class.return_value = mock_agent_instance
+
+        usage = {"inputTokens": 20, "outputTokens": 1, "cacheReadInputTokens": 300}
+        mock_result = MagicMock()
+        mock_result.message = {'content': [{'text': 'COMPLEX'}]}
+        mock_result.metrics.agent_invocations = [Mock(usage=usage)]
+        mock_agent_instance.return_value = mock_result
+
+        config = router.route(user_message="Planeje 3 dias em Roma")
+
+        system_prompt = mock_agent_class.call_args[1]['system_prompt']
+        assert system_prompt[0] == {'text': CLASSIFIER_SYSTEM_PROMPT}
+        assert system_prompt[1] == {'cachePoint': {'type': 'default'}}
+        # Instruções estáticas não são reenviadas no prompt de cada chamada
+        prompt = mock_agent_instance.call_args[0][0]
+        assert "EXEMPLOS" not in prompt
+        assert "Planeje 3 dias em Roma" in prompt
+        assert config['classification_usage']['cache_read_input_tokens'] == 300
+        # Leituras do cache pagam o preço com desconto do Nova Micro
+        assert config['classification_cost_usd'] == pytest.approx(
+            (20 * 0.035 + 300 * 0.00875 + 1 * 0.14) / 1_000_000
+        )
+
+    @patch('src.router.agent_router.Agent')
+    def test_reused_agent_reports_usage_per_call(self, mock_agent_class):
+        """Test that a reused agent without per-invocation metrics reports deltas."""
+        class ReusedAgent:
+            def __init__(self):
+                self.messages = []
+                self.event_loop_metrics = SimpleNamespace(
+                    accumulated_usage={"inputTokens": 0, "outputTokens": 0}
+                )
+
+            def __call__(self, prompt):
+                usage = self.event_loop_metrics.accumulated_usage
+                usage["inputTokens"] += 100
+                usage["outputTokens"] += 1
+                return SimpleNamespace(
+                    message={'content': [{'text': 'COMPLEX'}]},
+                    metrics=self.event_loop_metrics,
+                )
+
+        agent = ReusedAgent()
+        mock_agent_class.return_value = agent
+        router = AgentRouter(region_name='us-east-1')
+        # Keep the lifetime total across leases, like a per-session agent
+        router.classifier_pool._reset = lambda agent: agent.messages.clear()
+
+        usages = [
+            router.route(user_message=f"Planeje {days} dias em Roma")['classification_usage']
+            for days in (3, 4, 5)
+        ]
+
+        assert [u['input_tokens'] for u in usages] == [100, 100, 100]
+        assert mock_agent_class.call_count == 1
+
+    def test_enable_cache_follows_model_support(self):
+        """Test that enable_cache is only set for models with prompt caching."""
+        router = AgentRouter(region_name='us-east-1')
+
+        assert router.route(user_message="Oi!")['enable_cache'] is True
+        assert router.route(user_message="Analise", has_image=True)['enable_cache'] is False
+
+    def test_system_prompt_blocks(self):
+        """Test that the dynamic suffix goes after the cache point."""
+        assert system_prompt_blocks("static", "dynamic") == "staticdynamic"
+        assert system_prompt_blocks("static", "dynamic", enable_cache=True) == [
+            {"text": "static"},
+            {"cachePoint": {"type": "default"}},
+            {"text": "dynamic"},
+        ]
+
+    def test_extract_usage_without_metrics(self):
+        """Test that results without metrics report zero usage."""
+        assert extract_usage("plain text") == {
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_write_input_tokens": 0,
+        }
+
+
+class TestStatelessClassifier:
+    """Test that classifications never share conversation history."""
+
+    def test_concurrent_routes_use_pooled_agents_without_history(self):
+        """Test that parallel classifications with Memory configured only see their own prompt."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        prompts = []
+
+        def build_agent(**kwargs):
+            agent = MagicMock(messages=[])
+
+            def call(prompt):
+                prompts.append((prompt, list(agent.messages)))
+                result = MagicMock()
+                result.message = {'content': [{'text': 'COMPLEX'}]}
+                agent.messages.append({'role': 'user', 'content': [{'text': prompt}]})
+                return result
+
+            agent.side_effect = call
+            return agent
+
+        clear_clients()
+        with patch('src.memory.client_registry._new_memory_client'), \
+                patch('src.router.agent_router.Agent', side_effect=build_agent) as agent_class:
+            router = AgentRouter(memory_id="test-memory-1234567890", region_name='us-east-1')
+            router.classification_cache = None
+
+            def classify(i):
+                return router.route(user_message=f"Planeje a viagem {i} para Roma")
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                configs = list(executor.map(classify, range(16)))
+        clear_clients()
+
+        assert all(config['complexity'] == 'complex' for config in configs)
+        assert all('session_manager' not in call.kwargs for call in agent_class.call_args_list)
+        assert agent_class.call_count <= router.classifier_pool.max_size
+        assert len(prompts) == 16
+        assert all(history == [] for _, history in prompts)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,281 @@
+"""
+Unit tests for speculative generation (SPECULATIVE_GENERATION)
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.memory.agentcore_memory import MemoryContext
+from src.serving import speculation as spec
+
+CHAT_MODEL = "us.amazon.nova-lite-v1:0"
+PLANNING_MODEL = "us.amazon.nova-pro-v1:0"
+
+MODELS = {
+    "chat": {
+        "id": CHAT_MODEL,
+        "cost_input": 0.06,
+        "supports_prompt_cache": True,
+        "context_budget_tokens": 1500,
+    },
+}
+
+
+def _route_config(model_id, complexity):
+    return {
+        "model_id": model_id,
+        "complexity": complexity,
+        "use_tools": complexity == "complex",
+        "use_memory": True,
+        "enable_cache": True,
+        "context_budget_tokens": 1500,
+        "routing_time_ms": 200,
+    }
+
+
+class TestSpeculationLedger:
+    """Test the speculation counters."""
+
+    def test_hit_rate_and_extra_cost(self):
+        """Test that only cancelled/failed speculations add cost."""
+        ledger = spec.SpeculationLedger()
+        ledger.record(spec.ACCEPTED, saved_ms=150)
+        ledger.record(spec.ACCEPTED, saved_ms=50)
+        ledger.record(spec.CANCELLED, wasted_input_tokens=1000, cost_input_per_1m=0.06)
+        ledger.record(spec.SKIPPED)
+
+        stats = ledger.stats()
+
+        assert stats["started"] == 3
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+        assert stats["saved_ms"] == 200
+        assert stats["skipped"] == 1
+        assert stats["extra_cost_usd"] == pytest.approx(0.00006)
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Test that speculation is opt-in."""
+        monkeypatch.delenv("SPECULATIVE_GENERATION", raising=False)
+        assert spec.speculation_enabled() is False
+        monkeypatch.setenv("SPECULATIVE_GENERATION", "true")
+        assert spec.speculation_enabled() is True
+
+
+class TestSpeculativeInvoke:
+    """Test the entrypoint with speculative generation enabled."""
+
+    @pytest.fixture(autouse=True)
+    def enabled(self, monkeypatch):
+        monkeypatch.setenv("SPECULATIVE_GENERATION", "true")
+
+    @pytest.fixture
+    def ledger(self):
+        with patch("src.main.speculation_ledger", spec.SpeculationLedger()) as ledger:
+            yield ledger
+
+    @pytest.fixture
+    def mock_router(self):
+        """Slow classification (200ms), chat model by default."""
+        with patch("src.main.router") as mock:
+            mock.models = MODELS
+            mock.is_trivial_pattern.return_value = False
+            config = _route_config(CHAT_MODEL, "informative")
+
+            def slow_route(**kwargs):
+                time.sleep(0.2)
+                return mock.route.return_value
+
+            mock.route.return_value = config
+            mock.route.side_effect = slow_route
+            yield mock
+
+    @pytest.fixture
+    def mock_agent(self):
+        """Agents answer with the model they were built for."""
+        with patch("src.main.get_bedrock_model", side_effect=lambda model_id: model_id), \
+                patch("src.main.Agent") as mock:
+
+            def build(model, system_prompt):
+                instance = Mock()
+
+                async def generate(message):
+                    await asyncio.sleep(0.05)
+                    return f"resposta de {model}"
+
+                instance.invoke_async = AsyncMock(side_effect=generate)
+                return instance
+
+            mock.side_effect = build
+            yield mock
+
+    @pytest.fixture
+    def mock_memory_module(self):
+        with patch("src.main.memory") as mock:
+            mock.is_configured.return_value = True
+            mock.fetch_context.return_value = MemoryContext(summary="Viagem para Roma")
+            yield mock
+
+    def test_speculation_accepted_for_chat_model(
+        self, mock_router, mock_agent, mock_memory_module, ledger
+    ):
+        """Test that a chat-model route keeps the answer started early."""
+        import threading
+        from src.main import invoke
+
+        # Classificação só termina depois da geração: sem especulação, a
+        # geração começaria depois dela e a espera esgotaria o timeout
+        generated = threading.Event()
+        build = mock_agent.side_effect
+
+        def build_tracked(model, system_prompt):
+            instance = build(model, system_prompt)
+            generate = instance.invoke_async.side_effect
+
+            async def tracked(message):
+                response = await generate(message)
+                generated.set()
+                return response
+
+            instance.invoke_async.side_effect = tracked
+            return instance
+
+        def route_after_generation(**kwargs):
+            route_after_generation.overlapped = generated.wait(timeout=5)
+            return mock_router.route.return_value
+
+        mock_agent.side_effect = build_tracked
+        mock_router.route.side_effect = route_after_generation
+
+        result = invoke({"prompt": "Qual meu hotel em Roma?"})
+
+        assert route_after_generation.overlapped is True
+        assert result["response"] == f"resposta de {CHAT_MODEL}"
+        assert mock_agent.call_count == 1
+        speculation = result["metadata"]["speculation"]
+        assert speculation["outcome"] == "accepted"
+        assert speculation["saved_ms"] >= 40
+        assert speculation["totals"]["hit_rate"] == 1.0
+        assert result["metadata"]["memory_context_used"] is True
+
+    def test_speculation_cancelled_for_other_model(
+        self, mock_router, mock_agent, mock_memory_module, ledger
+    ):
+        """Test that a planning route cancels the chat answer and regenerates."""
+        from src.main import invoke
+
+        mock_router.route.return_value = _route_config(PLANNING_MODEL, "complex")
+
+        result = invoke({"prompt": "Planeje 3 dias em Roma"})
+
+        assert result["response"] == f"resposta de {PLANNING_MODEL}"
+        assert mock_agent.call_count == 2
+        assert result["metadata"]["speculation"]["outcome"] == "cancelled"
+        stats = ledger.stats()
+        assert stats["cancelled"] == 1
+        assert stats["wasted_input_tokens"] > 0
+        assert stats["extra_cost_usd"] > 0
+
+    def test_speculation_skipped_when_routing_finishes_first(
+        self, mock_router, mock_agent, mock_memory_module, ledger
+    ):
+        """Test that nothing is speculated when classification beats the context."""
+        from src.main import invoke
+
+        mock_router.route.side_effect = None
+
+        def slow_context(**kwargs):
+            time.sleep(0.1)
+            return MemoryContext(summary="Viagem para Roma")
+
+        mock_memory_module.fetch_context.side_effect = slow_context
+
+        result = invoke({"prompt": "Qual meu hotel em Roma?"})
+
+        assert mock_agent.call_count == 1
+        assert result["metadata"]["speculation"]["outcome"] == "skipped"
+        assert ledger.stats()["started"] == 0
+
+    def test_speculation_holds_admission_slot(
+        self, mock_router, mock_agent, mock_memory_module, ledger, fresh_admission
+    ):
+        """Test that speculative calls take and return chat-model admission slots."""
+        from src.main import invoke
+
+        invoke({"prompt": "Qual meu hotel em Roma?"})
+        mock_router.route.return_value = _route_config(PLANNING_MODEL, "complex")
+        invoke({"prompt": "Planeje 3 dias em Roma"})
+
+        stats = fresh_admission.stats()
+        assert stats[CHAT_MODEL]["admitted"] == 2
+        assert stats[CHAT_MODEL]["in_flight"] == 0
+        assert stats[PLANNING_MODEL]["admitted"] == 1
+        assert stats[PLANNING_MODEL]["in_flight"] == 0
+
+    def test_speculation_skipped_without_free_slot(
+        self, mock_router, mock_agent, mock_memory_module, ledger
+    ):
+        """Test that speculation never queues behind a saturated chat model."""
+        from src.main import invoke
+        from src.serving.admission import AdmissionController
+
+        controller = AdmissionController(initial_limit=1, max_limit=1)
+        held = controller.try_acquire(CHAT_MODEL)
+        mock_router.route.return_value = _route_config(PLANNING_MODEL, "complex")
+
+        with patch("src.main.admission", controller):
+            result = invoke({"prompt": "Planeje 3 dias em Roma"})
+
+        assert held is not None
+        assert result["metadata"]["speculation"]["outcome"] == "skipped"
+        assert mock_agent.call_count == 1
+        assert controller.stats()[CHAT_MODEL]["in_flight"] == 1
+
+    def test_throttled_speculation_lowers_limit(
+        self, mock_router, mock_agent, mock_memory_module, ledger, fresh_admission
+    ):
+        """Test that a throttled speculative call feeds the AIMD limiter."""
+        from botocore.exceptions import ClientError
+        from src.main import invoke
+
+        build = mock_agent.side_effect
+
+        def throttled_first(model, system_prompt):
+            instance = build(model, system_prompt)
+            if mock_agent.call_count == 1:
+                instance.invoke_async = AsyncMock(
+                    side_effect=ClientError(
+                        {"Error": {"Code": "ThrottlingException", "Message": "slow down"}},
+                        "ConverseStream",
+                    )
+                )
+            return instance
+
+        mock_agent.side_effect = throttled_first
+
+        result = invoke({"prompt": "Qual meu hotel em Roma?"})
+
+        assert result["metadata"]["speculation"]["outcome"] == "failed"
+        assert result["response"] == f"resposta de {CHAT_MODEL}"
+        stats = fresh_admission.stats()[CHAT_MODEL]
+        assert stats["throttled"] == 1
+        assert stats["limit"] < 16
+        assert stats["in_flight"] == 0
+
+    def test_trivial_patterns_and_streams_do_not_speculate(
+        self, mock_router, mock_agent, mock_memory_module, ledger
+    ):
+        """Test that pattern-resolved messages go straight to generation."""
+        from src.main import invoke
+
+        mock_router.is_trivial_pattern.return_value = True
+        result = invoke({"prompt": "Oi!"})
+
+        assert result["metadata"]["speculation"] is None
+
+        mock_router.is_trivial_pattern.return_value = False
+        events = invoke({"prompt": "Qual meu hotel?", "stream": True})
+
+        assert events[-1]["metadata"]["speculation"] is None
+        assert ledger.stats()["started"] == 0
@@ -0,0 +1,157 @@
+"""
+Unit tests for SummaryAvailability
+Tests strategy probing, per-session backoff and AgentCoreMemory integration
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from src.memory.agentcore_memory import AgentCoreMemory
+from src.memory.client_registry import clear_clients
+from src.memory.summary_probe import SummaryAvailability, has_summary_strategy
+
+
+class TestSummaryAvailability:
+    """Test suite for SummaryAvailability class."""
+
+    def test_has_summary_strategy(self):
+        """Test detection of the summary strategy in probe output."""
+        assert has_summary_strategy([{"type": "SEMANTIC"}, {"type": "SUMMARIZATION"}])
+        assert not has_summary_strategy([{"type": "SEMANTIC"}])
+        assert not has_summary_strategy([])
+
+    def test_missing_strategy_skips_and_probes_once(self):
+        """Test that a memory without the strategy is probed only once."""
+        probe = Mock(return_value=False)
+        availability = SummaryAvailability(probe_fn=probe)
+
+        assert not availability.should_fetch("mem", "user", "s1")
+        assert not availability.should_fetch("mem", "user", "s2")
+
+        probe.assert_called_once_with("mem")
+        assert availability.stats()["skipped"] == 2
+
+    def test_missing_strategy_is_reprobed_after_backoff(self):
+        """Test that a negative probe expires after strategy_backoff."""
+        probe = Mock(side_effect=[False, True])
+        availability = SummaryAvailability(probe_fn=probe, strategy_backoff=10)
+
+        with patch("src.memory.summary_probe.time.monotonic", return_value=0):
+            assert not availability.should_fetch("mem", "user", "s1")
+        with patch("src.memory.summary_probe.time.monotonic", return_value=11):
+            assert availability.should_fetch("mem", "user", "s1")
+        assert probe.call_count == 2
+
+    def test_probe_error_allows_lookup(self):
+        """Test that an unknown capability does not block summaries."""
+        availability = SummaryAvailability(probe_fn=Mock(side_effect=RuntimeError("boom")))
+
+        assert availability.should_fetch("mem", "user", "s1")
+        assert availability.stats()["probe_errors"] == 1
+
+    def test_empty_session_backs_off_exponentially(self):
+        """Test that empty lookups back off and double up to the maximum."""
+        availability = SummaryAvailability(
+            probe_fn=Mock(return_value=True), session_backoff=10, session_backoff_max=15
+        )
+
+        with patch("src.memory.summary_probe.time.monotonic", return_value=0):
+            availability.record("mem", "user", "s1", found=False)
+            assert not availability.should_fetch("mem", "user", "s1")
+            assert availability.should_fetch("mem", "user", "s2")
+        with patch("src.memory.summary_probe.time.monotonic", return_value=10):
+            assert availability.should_fetch("mem", "user", "s1")
+            availability.record("mem", "user", "s1", found=False)
+        with patch("src.memory.summary_probe.time.monotonic", return_value=24):
+            assert not availability.should_fetch("mem", "user", "s1")
+        with patch("src.memory.summary_probe.time.monotonic", return_value=25):
+            assert availability.should_fetch("mem", "user", "s1")
+
+    def test_found_summary_resets_backoff(self):
+        """Test that a summary found clears the session backoff."""
+        availability = SummaryAvailability(probe_fn=Mock(return_value=True))
+        availability.record("mem", "user", "s1", found=False)
+        availability.record("mem", "user", "s1", found=True)
+
+        assert availability.should_fetch("mem", "user", "s1")
+        assert availability.stats()["negative_sessions"] == 0
+
+
+    def test_negative_sessions_are_bounded(self):
+        """Test that the oldest sessions are dropped past max_sessions."""
+        availability = SummaryAvailability(probe_fn=Mock(return_value=True), max_sessions=2)
+
+        with patch("src.memory.summary_probe.time.monotonic", return_value=0):
+            for session in ("s1", "s2", "s3"):
+                availability.record("mem", "user", session, found=False)
+
+            assert availability.stats()["negative_sessions"] == 2
+            assert availability.should_fetch("mem", "user", "s1")
+            assert not availability.should_fetch("mem", "user", "s3")
+
+    def test_expired_sessions_are_swept(self):
+        """Test that sessions idle well past their retry time are forgotten."""
+        availability = SummaryAvailability(probe_fn=Mock(return_value=True), session_backoff=10)
+
+        with patch("src.memory.summary_probe.time.monotonic", return_value=0):
+            availability.record("mem", "user", "s1", found=False)
+        with patch("src.memory.summary_probe.time.monotonic", return_value=25):
+            availability.record("mem", "user", "s2", found=False)
+
+        assert availability.stats()["negative_sessions"] == 1
+
+class TestAgentCoreMemorySummary:
+    """Test get_session_summary with the negative-result cache."""
+
+    @pytest.fixture
+    def mock_memory_client(self):
+        """Create mock MemoryClient."""
+        with patch("src.memory.client_registry._new_memory_client") as mock, patch(
+            "src.memory.client_registry.get_boto_session"
+        ):
+            clear_clients()
+            client_instance = Mock()
+            mock.return_value = client_instance
+            yield client_instance
+        clear_clients()
+
+    def test_no_summary_strategy_skips_remote_call(self, mock_memory_client):
+        """Test that retrieve_memories is not called without the strategy."""
+        mock_memory_client.get_memory_strategies.return_value = [{"type": "SEMANTIC"}]
+
+        memory = AgentCoreMemory(memory_id="mem-test-123")
+        assert memory.get_session_summary("user", "s1") is None
+        assert memory.get_session_summary("user", "s1") is None
+
+        mock_memory_client.retrieve_memories.assert_not_called()
+        mock_memory_client.get_memory_strategies.assert_called_once()
+        assert memory.summary_stats()["skipped"] == 2
+
+    def test_empty_summary_is_not_refetched_immediately(self, mock_memory_client):
+        """Test that an empty lookup is cached for the session."""
+        mock_memory_client.get_memory_strategies.return_value = [
+            {"type": "SUMMARIZATION"}
+        ]
+        mock_memory_client.retrieve_memories.return_value = []
+
+        memory = AgentCoreMemory(memory_id="mem-test-123")
+        assert memory.get_session_summary("user", "s1") is None
+        assert memory.get_session_summary("user", "s1") is None
+
+        assert mock_memory_client.retrieve_memories.call_count == 1
+
+    def test_summary_found_keeps_fetching(self, mock_memory_client):
+        """Test that sessions with a summary are always refreshed."""
+        mock_memory_client.get_memory_strategies.return_value = [
+            {"type": "SUMMARIZATION"}
+        ]
+        mock_memory_client.retrieve_memories.return_value = [{"content": "Trip to Rome"}]
+
+        memory = AgentCoreMemory(memory_id="mem-test-123")
+        assert memory.get_session_summary("user", "s1") == "Trip to Rome"
+        assert memory.get_session_summary("user", "s1") == "Trip to Rome"
+
+        assert mock_memory_client.retrieve_memories.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
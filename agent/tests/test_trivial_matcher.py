@@ -0,0 +1,62 @@
+"""
+Unit tests for TrivialMatcher
+Tests phrase lookup, emoji-only detection and config extensions
+"""
+
+import pytest
+from unittest.mock import patch
+from src.router.trivial_matcher import TrivialMatcher, is_emoji_only
+
+
+class TestTrivialMatcher:
+    """Test suite for TrivialMatcher class."""
+
+    @pytest.fixture
+    def matcher(self):
+        """Create matcher with default phrases."""
+        return TrivialMatcher()
+
+    def test_default_phrases(self, matcher):
+        """Test that the original trivial phrases are still detected."""
+        for message in ["Oi!", "olá", "Obrigada!!", "tudo  bem", "Não", "thanks ?"]:
+            assert matcher.matches(message), f"'{message}' should be trivial"
+
+    def test_emoji_only_messages(self, matcher):
+        """Test that any emoji-only message is trivial."""
+        for message in ["👍", "👍👍", "❤️", "🙏 ", "👋🏽", "🇧🇷"]:
+            assert matcher.matches(message), f"'{message}' should be trivial"
+
+    def test_emoji_prefix_is_not_trivial(self, matcher):
+        """Test the alternation precedence bug of the old emoji pattern."""
+        assert not matcher.matches("👍 e aí?")
+        assert not matcher.matches("😊 qual meu hotel?")
+
+    def test_long_messages_are_not_trivial(self, matcher):
+        """Test that messages with more than 3 words are not trivial."""
+        assert not matcher.matches("oi quero planejar uma viagem")
+        assert not is_emoji_only("")
+
+    def test_extensions_from_config(self):
+        """Test that phrases and patterns can be extended."""
+        matcher = TrivialMatcher(extra_phrases=["Bom dia"], extra_patterns=[r"k+"])
+
+        assert matcher.matches("bom dia!")
+        assert matcher.matches("kkkk")
+        assert not matcher.matches("kkkk e o voo")
+
+    def test_extensions_from_env(self):
+        """Test that extensions are read from environment variables."""
+        env = {
+            "ROUTER_TRIVIAL_PHRASES": "beleza, show",
+            "ROUTER_TRIVIAL_PATTERNS": '["(ha)+"]',
+        }
+        with patch.dict("os.environ", env):
+            matcher = TrivialMatcher.from_env()
+
+        assert matcher.matches("Beleza!")
+        assert matcher.matches("show")
+        assert matcher.matches("hahaha")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark local - Configuração do cliente boto3 do BFF contra endpoint stub
+
+Sobe um servidor HTTP local que responde InvokeAgent com um event stream
+(`application/vnd.amazon.eventstream`) de N chunks e mede:
+- cold start: tempo de `import handler` em processos novos
+- latência de invoke_agentcore (p50/p99) sob concorrência, comparando a
+  configuração padrão do botocore com build_client_config()
+
+Sem AWS: credenciais falsas e endpoint_url apontando para o stub. Com o
+`openssl` disponível o stub usa TLS (certificado autoassinado), para que o
+custo de abrir conexões novas (handshake) apareça como em produção.
+
+Uso:
+    cd lambdas/bff
+    python benchmarks/bench_client_config.py
+    python benchmarks/bench_client_config.py --requests 2000 --concurrency 64 --delay-ms 20
+"""
+
+import argparse
+import base64
+import json
+import os
+import shutil
+import ssl
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+os.environ.setdefault("AGENTCORE_AGENT_ID", "BENCHAGENT")
+os.environ.setdefault("LOG_EVENT_SAMPLE_RATE", "0")
+
+import boto3  # noqa: E402
+from botocore.config import Config  # noqa: E402
+
+
+def _header(name: str, value: str) -> bytes:
+    name_bytes, value_bytes = name.encode(), value.encode()
+    return (
+        struct.pack("B", len(name_bytes)) + name_bytes
+        + struct.pack("!BH", 7, len(value_bytes)) + value_bytes
+    )
+
+
+def encode_event(event_type: str, payload: dict) -> bytes:
+    """Codifica uma mensagem no formato vnd.amazon.eventstream."""
+    headers = (
+        _header(":event-type", event_type)
+        + _header(":message-type", "event")
+        + _header(":content-type", "application/json")
+    )
+    body = json.dumps(payload).encode()
+    total = 12 + len(headers) + len(body) + 4
+    prelude = struct.pack("!II", total, len(headers))
+    message = prelude + struct.pack("!I", zlib.crc32(prelude)) + headers + body
+    return message + struct.pack("!I", zlib.crc32(message))
+
+
+def make_stub_handler(chunks: int, delay_s: float):
+    """Handler HTTP que simula InvokeAgent com `chunks` eventos."""
+    stream = b"".join(
+        encode_event("chunk", {"bytes": base64.b64encode(f"parte {i} ".encode()).decode()})
+        for i in range(chunks)
+    )
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if delay_s:
+                time.sleep(delay_s)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.amazon.eventstream")
+            self.send_header("x-amz-bedrock-agent-session-id", "bench")
+            self.send_header("x-amzn-bedrock-agent-content-type", "application/json")
+            self.send_header("Content-Length", str(len(stream)))
+            self.end_headers()
+            self.wfile.write(stream)
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def wrap_tls(server: ThreadingHTTPServer) -> bool:
+    """Habilita TLS no stub com certificado autoassinado (se houver openssl)."""
+    if not shutil.which("openssl"):
+        return False
+    tmp = tempfile.mkdtemp()
+    cert, key = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", key, "-out", cert],
+        capture_output=True, check=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    return True
+
+
+def measure_import(runs: int) -> list:
+    """Tempo de `import handler` (ms) em processos Python novos."""
+    code = (
+        "import time; t = time.perf_counter(); import handler; "
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=SRC, env=os.environ,
+            capture_output=True, text=True, check=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def measure_invoke(handler, client, requests: int, concurrency: int) -> list:
+    """Latência (ms) de invoke_agentcore com o cliente informado."""
+    handler.bedrock_runtime = client
+
+    def one(i):
+        start = time.perf_counter()
+        result = handler.invoke_agentcore(
+            prompt="Qual meu hotel?", session_id=f"s-{i % 100}", user_id="bench"
+        )
+        assert result["success"], result
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(concurrency)))  # aquecimento
+        return list(pool.map(one, range(requests)))
+
+
+def _report(label: str, samples: list) -> None:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(
+        f"  {label:<28} mean={statistics.fmean(samples):8.2f}ms  "
+        f"p50={samples[len(samples) // 2]:8.2f}ms  p99={p99:8.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--chunks", type=int, default=50)
+    parser.add_argument("--delay-ms", type=float, default=10.0)
+    parser.add_argument("--import-runs", type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_stub_handler(args.chunks, args.delay_ms / 1000)
+    )
+    scheme = "https" if wrap_tls(server) else "http"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"{scheme}://127.0.0.1:{server.server_address[1]}"
+    warnings.filterwarnings("ignore", message="Unverified HTTPS request")
+
+    print(f"\n🧪 Cold start ({args.import_runs} fresh processes)\n")
+    _report("import handler", measure_import(args.import_runs))
+
+    import handler  # noqa: E402
+
+    clients = {
+        "botocore defaults": Config(),
+        "build_client_config()": handler.build_client_config(),
+    }
+    print(
+        f"\n🧪 invoke_agentcore x{args.requests} @ concurrency {args.concurrency} "
+        f"({args.chunks} chunks, {args.delay_ms:.0f}ms stub delay, {scheme})\n"
+    )
+    for label, config in clients.items():
+        client = boto3.client(
+            "bedrock-agent-runtime",
+            region_name=os.environ["AWS_REGION"],
+            endpoint_url=endpoint,
+            verify=False,
+            config=config,
+        )
+        _report(label, measure_invoke(handler, client, args.requests, args.concurrency))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,85 @@ Lambda BFF (Backend-for-Frontend) para n-agent
 
 Recebe requests do API Gateway e invoca o AgentCore Runtime.
 Extrai user_id do JWT token do Cognito.
+
+Dois modos de resposta:
+- HTTP (REST): resposta completa em um único JSON
+- WebSocket (requestContext.connectionId): cada chunk do agent é repassado
+  ao cliente via @connections assim que chega (streaming). O runtime Python
+  do Lambda não suporta response streaming em HTTP, por isso o streaming
+  usa a API WebSocket.
 """
 
+import codecs
 import json
 import os
+import random
 import boto3
-from typing import Dict, Any
+from botocore.config import Config
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+
+def build_client_config() -> Config:
+    """
+    Configuração explícita dos clientes boto3 (sobrescrevível por env).
+    
+    - BFF_MAX_POOL_CONNECTIONS: conexões HTTP reutilizáveis (default 50;
+      botocore usa 10)
+    - BFF_CONNECT_TIMEOUT / BFF_READ_TIMEOUT: segundos (default 2 / 25, abaixo
+      do timeout de 30s da Lambda para responder com erro em vez de timeout)
+    - BFF_MAX_ATTEMPTS: tentativas no modo de retry adaptativo (default 3)
+    - TCP keepalive ligado: conexões ociosas entre invocações quentes não são
+      derrubadas silenciosamente
+    """
+    return Config(
+        max_pool_connections=int(os.environ.get('BFF_MAX_POOL_CONNECTIONS', '50')),
+        connect_timeout=float(os.environ.get('BFF_CONNECT_TIMEOUT', '2')),
+        read_timeout=float(os.environ.get('BFF_READ_TIMEOUT', '25')),
+        retries={
+            'mode': 'adaptive',
+            'max_attempts': int(os.environ.get('BFF_MAX_ATTEMPTS', '3'))
+        },
+        tcp_keepalive=True
+    )
+
+
+CLIENT_CONFIG = build_client_config()
 
 # Initialize AWS clients
-bedrock_runtime = boto3.client('bedrock-agent-runtime', region_name=os.environ.get('AWS_REGION', 'us-east-1'))
+bedrock_runtime = boto3.client(
+    'bedrock-agent-runtime',
+    region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+    config=CLIENT_CONFIG
+)
 
 # Environment variables
 AGENT_ID = os.environ.get('AGENTCORE_AGENT_ID')
 AGENT_ALIAS_ID = os.environ.get('AGENTCORE_AGENT_ALIAS_ID', 'TSTALIASID')
 
+# Fração dos eventos logados por completo (o resto loga só um resumo)
+LOG_EVENT_SAMPLE_RATE = float(os.environ.get('LOG_EVENT_SAMPLE_RATE', '0.01'))
+LOG_EVENT_MAX_CHARS = int(os.environ.get('LOG_EVENT_MAX_CHARS', '2000'))
+
+
+def log_event(event: Dict[str, Any]) -> None:
+    """
+    Loga o evento recebido sem serializar o payload inteiro a cada request.
+    
+    Sempre imprime um resumo barato (rota, conexão, tamanho do body); o
+    evento completo (truncado em LOG_EVENT_MAX_CHARS) só é serializado para
+    uma amostra de LOG_EVENT_SAMPLE_RATE dos requests.
+    """
+    request_context = event.get('requestContext', {})
+    route = request_context.get('routeKey') or event.get('routeKey') or event.get('path', '-')
+    body = event.get('body') or ''
+    print(
+        f"Received event: route={route} "
+        f"connection={request_context.get('connectionId', '-')} "
+        f"body_bytes={len(body)}"
+    )
+    if LOG_EVENT_SAMPLE_RATE > 0 and random.random() < LOG_EVENT_SAMPLE_RATE:
+        print(f"Sampled event: {json.dumps(event)[:LOG_EVENT_MAX_CHARS]}")
+
 
 def extract_user_info(event: Dict[str, Any]) -> Dict[str, str]:
     """
@@ -29,7 +94,9 @@ def extract_user_info(event: Dict[str, Any]) -> Dict[str, str]:
         Dict com user_id, email, name
     """
     # JWT claims do Cognito vêm em requestContext.authorizer.jwt.claims
-    claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+    # (WebSocket com Lambda authorizer: claims direto em requestContext.authorizer)
+    authorizer = event.get('requestContext', {}).get('authorizer', {})
+    claims = authorizer.get('jwt', {}).get('claims') or authorizer
     
     return {
         'user_id': claims.get('sub', 'anonymous'),
@@ -39,15 +106,88 @@ def extract_user_info(event: Dict[str, Any]) -> Dict[str, str]:
     }
 
 
-def invoke_agentcore(
+def iter_completion_chunks(completion: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Decodifica os chunks de texto do event stream `completion`.
+    
+    Args:
+        completion: Event stream retornado por invoke_agent
+        
+    Yields:
+        Texto de cada chunk, na ordem em que chega
+    """
+    for event in completion:
+        if 'chunk' in event:
+            chunk_data = event['chunk']
+            if 'bytes' in chunk_data:
+                yield chunk_data['bytes'].decode('utf-8')
+
+
+def parse_stream_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Converte uma linha do stream do runtime em evento do entrypoint.
+    
+    O runtime entrega o async generator do entrypoint como SSE
+    (`data: {"type": "chunk", "data": "..."}`); linhas em JSON puro também
+    são aceitas. Texto que não é JSON vira um chunk de texto.
+    
+    Returns:
+        Evento (dict) ou None para linhas vazias/comentários SSE
+    """
+    line = line.strip()
+    if not line or line.startswith(':'):
+        return None
+    if line.startswith('data:'):
+        line = line[len('data:'):].strip()
+    try:
+        event = json.loads(line)
+    except json.JSONDecodeError:
+        return {'type': 'chunk', 'data': line}
+    if not isinstance(event, dict):
+        return {'type': 'chunk', 'data': event if isinstance(event, str) else line}
+    return event
+
+
+def iter_stream_events(completion: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Decodifica os eventos do entrypoint a partir do event stream `completion`.
+    
+    Os bytes de um chunk do runtime não respeitam as fronteiras dos eventos
+    (nem dos caracteres UTF-8): o texto é acumulado e cortado por linha.
+    
+    Args:
+        completion: Event stream retornado por invoke_agent
+        
+    Yields:
+        Eventos {"type": "chunk" | "done", ...} na ordem em que chegam
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = ''
+    for event in completion:
+        data = event.get('chunk', {}).get('bytes')
+        if data is None:
+            continue
+        pending += decoder.decode(data)
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            parsed = parse_stream_line(line)
+            if parsed is not None:
+                yield parsed
+    parsed = parse_stream_line(pending + decoder.decode(b'', final=True))
+    if parsed is not None:
+        yield parsed
+
+
+def start_agent_invocation(
     prompt: str,
     session_id: str,
     user_id: str,
     trip_id: str = None,
-    has_image: bool = False
-) -> Dict[str, Any]:
+    has_image: bool = False,
+    stream: bool = False
+) -> Iterable[Dict[str, Any]]:
     """
-    Invoca o AgentCore Runtime.
+    Inicia a invocação do agent e retorna o event stream `completion`.
     
     Args:
         prompt: Mensagem do usuário
@@ -55,9 +195,10 @@ def invoke_agentcore(
         user_id: ID do usuário
         trip_id: ID da viagem (opcional)
         has_image: Se há imagem anexada
+        stream: Pede ao entrypoint chunks incrementais
         
     Returns:
-        Resposta do agent
+        Event stream com os chunks da resposta
     """
     # Preparar input para o agent
     agent_input = {
@@ -65,31 +206,52 @@ def invoke_agentcore(
         'trip_id': trip_id,
         'has_image': has_image
     }
+    if stream:
+        agent_input['stream'] = True
     
     # Invocar agent via Bedrock Agent Runtime
-    try:
-        response = bedrock_runtime.invoke_agent(
-            agentId=AGENT_ID,
-            agentAliasId=AGENT_ALIAS_ID,
-            sessionId=session_id,
-            inputText=json.dumps(agent_input),
-            sessionState={
-                'sessionAttributes': {
-                    'user_id': user_id,
-                    'trip_id': trip_id or ''
-                }
+    response = bedrock_runtime.invoke_agent(
+        agentId=AGENT_ID,
+        agentAliasId=AGENT_ALIAS_ID,
+        sessionId=session_id,
+        inputText=json.dumps(agent_input),
+        sessionState={
+            'sessionAttributes': {
+                'user_id': user_id,
+                'trip_id': trip_id or ''
             }
-        )
+        }
+    )
+    return response.get('completion', [])
+
+
+def invoke_agentcore(
+    prompt: str,
+    session_id: str,
+    user_id: str,
+    trip_id: str = None,
+    has_image: bool = False
+) -> Dict[str, Any]:
+    """
+    Invoca o AgentCore Runtime.
+    
+    Args:
+        prompt: Mensagem do usuário
+        session_id: ID da sessão
+        user_id: ID do usuário
+        trip_id: ID da viagem (opcional)
+        has_image: Se há imagem anexada
         
-        # Processar resposta streaming
-        result = ""
-        completion = response.get('completion', [])
+    Returns:
+        Resposta do agent
+    """
+    try:
+        completion = start_agent_invocation(
+            prompt, session_id, user_id, trip_id, has_image
+        )
         
-        for event in completion:
-            if 'chunk' in event:
-                chunk_data = event['chunk']
-                if 'bytes' in chunk_data:
-                    result += chunk_data['bytes'].decode('utf-8')
+        # Processar resposta streaming (join linear, sem concatenação quadrática)
+        result = "".join(iter_completion_chunks(completion))
         
         return {
             'success': True,
@@ -106,6 +268,94 @@ def invoke_agentcore(
         }
 
 
+# Clientes @connections por endpoint WebSocket (reutilizados entre invocações)
+_connection_clients: Dict[str, Any] = {}
+
+
+def get_connections_client(request_context: Dict[str, Any]):
+    """Cliente apigatewaymanagementapi do endpoint da conexão WebSocket."""
+    endpoint = f"https://{request_context['domainName']}/{request_context['stage']}"
+    client = _connection_clients.get(endpoint)
+    if client is None:
+        client = boto3.client(
+            'apigatewaymanagementapi', endpoint_url=endpoint, config=CLIENT_CONFIG
+        )
+        _connection_clients[endpoint] = client
+    return client
+
+
+def stream_agentcore_to_connection(
+    request_context: Dict[str, Any],
+    prompt: str,
+    session_id: str,
+    user_id: str,
+    trip_id: str = None,
+    has_image: bool = False
+) -> Dict[str, Any]:
+    """
+    Invoca o agent e repassa cada chunk à conexão WebSocket assim que chega.
+    
+    Mensagens enviadas ao cliente:
+        {"type": "chunk", "data": "<texto>"}
+        {"type": "done", "session_id": ..., "trip_id": ...}
+        {"type": "error", "response": "<mensagem amigável>"}
+    
+    Args:
+        request_context: requestContext do evento WebSocket
+        prompt: Mensagem do usuário
+        session_id: ID da sessão
+        user_id: ID do usuário
+        trip_id: ID da viagem (opcional)
+        has_image: Se há imagem anexada
+        
+    Returns:
+        Resumo da entrega (success, chunks enviados)
+    """
+    client = get_connections_client(request_context)
+    connection_id = request_context['connectionId']
+    
+    def send(message: Dict[str, Any]) -> None:
+        client.post_to_connection(
+            ConnectionId=connection_id,
+            Data=json.dumps(message).encode('utf-8')
+        )
+    
+    chunks_sent = 0
+    try:
+        completion = start_agent_invocation(
+            prompt, session_id, user_id, trip_id, has_image, stream=True
+        )
+        for event in iter_stream_events(completion):
+            event_type = event.get('type')
+            if event_type == 'chunk':
+                send({'type': 'chunk', 'data': event.get('data', '')})
+                chunks_sent += 1
+            elif event_type == 'done':
+                # Metadata do entrypoint fica no servidor; o cliente recebe o done do BFF
+                break
+            elif 'error' in event:
+                # Erro emitido pelo runtime no meio do stream
+                raise RuntimeError(event.get('message') or event['error'])
+        send({'type': 'done', 'session_id': session_id, 'trip_id': trip_id})
+        return {'success': True, 'chunks': chunks_sent}
+    
+    except client.exceptions.GoneException:
+        # Cliente desconectou no meio do stream
+        print(f"Connection {connection_id} gone after {chunks_sent} chunks")
+        return {'success': False, 'chunks': chunks_sent, 'error': 'gone'}
+    
+    except Exception as e:
+        print(f"Error streaming agent response: {str(e)}")
+        try:
+            send({
+                'type': 'error',
+                'response': "Desculpe, tive um problema ao processar sua mensagem. Tente novamente."
+            })
+        except Exception:
+            pass
+        return {'success': False, 'chunks': chunks_sent, 'error': str(e)}
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Handler principal da Lambda.
@@ -117,7 +367,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Response para API Gateway
     """
-    print(f"Received event: {json.dumps(event)}")
+    log_event(event)
     
     # Extract user info from JWT
     user_info = extract_user_info(event)
@@ -157,6 +407,19 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             })
         }
     
+    # WebSocket: streaming dos chunks direto para a conexão
+    request_context = event.get('requestContext', {})
+    if request_context.get('connectionId'):
+        result = stream_agentcore_to_connection(
+            request_context,
+            prompt=prompt,
+            session_id=session_id,
+            user_id=user_id,
+            trip_id=trip_id,
+            has_image=has_image
+        )
+        return {'statusCode': 200 if result['success'] else 500}
+    
     # Invoke AgentCore
     agent_response = invoke_agentcore(
         prompt=prompt,
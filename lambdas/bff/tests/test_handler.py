@@ -0,0 +1,106 @@
+"""
+Unit tests for the BFF handler
+Tests decoding of the entrypoint stream and WebSocket relay
+"""
+
+import json
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src import handler
+
+REQUEST_CONTEXT = {"connectionId": "conn-1", "domainName": "ws.example.com", "stage": "prod"}
+
+
+def _completion(*parts):
+    """Event stream from invoke_agent with the given raw byte parts."""
+    return [{"chunk": {"bytes": part}} for part in parts]
+
+
+def _sse(event):
+    return f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+class TestStreamDecoding:
+    """Test decoding of the runtime's SSE stream into entrypoint events."""
+
+    def test_events_split_across_chunks(self):
+        """Test that events and UTF-8 characters split between chunks are rebuilt."""
+        raw = _sse({"type": "chunk", "data": "Olá, "}) + _sse({"type": "chunk", "data": "Roma!"})
+        raw += _sse({"type": "done", "metadata": {"session_id": "s1"}})
+        split = raw.index("á".encode("utf-8")) + 1
+
+        events = list(handler.iter_stream_events(_completion(raw[:split], raw[split:])))
+
+        assert events == [
+            {"type": "chunk", "data": "Olá, "},
+            {"type": "chunk", "data": "Roma!"},
+            {"type": "done", "metadata": {"session_id": "s1"}},
+        ]
+
+    def test_json_lines_and_plain_text(self):
+        """Test that JSON lines without SSE framing and plain text are accepted."""
+        raw = b'{"type": "chunk", "data": "Oi"}\ntexto solto'
+
+        events = list(handler.iter_stream_events(_completion(raw)))
+
+        assert events == [
+            {"type": "chunk", "data": "Oi"},
+            {"type": "chunk", "data": "texto solto"},
+        ]
+
+
+class TestWebSocketRelay:
+    """Test the messages posted to the WebSocket connection."""
+
+    @pytest.fixture
+    def client(self):
+        client = Mock()
+        client.exceptions.GoneException = type("GoneException", (Exception,), {})
+        with patch.object(handler, "get_connections_client", return_value=client):
+            yield client
+
+    @staticmethod
+    def _posted(client):
+        return [
+            json.loads(call.kwargs["Data"].decode("utf-8"))
+            for call in client.post_to_connection.call_args_list
+        ]
+
+    def test_forwards_chunk_text_and_maps_done(self, client):
+        """Test that only chunk text is relayed and done becomes the BFF's done."""
+        completion = _completion(
+            _sse({"type": "chunk", "data": "Seu hotel "}),
+            _sse({"type": "chunk", "data": "é o Hotel Roma"}),
+            _sse({"type": "done", "metadata": {"routing": {"complexity": "informative"}}}),
+        )
+        with patch.object(handler, "start_agent_invocation", return_value=completion):
+            result = handler.stream_agentcore_to_connection(
+                REQUEST_CONTEXT, "Qual meu hotel?", "s1", "user", trip_id="t1"
+            )
+
+        assert result == {"success": True, "chunks": 2}
+        assert self._posted(client) == [
+            {"type": "chunk", "data": "Seu hotel "},
+            {"type": "chunk", "data": "é o Hotel Roma"},
+            {"type": "done", "session_id": "s1", "trip_id": "t1"},
+        ]
+        assert all(
+            call.kwargs["ConnectionId"] == "conn-1"
+            for call in client.post_to_connection.call_args_list
+        )
+
+    def test_runtime_error_event_sends_error(self, client):
+        """Test that an error emitted mid-stream reaches the client as an error message."""
+        completion = _completion(
+            _sse({"type": "chunk", "data": "Seu"}),
+            _sse({"error": "ThrottlingException", "message": "Rate exceeded"}),
+        )
+        with patch.object(handler, "start_agent_invocation", return_value=completion):
+            result = handler.stream_agentcore_to_connection(
+                REQUEST_CONTEXT, "Qual meu hotel?", "s1", "user"
+            )
+
+        assert result["success"] is False
+        assert [message["type"] for message in self._posted(client)] == ["chunk", "error"]